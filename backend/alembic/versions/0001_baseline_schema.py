@@ -0,0 +1,234 @@
+"""Baseline schema: the tables created by scripts/init.sql, transactions partitioned by month
+
+Databases that already have the schema (created by init.sql, by the old
+import-time create_all, or restored from shinyjar_db.sql and migrated with
+scripts/partition_transactions.sql) are left as they are and only stamped;
+revision 0007 adds the users' portal links if such a database lacks them.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = """
+CREATE TABLE businesses (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    instagram_handle VARCHAR(50),
+    currency VARCHAR(3) DEFAULT 'EUR',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE categories (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(50) NOT NULL,
+    type VARCHAR(10) CHECK (type IN ('expense', 'income', 'both')),
+    color VARCHAR(7) DEFAULT '#3B82F6',
+    business_id INTEGER REFERENCES businesses(id),
+    UNIQUE(name, business_id)
+);
+
+CREATE TABLE suppliers (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    contact_person VARCHAR(100),
+    email VARCHAR(100),
+    phone VARCHAR(20),
+    website VARCHAR(200),
+    address TEXT,
+    notes TEXT,
+    business_id INTEGER REFERENCES businesses(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE customers (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    instagram_handle VARCHAR(50),
+    email VARCHAR(100),
+    phone VARCHAR(20),
+    address TEXT,
+    customer_since DATE DEFAULT CURRENT_DATE,
+    total_spent DECIMAL(10,2) DEFAULT 0.00,
+    last_purchase DATE,
+    notes TEXT,
+    business_id INTEGER REFERENCES businesses(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE users (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    full_name VARCHAR(100),
+    hashed_password VARCHAR(255) NOT NULL,
+    is_active BOOLEAN DEFAULT true,
+    role VARCHAR(20) DEFAULT 'user',
+    business_id INTEGER REFERENCES businesses(id),
+    customer_id INTEGER REFERENCES customers(id),
+    supplier_id INTEGER REFERENCES suppliers(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE inventory (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    description TEXT,
+    category VARCHAR(50),
+    unit_cost DECIMAL(10,2) NOT NULL,
+    quantity INTEGER DEFAULT 0,
+    reorder_level INTEGER DEFAULT 10,
+    supplier_id INTEGER REFERENCES suppliers(id),
+    business_id INTEGER REFERENCES businesses(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE transactions (
+    id SERIAL,
+    transaction_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    amount DECIMAL(10,2) NOT NULL,
+    type VARCHAR(10) NOT NULL CHECK (type IN ('expense', 'income')),
+    category_id INTEGER REFERENCES categories(id),
+    description TEXT,
+    customer_id INTEGER REFERENCES customers(id),
+    supplier_id INTEGER REFERENCES suppliers(id),
+    user_id INTEGER REFERENCES users(id),
+    business_id INTEGER REFERENCES businesses(id),
+    payment_method VARCHAR(20),
+    reference_number VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
+
+CREATE TABLE transactions_default PARTITION OF transactions DEFAULT;
+
+CREATE TABLE transaction_items (
+    id SERIAL PRIMARY KEY,
+    transaction_id INTEGER,
+    inventory_id INTEGER REFERENCES inventory(id),
+    description VARCHAR(200),
+    quantity INTEGER NOT NULL DEFAULT 1,
+    unit_price DECIMAL(10,2) NOT NULL,
+    total_price DECIMAL(10,2) GENERATED ALWAYS AS (quantity * unit_price) STORED
+);
+
+CREATE TABLE budgets (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    category_id INTEGER REFERENCES categories(id),
+    amount DECIMAL(10,2) NOT NULL,
+    period VARCHAR(20) CHECK (period IN ('daily', 'weekly', 'monthly', 'quarterly', 'yearly')),
+    start_date DATE NOT NULL,
+    end_date DATE,
+    business_id INTEGER REFERENCES businesses(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(category_id, period, business_id)
+);
+"""
+
+# As in scripts/partition_transactions.sql
+PARTITION_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION create_transaction_partition(p_month DATE) RETURNS BOOLEAN AS $$
+DECLARE
+    start_date DATE := date_trunc('month', p_month)::date;
+    end_date DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'transactions_y' || to_char(start_date, 'YYYY') || 'm' || to_char(start_date, 'MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+    PERFORM set_config('app.moving_transactions', 'on', true);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM transactions_default WHERE transaction_date >= %L AND transaction_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name);
+    PERFORM set_config('app.moving_transactions', 'off', true);
+    EXECUTE format('ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, start_date, end_date);
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION ensure_transaction_partitions(p_from DATE, p_to DATE) RETURNS INTEGER AS $$
+DECLARE
+    month DATE := date_trunc('month', p_from)::date;
+    created INTEGER := 0;
+BEGIN
+    WHILE month <= p_to LOOP
+        IF create_transaction_partition(month) THEN
+            created := created + 1;
+        END IF;
+        month := (month + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION delete_transaction_items() RETURNS TRIGGER AS $$
+BEGIN
+    IF current_setting('app.moving_transactions', true) = 'on'
+       OR EXISTS (SELECT 1 FROM transactions WHERE id = OLD.id) THEN
+        RETURN NULL;
+    END IF;
+    DELETE FROM transaction_items WHERE transaction_id = OLD.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER transactions_delete_items
+    AFTER DELETE ON transactions
+    FOR EACH ROW EXECUTE FUNCTION delete_transaction_items();
+
+SELECT ensure_transaction_partitions(
+    (date_trunc('month', CURRENT_DATE) - INTERVAL '24 months')::date,
+    (CURRENT_DATE + INTERVAL '12 months')::date
+);
+"""
+
+INDEXES = """
+CREATE INDEX idx_transactions_date ON transactions USING brin (transaction_date);
+CREATE INDEX idx_transactions_customer ON transactions(customer_id);
+CREATE INDEX idx_transactions_supplier ON transactions(supplier_id);
+CREATE INDEX idx_transactions_type ON transactions(type);
+CREATE INDEX idx_transaction_items_transaction ON transaction_items(transaction_id);
+CREATE INDEX idx_customers_instagram ON customers(instagram_handle);
+CREATE INDEX idx_customers_email ON customers(email);
+CREATE INDEX idx_inventory_category_name ON inventory(category, name);
+CREATE INDEX idx_inventory_supplier ON inventory(supplier_id);
+CREATE INDEX idx_users_customer ON users(customer_id);
+CREATE INDEX idx_users_supplier ON users(supplier_id);
+"""
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table("businesses"):
+        return
+    op.execute(TABLES)
+    op.execute(PARTITION_FUNCTIONS)
+    op.execute(INDEXES)
+
+
+def downgrade() -> None:
+    op.execute("""
+        DROP TABLE IF EXISTS budgets, transaction_items, transactions, inventory,
+            users, customers, suppliers, categories, businesses CASCADE;
+        DROP FUNCTION IF EXISTS delete_transaction_items();
+        DROP FUNCTION IF EXISTS ensure_transaction_partitions(DATE, DATE);
+        DROP FUNCTION IF EXISTS create_transaction_partition(DATE);
+    """)
@@ -0,0 +1,59 @@
+"""Composite indexes for the hot transaction access paths
+
+- customer portal and dashboard: customer_id = ? AND type = 'income' ORDER BY transaction_date
+- supplier portal and dashboard: supplier_id = ? AND type = 'expense' ORDER BY transaction_date
+- budget analysis: type = 'expense' AND category_id = ? AND transaction_date BETWEEN ...
+- top customers: ORDER BY total_spent DESC LIMIT n
+
+amount is an INCLUDE column, so the per-customer / per-supplier / per-budget
+sums can be answered from the index alone. The single-column customer,
+supplier and type indexes are leading prefixes of the new ones and are
+dropped.
+
+On a partitioned transactions table the indexes are built on every
+partition while holding a SHARE lock on it (writes wait, reads do not).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_transactions_customer_type_date", "transactions",
+                    ["customer_id", "type", "transaction_date"],
+                    postgresql_include=["amount"], if_not_exists=True)
+    op.create_index("idx_transactions_supplier_type_date", "transactions",
+                    ["supplier_id", "type", "transaction_date"],
+                    postgresql_include=["amount"], if_not_exists=True)
+    op.create_index("idx_transactions_type_category_date", "transactions",
+                    ["type", "category_id", "transaction_date"],
+                    postgresql_include=["amount"], if_not_exists=True)
+    op.create_index("idx_customers_total_spent", "customers", ["total_spent"], if_not_exists=True)
+
+    op.drop_index("idx_transactions_customer", table_name="transactions", if_exists=True)
+    op.drop_index("idx_transactions_supplier", table_name="transactions", if_exists=True)
+    op.drop_index("idx_transactions_type", table_name="transactions", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("idx_transactions_customer", "transactions", ["customer_id"], if_not_exists=True)
+    op.create_index("idx_transactions_supplier", "transactions", ["supplier_id"], if_not_exists=True)
+    op.create_index("idx_transactions_type", "transactions", ["type"], if_not_exists=True)
+
+    op.drop_index("idx_customers_total_spent", table_name="customers", if_exists=True)
+    op.drop_index("idx_transactions_type_category_date", table_name="transactions", if_exists=True)
+    op.drop_index("idx_transactions_supplier_type_date", table_name="transactions", if_exists=True)
+    op.drop_index("idx_transactions_customer_type_date", table_name="transactions", if_exists=True)
@@ -0,0 +1,98 @@
+"""Business-leading indexes for tenant-scoped queries
+
+Every query on a business-owned table now filters on business_id (see
+app.core.tenancy), so the access paths lead with it:
+
+- dashboard and stats: business_id = ? AND type = ? [AND transaction_date >= ?]
+- budget analysis: business_id = ? AND type = 'expense' AND category_id = ? AND transaction_date BETWEEN ...
+- top customers: business_id = ? ORDER BY total_spent DESC LIMIT n
+- inventory listing: business_id = ? ORDER BY category, name
+- categories, suppliers and budgets looked up per business
+
+The customer / supplier composites stay keyed on customer_id / supplier_id
+(a customer or supplier belongs to one business) and gain business_id as
+an INCLUDE column, so the added tenant predicate is still checked from the
+index. Indexes that are a suffix of a new business-leading one are dropped.
+
+Rows written before scoping have no business_id (the API never set it, and
+shinyjar_db.sql has many); the filter would hide them, so they are given to
+DEFAULT_BUSINESS_ID and business_id becomes NOT NULL.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Business-owned tables (BusinessScoped in app.models.database) at this revision
+BUSINESS_SCOPED_TABLES = ("categories", "suppliers", "customers", "inventory", "transactions", "budgets")
+
+
+def upgrade() -> None:
+    for table in BUSINESS_SCOPED_TABLES:
+        op.execute(sa.text(f"UPDATE {table} SET business_id = :business_id WHERE business_id IS NULL")
+                   .bindparams(business_id=settings.DEFAULT_BUSINESS_ID))
+        op.alter_column(table, "business_id", existing_type=sa.Integer, nullable=False)
+
+    op.create_index("idx_transactions_business_type_date", "transactions",
+                    ["business_id", "type", "transaction_date"],
+                    postgresql_include=["amount", "category_id"], if_not_exists=True)
+    op.create_index("idx_transactions_business_type_category_date", "transactions",
+                    ["business_id", "type", "category_id", "transaction_date"],
+                    postgresql_include=["amount"], if_not_exists=True)
+    op.create_index("idx_customers_business_total_spent", "customers",
+                    ["business_id", "total_spent"], if_not_exists=True)
+    op.create_index("idx_inventory_business_category_name", "inventory",
+                    ["business_id", "category", "name"], if_not_exists=True)
+    op.create_index("idx_categories_business", "categories", ["business_id"], if_not_exists=True)
+    op.create_index("idx_suppliers_business_name", "suppliers", ["business_id", "name"], if_not_exists=True)
+    op.create_index("idx_budgets_business", "budgets", ["business_id"], if_not_exists=True)
+
+    for name, column in (("idx_transactions_customer_type_date", "customer_id"),
+                         ("idx_transactions_supplier_type_date", "supplier_id")):
+        op.drop_index(name, table_name="transactions", if_exists=True)
+        op.create_index(name, "transactions", [column, "type", "transaction_date"],
+                        postgresql_include=["amount", "business_id"])
+
+    op.drop_index("idx_transactions_type_category_date", table_name="transactions", if_exists=True)
+    op.drop_index("idx_customers_total_spent", table_name="customers", if_exists=True)
+    op.drop_index("idx_inventory_category_name", table_name="inventory", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("idx_transactions_type_category_date", "transactions",
+                    ["type", "category_id", "transaction_date"],
+                    postgresql_include=["amount"], if_not_exists=True)
+    op.create_index("idx_customers_total_spent", "customers", ["total_spent"], if_not_exists=True)
+    op.create_index("idx_inventory_category_name", "inventory", ["category", "name"], if_not_exists=True)
+
+    for name, column in (("idx_transactions_customer_type_date", "customer_id"),
+                         ("idx_transactions_supplier_type_date", "supplier_id")):
+        op.drop_index(name, table_name="transactions", if_exists=True)
+        op.create_index(name, "transactions", [column, "type", "transaction_date"],
+                        postgresql_include=["amount"])
+
+    op.drop_index("idx_budgets_business", table_name="budgets", if_exists=True)
+    op.drop_index("idx_suppliers_business_name", table_name="suppliers", if_exists=True)
+    op.drop_index("idx_categories_business", table_name="categories", if_exists=True)
+    op.drop_index("idx_inventory_business_category_name", table_name="inventory", if_exists=True)
+    op.drop_index("idx_customers_business_total_spent", table_name="customers", if_exists=True)
+    op.drop_index("idx_transactions_business_type_category_date", table_name="transactions", if_exists=True)
+    op.drop_index("idx_transactions_business_type_date", table_name="transactions", if_exists=True)
+
+    for table in BUSINESS_SCOPED_TABLES:
+        op.alter_column(table, "business_id", existing_type=sa.Integer, nullable=True)
@@ -0,0 +1,50 @@
+"""customer_scores: stored RFM and churn-risk scores per customer
+
+Written by the score refresh (app.core.rfm, refresh_customer_scores in
+app.main) and read by /api/analytics/rfm, listed by score within a
+business. A row goes away with its customer.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "customer_scores",
+        sa.Column("customer_id", sa.Integer, sa.ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("first_purchase", sa.Date, nullable=False),
+        sa.Column("last_purchase", sa.Date, nullable=False),
+        sa.Column("frequency", sa.Integer, nullable=False),
+        sa.Column("monetary", sa.Float, nullable=False),
+        sa.Column("recency_score", sa.Integer, nullable=False),
+        sa.Column("frequency_score", sa.Integer, nullable=False),
+        sa.Column("monetary_score", sa.Integer, nullable=False),
+        sa.Column("rfm_score", sa.Integer, nullable=False),
+        sa.Column("band", sa.String(20), nullable=False),
+        sa.Column("churn_risk", sa.Float, nullable=False),
+        sa.Column("churn_band", sa.String(10), nullable=False),
+        sa.Column("through_transaction_id", sa.Integer, nullable=False),
+        sa.Column("scored_at", sa.DateTime, nullable=False),
+        sa.Column("business_id", sa.Integer, sa.ForeignKey("businesses.id"), nullable=False),
+    )
+    op.create_index("idx_customer_scores_business_score", "customer_scores",
+                    ["business_id", "rfm_score", "customer_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_customer_scores_business_score", table_name="customer_scores")
+    op.drop_table("customer_scores")
@@ -0,0 +1,47 @@
+"""stock_movements: stock received into inventory
+
+Written by POST /api/inventory/{id}/receive. Each row records the supplier and,
+when known, the expense transaction the delivery fulfils and the days between
+the two, which the supplier scorecard (/api/analytics/suppliers) averages.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_movements",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("inventory_id", sa.Integer, sa.ForeignKey("inventory.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("supplier_id", sa.Integer, sa.ForeignKey("suppliers.id", ondelete="SET NULL")),
+        sa.Column("quantity", sa.Integer, nullable=False),
+        sa.Column("unit_cost", sa.Float),
+        sa.Column("reference", sa.String(50)),
+        sa.Column("notes", sa.Text),
+        sa.Column("transaction_id", sa.Integer),
+        sa.Column("lag_days", sa.Integer),
+        sa.Column("received_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+        sa.Column("business_id", sa.Integer, sa.ForeignKey("businesses.id"), nullable=False),
+    )
+    op.create_index("idx_stock_movements_business_supplier", "stock_movements", ["business_id", "supplier_id"])
+    op.create_index("idx_stock_movements_inventory", "stock_movements", ["inventory_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_stock_movements_inventory", table_name="stock_movements")
+    op.drop_index("idx_stock_movements_business_supplier", table_name="stock_movements")
+    op.drop_table("stock_movements")
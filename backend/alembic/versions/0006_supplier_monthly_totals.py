@@ -0,0 +1,88 @@
+"""supplier_monthly_totals: expenses per supplier and month, kept by a trigger
+
+The supplier portal (dashboard and totals) reads these rows instead of
+aggregating transactions on every login. The transactions_supplier_monthly_totals
+trigger applies each expense insert, update and delete as a delta, whatever
+writes it (the API, imports, COPY). Rows moved between partitions by
+create_transaction_partition are skipped, as in delete_transaction_items.
+The key leads with business_id, so a transaction moved to another business
+moves its amount between that business's rows, and the tenant filter is the
+key's prefix. The table is filled from the existing expenses, whose
+business_id revision 0003 made NOT NULL.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGER = """
+CREATE OR REPLACE FUNCTION add_supplier_monthly_total(p_supplier INTEGER, p_business INTEGER, p_date DATE,
+                                                      p_amount NUMERIC, p_orders INTEGER) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO supplier_monthly_totals AS totals (supplier_id, month, total, order_count, business_id)
+    VALUES (p_supplier, date_trunc('month', p_date)::date, p_amount, p_orders, p_business)
+    ON CONFLICT (business_id, supplier_id, month) DO UPDATE
+        SET total = totals.total + EXCLUDED.total,
+            order_count = totals.order_count + EXCLUDED.order_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_supplier_monthly_totals() RETURNS TRIGGER AS $$
+BEGIN
+    -- A partition being filled moves rows, it does not add or remove expenses
+    IF current_setting('app.moving_transactions', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.type = 'expense' AND OLD.supplier_id IS NOT NULL THEN
+        PERFORM add_supplier_monthly_total(OLD.supplier_id, OLD.business_id, OLD.transaction_date, -OLD.amount, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.type = 'expense' AND NEW.supplier_id IS NOT NULL THEN
+        PERFORM add_supplier_monthly_total(NEW.supplier_id, NEW.business_id, NEW.transaction_date, NEW.amount, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER transactions_supplier_monthly_totals
+    AFTER INSERT OR DELETE OR UPDATE OF type, supplier_id, amount, transaction_date, business_id ON transactions
+    FOR EACH ROW EXECUTE FUNCTION maintain_supplier_monthly_totals();
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "supplier_monthly_totals",
+        sa.Column("business_id", sa.Integer, sa.ForeignKey("businesses.id"), primary_key=True),
+        sa.Column("supplier_id", sa.Integer, sa.ForeignKey("suppliers.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("month", sa.Date, primary_key=True),
+        sa.Column("total", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("order_count", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.execute(TRIGGER)
+    op.execute("""
+        INSERT INTO supplier_monthly_totals (supplier_id, month, total, order_count, business_id)
+        SELECT supplier_id, date_trunc('month', transaction_date)::date, sum(amount), count(*), business_id
+        FROM transactions
+        WHERE type = 'expense' AND supplier_id IS NOT NULL
+        GROUP BY business_id, supplier_id, date_trunc('month', transaction_date)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS transactions_supplier_monthly_totals ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS maintain_supplier_monthly_totals()")
+    op.execute("DROP FUNCTION IF EXISTS add_supplier_monthly_total(INTEGER, INTEGER, DATE, NUMERIC, INTEGER)")
+    op.drop_table("supplier_monthly_totals")
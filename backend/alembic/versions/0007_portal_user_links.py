@@ -0,0 +1,61 @@
+"""users.customer_id / users.supplier_id: portal logins linked to their record
+
+The baseline creates these columns on a new database, but a database that
+was only stamped by 0001 has them only if scripts/link_portal_users.sql was
+run. Login and authentication read them, so they are added here when
+missing and filled with the script's matching rules (email first, then
+name). Links that already exist are kept.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keep in sync with scripts/link_portal_users.sql
+LINK_PORTAL_USERS = """
+ALTER TABLE users ADD COLUMN IF NOT EXISTS customer_id INTEGER REFERENCES customers(id);
+ALTER TABLE users ADD COLUMN IF NOT EXISTS supplier_id INTEGER REFERENCES suppliers(id);
+
+UPDATE users u
+SET customer_id = (
+    SELECT c.id FROM customers c
+    WHERE c.email = u.email OR c.name ILIKE '%' || u.full_name || '%'
+    ORDER BY (c.email = u.email) DESC NULLS LAST, c.id
+    LIMIT 1
+)
+WHERE u.role = 'customer' AND u.customer_id IS NULL;
+
+UPDATE users u
+SET supplier_id = (
+    SELECT s.id FROM suppliers s
+    WHERE s.email = u.email OR s.contact_person ILIKE '%' || u.full_name || '%'
+    ORDER BY (s.email = u.email) DESC NULLS LAST, s.id
+    LIMIT 1
+)
+WHERE u.role = 'supplier' AND u.supplier_id IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_users_customer ON users(customer_id);
+CREATE INDEX IF NOT EXISTS idx_users_supplier ON users(supplier_id);
+"""
+
+
+def upgrade() -> None:
+    op.execute(LINK_PORTAL_USERS)
+
+
+def downgrade() -> None:
+    # The baseline owns these columns on databases it created; the links are
+    # left in place rather than dropped from under it.
+    pass
@@ -0,0 +1,36 @@
+"""inventory.quantity NOT NULL DEFAULT 0, indexed for quantity-sorted listings
+
+/api/inventory pages by keyset on (quantity, id). A NULL quantity cannot be
+compared against a cursor, and sorting on coalesce(quantity, 0) could not
+use an index, so missing quantities become 0 and the column is NOT NULL.
+(business_id, quantity, id) then serves the tenant's quantity-sorted pages
+in either direction.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE inventory SET quantity = 0 WHERE quantity IS NULL")
+    op.alter_column("inventory", "quantity", existing_type=sa.Integer, nullable=False, server_default="0")
+    op.create_index("idx_inventory_business_quantity", "inventory", ["business_id", "quantity", "id"],
+                    if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_inventory_business_quantity", table_name="inventory", if_exists=True)
+    op.alter_column("inventory", "quantity", existing_type=sa.Integer, nullable=True, server_default="0")
@@ -0,0 +1,43 @@
+"""customer_scores.changes_through: rescore by transaction changes, not new ids
+
+The incremental score refresh picked customers by transaction id above the
+highest id already scored. An id is taken when a row is inserted, not when
+it commits, so a lower id committing late was never scored, and edits keep
+their id. The refresh now keeps the database time it started at and picks
+transactions whose updated_at is later (less a safety overlap), read
+through (business_id, updated_at).
+
+Stored scores have no change time yet, so the next refresh rescores
+everyone.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:08
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("customer_scores", sa.Column("changes_through", sa.DateTime))
+    op.drop_column("customer_scores", "through_transaction_id")
+    op.create_index("idx_transactions_business_updated", "transactions", ["business_id", "updated_at"],
+                    postgresql_include=["customer_id", "type"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_transactions_business_updated", table_name="transactions", if_exists=True)
+    # 0 makes the next id-based refresh treat every customer as changed
+    op.add_column("customer_scores", sa.Column("through_transaction_id", sa.Integer, nullable=False,
+                                               server_default="0"))
+    op.drop_column("customer_scores", "changes_through")
@@ -11,11 +11,77 @@ class Settings:
     DB_USER = os.getenv("DB_USER", "shinyjar")
     DB_PASSWORD = os.getenv("DB_PASSWORD", "shinyjar123")
     
-    DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    DATABASE_URL = os.getenv("DATABASE_URL", f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+    
+    # Read replica for GET handlers (empty: everything goes to DATABASE_URL). Clients
+    # that wrote in the last READ_YOUR_WRITES_SECONDS keep reading from the primary.
+    REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL", "")
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
     
     # App
     APP_NAME = os.getenv("APP_NAME", "Shiny Jar Business Suite")
     SECRET_KEY = os.getenv("SECRET_KEY", "Boku2003")
     DEBUG = os.getenv("DEBUG", "True").lower() == "true"
+    
+    # Logging (LOG_LEVELS overrides per logger, e.g. "app.auth=DEBUG,sqlalchemy.engine=WARNING")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+    
+    # Query inspection (N+1 detection and per-endpoint query budgets)
+    QUERY_INSPECTION = os.getenv("QUERY_INSPECTION", str(DEBUG)).lower() == "true"
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+    QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False").lower() == "true"
+    
+    # Slow query log (EXPLAIN ANALYZE is sampled, PostgreSQL SELECTs only)
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))
+    SLOW_QUERY_EXPLAIN_QUEUE_SIZE = int(os.getenv("SLOW_QUERY_EXPLAIN_QUEUE_SIZE", "10"))
+    SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.log")
+    
+    # On-demand profiling (admin requests sent with "X-Profile: 1")
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+    PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))
+    
+    # Startup: schema revision check (warn, strict or off) and warm-up of the hot read paths
+    SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "warn").lower()
+    STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "True").lower() == "true"
+    
+    # Monthly transaction partitions created ahead of time (PostgreSQL)
+    PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    PARTITION_CHECK_HOURS = float(os.getenv("PARTITION_CHECK_HOURS", "24"))
+    
+    # Auth. USER_CACHE_TTL_SECONDS is also the longest a deactivation or role change
+    # takes to apply on the workers that did not make it
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "15"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    
+    # Tenancy (requests without a token use DEFAULT_BUSINESS_ID unless TENANT_REQUIRED)
+    TENANT_REQUIRED = os.getenv("TENANT_REQUIRED", "False").lower() == "true"
+    DEFAULT_BUSINESS_ID = int(os.getenv("DEFAULT_BUSINESS_ID", "1"))
+    TENANT_CACHE_TTL_SECONDS = int(os.getenv("TENANT_CACHE_TTL_SECONDS", "300"))
+    
+    # Sales forecasts (/api/forecast): months of history fitted, and how long fitted
+    # models are kept when the data does not change
+    FORECAST_HISTORY_MONTHS = int(os.getenv("FORECAST_HISTORY_MONTHS", "36"))
+    FORECAST_CACHE_TTL_SECONDS = int(os.getenv("FORECAST_CACHE_TTL_SECONDS", "3600"))
+    
+    # Customer RFM / churn-risk scores: incremental refresh every RFM_REFRESH_MINUTES
+    # (0 turns the background refresh off), full rescoring every RFM_FULL_REFRESH_HOURS
+    RFM_REFRESH_MINUTES = float(os.getenv("RFM_REFRESH_MINUTES", "15"))
+    RFM_FULL_REFRESH_HOURS = float(os.getenv("RFM_FULL_REFRESH_HOURS", "24"))
+    # Transactions changed this long before the previous refresh started are looked at
+    # again: a write that commits later than that is only picked up by the full rescoring
+    RFM_CHANGE_OVERLAP_SECONDS = int(os.getenv("RFM_CHANGE_OVERLAP_SECONDS", "300"))
+    
+    # Cohort matrices (/api/analytics/cohorts) cover closed months only, so they are
+    # kept until the month closes or older income changes, at most this long
+    COHORT_CACHE_TTL_SECONDS = int(os.getenv("COHORT_CACHE_TTL_SECONDS", "86400"))
+    
+    # Supplier scorecards (/api/analytics/suppliers) are recomputed when expenses change;
+    # inventory and deliveries show up within this long
+    SUPPLIER_SCORECARD_CACHE_TTL_SECONDS = int(os.getenv("SUPPLIER_SCORECARD_CACHE_TTL_SECONDS", "900"))
 
 settings = Settings()
\ No newline at end of file
@@ -1,16 +1,68 @@
+import threading
+from typing import Callable, List
+
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Engines are created on first use, not at import: importing the app needs
+# neither the database driver nor a reachable database
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+_engines = {}
+_engines_lock = threading.Lock()
+_engine_hooks: List[Callable] = []
 
 Base = declarative_base()
 
+def on_engine_created(hook: Callable) -> None:
+    """Run ``hook(engine)`` for every engine, including ones already created"""
+    with _engines_lock:
+        _engine_hooks.append(hook)
+        for created in _engines.values():
+            hook(created)
+
+def _get(name: str, url: str):
+    with _engines_lock:
+        created = _engines.get(name)
+        if created is None:
+            # Hooks (event listeners) run before any other thread can use the engine
+            created = create_engine(url)
+            for hook in _engine_hooks:
+                hook(created)
+            _engines[name] = created
+        return created
+
+def get_engine():
+    """The primary engine"""
+    return _get("primary", settings.DATABASE_URL)
+
+def get_replica_engine():
+    """The read replica engine (REPLICA_DATABASE_URL), or the primary when there is none"""
+    if not settings.REPLICA_DATABASE_URL:
+        return get_engine()
+    return _get("replica", settings.REPLICA_DATABASE_URL)
+
+def engines():
+    """Engines created so far"""
+    with _engines_lock:
+        return list(_engines.values())
+
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db(request: Request):
+    """Session for read-only handlers: the replica, unless ReadYourWritesMiddleware
+    pinned the request to the primary (the client wrote recently)"""
+    read_primary = getattr(request.state, "read_primary", False)
+    db = SessionLocal(bind=get_engine() if read_primary else get_replica_engine())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
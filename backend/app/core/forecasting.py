@@ -0,0 +1,107 @@
+"""Monthly sales forecasts for many series at once, in numpy.
+
+The model is additive Holt-Winters: level, trend and a 12-month seasonal
+component. One pass fits every series of a tenant (total sales, each
+category, each customer segment). The series are the rows of a
+(series, months) matrix, and each smoothing step updates all of them for
+every (alpha, beta, gamma) in the parameter grid together. Each series keeps
+the parameters with the lowest one-step-ahead squared error. Series with
+less than two seasons of history use Holt's linear trend, with no seasonal
+component.
+
+Prediction intervals use the ETS(A,A,A) forecast variance
+
+    sigma^2 * (1 + sum_{j=1}^{h-1} c_j^2),  c_j = alpha * (1 + j * beta) + gamma * [j % m == 0]
+
+where sigma is the standard deviation of the one-step errors.
+"""
+from itertools import product
+from statistics import NormalDist
+from typing import Tuple
+
+import numpy as np
+
+SEASON_LENGTH = 12
+
+ALPHAS = (0.1, 0.2, 0.4, 0.6, 0.8)
+BETAS = (0.01, 0.05, 0.15, 0.3)
+GAMMAS = (0.05, 0.15, 0.3, 0.5)
+
+
+class HoltWinters:
+    """Fitted models for the rows of a (series, months) matrix; every attribute
+    has one entry (row) per series"""
+
+    def __init__(self, alpha, beta, gamma, level, trend, season, sigma, n_obs: int, seasonal: bool):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.level = level
+        self.trend = trend
+        self.season = season      # (series, SEASON_LENGTH), indexed by month position mod SEASON_LENGTH
+        self.sigma = sigma
+        self.n_obs = n_obs
+        self.seasonal = seasonal
+
+    @property
+    def model(self) -> str:
+        return "holt-winters" if self.seasonal else "holt"
+
+    def forecast(self, horizon: int, interval: float = 0.95) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(mean, lower, upper) for the next ``horizon`` months, each (series, horizon).
+        Sales are not negative, so all three are clipped at 0."""
+        steps = np.arange(1, horizon + 1)
+        season = self.season[:, (self.n_obs + steps - 1) % SEASON_LENGTH]
+        mean = self.level[:, None] + steps * self.trend[:, None] + season
+
+        # c_j for j = 1 .. horizon - 1, then the running sum of c_j^2
+        j = steps[:-1]
+        c = self.alpha[:, None] * (1 + j * self.beta[:, None]) + self.gamma[:, None] * (j % SEASON_LENGTH == 0)
+        spread = np.sqrt(1 + np.concatenate([np.zeros((len(mean), 1)), np.cumsum(c ** 2, axis=1)], axis=1))
+        half_width = NormalDist().inv_cdf(0.5 + interval / 2) * self.sigma[:, None] * spread
+        return (np.clip(mean, 0, None), np.clip(mean - half_width, 0, None), np.clip(mean + half_width, 0, None))
+
+
+def fit(y: np.ndarray) -> HoltWinters:
+    """Fit every row of ``y`` (series, months), trying the whole parameter grid at once"""
+    y = np.asarray(y, dtype=float)
+    n_series, n_obs = y.shape
+    seasonal = n_obs >= 2 * SEASON_LENGTH
+    grid = np.array(list(product(ALPHAS, BETAS, GAMMAS if seasonal else (0.0,))))
+    alpha, beta, gamma = (grid[:, i:i + 1] for i in range(3))  # (grid, 1), broadcast over series
+
+    # Initial state: the first season's mean and seasonal offsets and the change in
+    # mean between the first two seasons, or the first two observations without seasonality
+    if seasonal:
+        first = y[:, :SEASON_LENGTH].mean(axis=1)
+        level = first
+        trend = (y[:, SEASON_LENGTH:2 * SEASON_LENGTH].mean(axis=1) - first) / SEASON_LENGTH
+        season = y[:, :SEASON_LENGTH] - first[:, None]
+    else:
+        level = y[:, 0]
+        trend = y[:, 1] - y[:, 0] if n_obs > 1 else np.zeros(n_series)
+        season = np.zeros((n_series, SEASON_LENGTH))
+    level = np.broadcast_to(level, (len(grid), n_series)).copy()
+    trend = np.broadcast_to(trend, (len(grid), n_series)).copy()
+    season = np.broadcast_to(season, (len(grid), n_series, SEASON_LENGTH)).copy()
+
+    sse = np.zeros((len(grid), n_series))
+    for t in range(n_obs):
+        position = t % SEASON_LENGTH
+        observed = y[:, t]
+        previous_season = season[:, :, position]
+        error = observed - (level + trend + previous_season)
+        sse += error ** 2
+        new_level = alpha * (observed - previous_season) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[:, :, position] = gamma * (observed - new_level) + (1 - gamma) * previous_season
+        level = new_level
+
+    best = sse.argmin(axis=0)
+    rows = np.arange(n_series)
+    return HoltWinters(
+        alpha=grid[best, 0], beta=grid[best, 1], gamma=grid[best, 2],
+        level=level[best, rows], trend=trend[best, rows], season=season[best, rows],
+        sigma=np.sqrt(sse[best, rows] / max(n_obs, 1)),
+        n_obs=n_obs, seasonal=seasonal,
+    )
@@ -0,0 +1,22 @@
+import base64
+import json
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(value: Any, row_id: int) -> str:
+    """Encode the last row's sort value and id into an opaque cursor"""
+    raw = json.dumps([value, row_id], default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, int]]:
+    """Decode a cursor produced by encode_cursor (None if no cursor given)"""
+    if not cursor:
+        return None
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,79 @@
+"""Monthly range partitions of the transactions table (PostgreSQL only).
+
+transactions is partitioned by month on transaction_date (scripts/init.sql,
+scripts/partition_transactions.sql). A row for a month without a partition
+lands in transactions_default; PartitionMaintenance creates the coming
+months ahead of time through the ensure_transaction_partitions() SQL
+function, which also moves such rows into their new partition.
+
+Queries only skip partitions when they constrain transaction_date itself
+(``transaction_date >= month_start(11)``), not an expression over it.
+"""
+import logging
+import threading
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(months_back: int = 0, today: Optional[date] = None) -> date:
+    """First day of the month ``months_back`` months before the current one"""
+    today = today or date.today()
+    month_index = today.year * 12 + today.month - 1 - months_back
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def is_partitioned(conn) -> bool:
+    return bool(conn.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('transactions')"
+    )).scalar())
+
+
+def ensure_partitions(engine, months_ahead: int) -> int:
+    """Create any missing partition from this month through ``months_ahead``; returns how many"""
+    if engine.dialect.name != "postgresql":
+        return 0
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            logger.warning("transactions is not partitioned; run scripts/partition_transactions.sql")
+            return 0
+        created = conn.execute(
+            text("SELECT ensure_transaction_partitions(:start, :end)"),
+            {"start": month_start(), "end": month_start(-months_ahead)},
+        ).scalar()
+    if created:
+        logger.info("Created transaction partitions", extra={"created": created, "months_ahead": months_ahead})
+    return created
+
+
+class PartitionMaintenance:
+    """Keeps ``months_ahead`` months of partitions in place: at start, then every ``interval_hours``"""
+
+    def __init__(self, engine, months_ahead: int, interval_hours: float):
+        self.engine = engine
+        self.months_ahead = months_ahead
+        self.interval = interval_hours * 3600
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None and self.engine.dialect.name == "postgresql":
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="partition-maintenance", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                ensure_partitions(self.engine, self.months_ahead)
+            except Exception:
+                logger.exception("Transaction partition maintenance failed")
+            if self._stop.wait(self.interval):
+                return
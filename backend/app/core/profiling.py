@@ -0,0 +1,195 @@
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+from .config import settings
+from .request_context import current_request
+
+_profile_ids = itertools.count(1)
+
+# Finished profiles, fetched later through the admin endpoints
+_profiles = deque(maxlen=settings.PROFILE_BUFFER_SIZE)
+_profiles_lock = threading.Lock()
+
+
+def recent_profiles(limit: Optional[int] = None) -> List["RequestProfile"]:
+    """Most recent profiles first"""
+    with _profiles_lock:
+        profiles = list(reversed(_profiles))
+    return profiles[:limit] if limit else profiles
+
+
+def get_profile(profile_id: str) -> Optional["RequestProfile"]:
+    with _profiles_lock:
+        return next((profile for profile in _profiles if profile.id == profile_id), None)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RequestProfile:
+    """Stack samples and SQL timings collected for one profiled request.
+
+    Sampled threads are the event loop thread that received the request plus
+    any worker thread that executes SQL on its behalf (registered from the
+    engine events), so sync endpoints running in the threadpool are covered
+    from their first query onwards.
+    """
+
+    def __init__(self, method: str, path: str, interval: float):
+        self.id = f"{int(time.time())}-{next(_profile_ids)}"
+        self.method = method
+        self.path = path
+        self.interval = interval
+        self.threads = {threading.get_ident()}
+        self.samples: Counter = Counter()
+        self.statements: Dict[str, list] = {}
+        self.started = time.perf_counter()
+        self.wall_time = 0.0
+        self.status_code = None
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{self.id}", daemon=True)
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self.wall_time = time.perf_counter() - self.started
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.threads):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                # An idle event loop parked in select() is not request work
+                if frame.f_code.co_name == "select" and frame.f_code.co_filename.endswith("selectors.py"):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def record_statement(self, statement: str, duration: float) -> None:
+        self.threads.add(threading.get_ident())
+        entry = self.statements.setdefault(" ".join(statement.split()), [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+
+    def collapsed(self) -> str:
+        """Folded stacks ("frame;frame;frame count"), as read by flamegraph.pl and speedscope"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+    def summary(self) -> dict:
+        db_time = sum(total for _, total in self.statements.values())
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "wall_time_ms": round(self.wall_time * 1000, 2),
+            "db_time_ms": round(db_time * 1000, 2),
+            "python_time_ms": round(max(self.wall_time - db_time, 0) * 1000, 2),
+            "query_count": sum(count for count, _ in self.statements.values()),
+            "samples": sum(self.samples.values()),
+            "sample_interval_ms": self.interval * 1000,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            **self.summary(),
+            "db_breakdown": [
+                {"statement": statement, "count": count, "total_ms": round(total * 1000, 2)}
+                for statement, (count, total) in sorted(
+                    self.statements.items(), key=lambda item: -item[1][1])
+            ],
+            "collapsed_stacks": self.collapsed(),
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is not None and stats.profile is not None and context is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_profile_started", None)
+    if started is not None:
+        current_request.get().profile.record_statement(statement, time.perf_counter() - started)
+
+
+def profile_engine(engine) -> None:
+    """Time SQL statements of profiled requests"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class ProfilingMiddleware:
+    """Profiles requests sent with ``X-Profile: 1`` by an authorized caller.
+
+    ``authorize`` receives the bearer token and decides whether the caller
+    may profile. Requests without the header only pay for a header scan.
+    The profile id is returned in ``X-Profile-Id``. Must run inside
+    MetricsMiddleware, which owns the request stats.
+    """
+
+    def __init__(self, app, authorize: Callable[[str], bool]):
+        self.app = app
+        self.authorize = authorize
+
+    @staticmethod
+    def _headers(scope) -> Optional[dict]:
+        """Request headers if profiling was asked for, else None"""
+        for name, value in scope.get("headers", ()):
+            if name == b"x-profile":
+                if value.strip() != b"1":
+                    return None
+                return {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        return None
+
+    async def __call__(self, scope, receive, send):
+        headers = self._headers(scope) if scope["type"] == "http" else None
+        stats = current_request.get()
+        if headers is None or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = headers.get("authorization", "")
+        token = authorization[7:] if authorization.lower().startswith("bearer ") else ""
+        if not token or not self.authorize(token):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope.get("method", ""), scope.get("path", ""),
+                                 settings.PROFILE_SAMPLE_INTERVAL_MS / 1000.0)
+        stats.profile = profile
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            stats.profile = None
+            with _profiles_lock:
+                _profiles.append(profile)
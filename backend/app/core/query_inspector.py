@@ -0,0 +1,164 @@
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from .config import settings
+from .request_context import current_request
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when an endpoint runs more statements than its budget"""
+
+
+def _freeze(parameters):
+    """Hashable form of DBAPI parameters (dict, tuple or list of them)"""
+    if isinstance(parameters, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in parameters.items()))
+    if isinstance(parameters, (list, tuple)):
+        return tuple(_freeze(p) for p in parameters)
+    try:
+        hash(parameters)
+        return parameters
+    except TypeError:
+        return repr(parameters)
+
+
+def find_repeated_statements(statements: List[Tuple[str, tuple]],
+                             threshold: int) -> List[Tuple[str, int]]:
+    """Statements executed with at least ``threshold`` different parameter sets.
+
+    The same SQL text run over and over with only the bound values changing
+    is the signature of an N+1 (one lazy load or lookup per row).
+    """
+    parameter_sets: Dict[str, set] = defaultdict(set)
+    for statement, parameters in statements:
+        parameter_sets[statement].add(parameters)
+    return sorted(
+        ((statement, len(params)) for statement, params in parameter_sets.items()
+         if len(params) >= threshold),
+        key=lambda item: -item[1],
+    )
+
+
+def _check_budget(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is None:
+        return
+    if stats.statements is not None:
+        stats.statements.append((statement, _freeze(parameters)))
+    if (settings.QUERY_BUDGET_STRICT and stats.query_budget is not None
+            and stats.query_count >= stats.query_budget):
+        raise QueryBudgetExceeded(
+            f"{stats.method} {stats.route} exceeded its budget of {stats.query_budget} queries"
+        )
+
+
+def inspect_engine(engine) -> None:
+    """Record per-request statements and enforce endpoint query budgets"""
+    if not event.contains(engine, "before_cursor_execute", _check_budget):
+        event.listen(engine, "before_cursor_execute", _check_budget)
+
+
+def query_budget(max_queries: int):
+    """Endpoint dependency declaring the most statements a request may run.
+
+    Usage: ``@app.get(..., dependencies=[Depends(query_budget(3))])``.
+    Over-budget requests are logged; with QUERY_BUDGET_STRICT they fail.
+    """
+    async def set_query_budget():
+        stats = current_request.get()
+        if stats is not None:
+            stats.query_budget = max_queries
+    return set_query_budget
+
+
+class QueryInspectionMiddleware:
+    """Flags N+1 patterns and budget overruns per request (dev/test only).
+
+    Must run inside MetricsMiddleware, which creates the request stats and
+    counts the statements. Adds an ``X-Query-Count`` header so tests can
+    assert on it.
+    """
+
+    def __init__(self, app, threshold: Optional[int] = None):
+        self.app = app
+        self.threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        stats = current_request.get()
+        if scope["type"] != "http" or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        stats.statements = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(stats.query_count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.report(stats)
+
+    def report(self, stats) -> None:
+        for statement, count in find_repeated_statements(stats.statements, self.threshold):
+            logger.warning(
+                "Possible N+1 in %s %s: statement ran %d times with different parameters: %s",
+                stats.method, stats.route, count, " ".join(statement.split())[:300]
+            )
+        if stats.query_budget is not None and stats.query_count > stats.query_budget:
+            logger.warning(
+                "%s %s ran %d queries (budget %d)",
+                stats.method, stats.route, stats.query_count, stats.query_budget
+            )
+
+
+class QueryRecorder:
+    """Statements seen by an engine while the recorder is active (see record_queries)"""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, tuple]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        return find_repeated_statements(self.statements, threshold or settings.N_PLUS_ONE_THRESHOLD)
+
+
+@contextmanager
+def record_queries(engine):
+    """Capture every statement the engine executes inside the block.
+
+    Works across threads (e.g. a TestClient call), unlike the per-request stats.
+    """
+    recorder = QueryRecorder()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorder.statements.append((statement, _freeze(parameters)))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield recorder
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def assert_max_queries(engine, max_queries: int):
+    """Fail if the block executes more than ``max_queries`` statements"""
+    with record_queries(engine) as recorder:
+        yield recorder
+    if recorder.count > max_queries:
+        listing = "\n".join(" ".join(sql.split())[:200] for sql, _ in recorder.statements)
+        raise AssertionError(f"Expected at most {max_queries} queries, ran {recorder.count}:\n{listing}")
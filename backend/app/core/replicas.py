@@ -0,0 +1,54 @@
+"""Read-your-writes routing between the primary and the read replica.
+
+Handlers that only read take their session from ``get_read_db``, which uses
+the replica engine. A replica lags the primary a little, so a client that
+has just written (any successful non-GET request) is pinned to the primary
+for ``window_seconds``; its reads in that window see its own writes.
+
+Clients are told apart by their Authorization header, or by their address
+when anonymous. The pin is per process: with several workers behind a load
+balancer, a write and the next read can land on different workers, so keep
+the window at least as long as the replica's usual lag and let clients that
+need strict consistency send ``X-Read-Primary: 1``.
+"""
+from .cache import TTLCache
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    """Set ``request.state.read_primary`` for clients that wrote recently"""
+
+    def __init__(self, app, window_seconds: float):
+        self.app = app
+        self.recent_writers = TTLCache(ttl_seconds=window_seconds, max_size=10_000)
+
+    @staticmethod
+    def client_key(scope):
+        headers = dict(scope.get("headers", ()))
+        authorization = headers.get(b"authorization")
+        if authorization:
+            return authorization
+        client = scope.get("client")
+        return client[0] if client else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = self.client_key(scope)
+        if scope["method"] in SAFE_METHODS:
+            headers = dict(scope.get("headers", ()))
+            scope.setdefault("state", {})["read_primary"] = (
+                headers.get(b"x-read-primary") == b"1" or self.recent_writers.get(key) is not None
+            )
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.recent_writers.set(key, True)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,37 @@
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestStats:
+    """Per-request bookkeeping shared by the middleware and the engine events.
+
+    The object is created by the metrics middleware and stored in a context
+    variable, which starlette copies into the threadpool for sync endpoints,
+    so SQL executed by a handler is attributed to the request that ran it.
+    """
+
+    __slots__ = ("scope", "query_count", "db_time", "statements", "query_budget", "profile")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements = None  # list of (sql, params) when query inspection is on
+        self.query_budget = None  # max statements declared by the endpoint
+        self.profile = None  # RequestProfile when the request is being profiled
+
+    @property
+    def method(self) -> str:
+        return self.scope.get("method", "")
+
+    @property
+    def route(self) -> str:
+        """Route template (e.g. /api/customers/{customer_id}) once routing is done"""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "<unmatched>"
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+# Correlation id of the request being served, stamped on log records
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
@@ -0,0 +1,111 @@
+"""RFM (recency, frequency, monetary) and churn-risk scores for customers, in numpy.
+
+Recency, frequency and monetary each get a score from 1 to 5. The score is
+the quintile of the value's mid-rank percentile within the business's
+customers. Recency is ranked reversed, so 5 means a recent buyer. Ties
+share a percentile, so when everyone has the same value they all get 3. A
+subset of customers can be scored against the whole population, which is
+how the incremental refresh rescores only the customers it touched.
+
+Churn risk is the probability that a customer still buying at their usual
+pace would have bought again by now: 1 - exp(-days since last purchase /
+mean days between their purchases). One-time buyers use the business's
+median gap.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (band, lowest R + F + M score in the band), best first
+RFM_BANDS = (("champions", 13), ("loyal", 10), ("needs_attention", 7), ("hibernating", 3))
+# (band, highest churn risk in the band)
+CHURN_BANDS = (("low", 0.5), ("medium", 0.8), ("high", 1.0))
+
+# Mean purchase gap for one-time buyers when no customer has bought twice
+DEFAULT_GAP_DAYS = 90.0
+
+
+def quintile_scores(values: np.ndarray, population: np.ndarray) -> np.ndarray:
+    """1-5 quintile of each value's mid-rank percentile within ``population``"""
+    ordered = np.sort(population)
+    if len(ordered) == 0:
+        return np.full(len(values), 3)
+    below = np.searchsorted(ordered, values, side="left")
+    at_or_below = np.searchsorted(ordered, values, side="right")
+    percentile = (below + at_or_below) / (2 * len(ordered))
+    return np.minimum((percentile * 5).astype(int) + 1, 5)
+
+
+def mean_gaps(first_day: np.ndarray, last_day: np.ndarray, frequency: np.ndarray,
+              fallback: Optional[float] = None) -> np.ndarray:
+    """Mean days between purchases, ``fallback`` (or the median of the others) for one-time buyers"""
+    repeat = frequency > 1
+    gaps = np.full(len(frequency), np.nan)
+    gaps[repeat] = (last_day[repeat] - first_day[repeat]) / (frequency[repeat] - 1)
+    if fallback is None:
+        positive = gaps[repeat & (gaps > 0)]
+        fallback = float(np.median(positive)) if len(positive) else DEFAULT_GAP_DAYS
+    gaps[~repeat | (gaps <= 0)] = fallback
+    return gaps
+
+
+def score_customers(today: int, first_day: np.ndarray, last_day: np.ndarray, frequency: np.ndarray,
+                    monetary: np.ndarray, scored: np.ndarray) -> Dict[str, np.ndarray]:
+    """Scores for the customers selected by the boolean mask ``scored``, ranked
+    against every customer passed in. Dates are day numbers (date.toordinal())."""
+    recency = today - last_day
+    r = quintile_scores(-recency[scored], -recency)
+    f = quintile_scores(frequency[scored], frequency)
+    m = quintile_scores(monetary[scored], monetary)
+    total = r + f + m
+
+    gaps = mean_gaps(first_day, last_day, frequency)[scored]
+    churn_risk = 1 - np.exp(-recency[scored] / gaps)
+
+    band_floors = np.array([floor for _, floor in RFM_BANDS])
+    band_names = np.array([name for name, _ in RFM_BANDS])
+    churn_ceilings = np.array([ceiling for _, ceiling in CHURN_BANDS])
+    churn_names = np.array([name for name, _ in CHURN_BANDS])
+    return {
+        "recency_score": r,
+        "frequency_score": f,
+        "monetary_score": m,
+        "rfm_score": total,
+        "band": band_names[np.argmax(total[:, None] >= band_floors, axis=1)],
+        "churn_risk": np.round(churn_risk, 4),
+        "churn_band": churn_names[np.searchsorted(churn_ceilings, churn_risk, side="left").clip(0, len(CHURN_BANDS) - 1)],
+    }
+
+
+class RfmMaintenance:
+    """Calls ``refresh()`` (incremental rescoring of every business) at start,
+    then every ``interval_minutes``"""
+
+    def __init__(self, refresh: Callable[[], None], interval_minutes: float):
+        self.refresh = refresh
+        self.interval = interval_minutes * 60
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None and self.interval > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="rfm-maintenance", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Customer score refresh failed")
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,51 @@
+"""Startup check that the database is migrated to the latest Alembic revision.
+
+The app no longer creates tables itself (see backend/alembic), so a worker
+started against an unmigrated database would fail on its first request.
+``check_schema`` compares the revision stamped in the database with the
+head of backend/alembic/versions when the app starts:
+
+- ``SCHEMA_CHECK=warn`` (default) logs a warning and starts anyway
+- ``SCHEMA_CHECK=strict`` refuses to start
+- ``SCHEMA_CHECK=off`` skips the check (and its database round trip)
+"""
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic")
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def check_schema(engine, mode: str = "warn") -> Optional[dict]:
+    """Compare the database revision with the migration head; returns the status"""
+    if mode == "off":
+        return None
+    # Alembic is only needed here, at startup
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory(ALEMBIC_DIR).get_heads())
+    try:
+        with engine.connect() as conn:
+            current = set(MigrationContext.configure(conn).get_current_heads())
+    except Exception as e:
+        if mode == "strict":
+            raise
+        logger.warning("Schema check skipped, database unreachable: %s", e)
+        return {"status": "unreachable", "error": str(e), "heads": sorted(heads)}
+
+    status = {"status": "ok" if current == heads else "out_of_date",
+              "current": sorted(current), "heads": sorted(heads)}
+    if current != heads:
+        message = (f"Database schema is at revision {', '.join(sorted(current)) or '(none)'}, "
+                   f"the code expects {', '.join(sorted(heads))}; run: cd backend && alembic upgrade head")
+        if mode == "strict":
+            raise SchemaOutOfDate(message)
+        logger.warning(message)
+    return status
@@ -0,0 +1,153 @@
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+
+from sqlalchemy import event
+
+from .config import settings
+from .logging_config import background_handler
+from .request_context import current_request
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN ANALYZE executes the statement, on a connection of its own: only plain
+# SELECTs are re-run. A WITH may hide a data-modifying CTE, and a locking read
+# would wait on the row locks the request that issued it still holds.
+_LOCKING_CLAUSE = re.compile(r"\bfor\s+(update|no\s+key\s+update|share|key\s+share)\b", re.IGNORECASE)
+
+
+def explainable(statement: str) -> bool:
+    return statement.lstrip()[:6].lower() == "select" and not _LOCKING_CLAUSE.search(statement)
+
+
+class SlowQueryLog:
+    """Ring buffer (plus optional rotating file) of statements slower than a threshold.
+
+    A sampled fraction of slow SELECTs on PostgreSQL is re-run under
+    ``EXPLAIN (ANALYZE, BUFFERS)`` on a background thread, using a separate
+    connection, and the plan is attached to the entry when it arrives. At most
+    ``explain_queue_size`` EXPLAINs wait or run at once; further samples are dropped.
+    """
+
+    def __init__(self, threshold_ms: float, buffer_size: int = 100,
+                 explain_sample_rate: float = 0.0, log_file: Optional[str] = None,
+                 explain_queue_size: int = 10):
+        self.threshold = threshold_ms / 1000.0
+        self.explain_sample_rate = explain_sample_rate
+        self._entries = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._explain_slots = threading.BoundedSemaphore(explain_queue_size)
+        self._engines = set()
+        self._log_file = log_file
+        self._file_logger = None
+
+    def _write(self, record: dict) -> None:
+        """Append a JSON line to the rotating log file (opened on first use, written off-thread)"""
+        if not self._log_file:
+            return
+        if self._file_logger is None:
+            directory = os.path.dirname(self._log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_logger = logging.getLogger("shinyjar.slow_queries.file")
+            file_logger.setLevel(logging.INFO)
+            file_logger.propagate = False
+            if not file_logger.handlers:
+                handler = RotatingFileHandler(self._log_file, maxBytes=5 * 1024 * 1024, backupCount=3)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                file_logger.addHandler(background_handler(handler))
+            self._file_logger = file_logger
+        self._file_logger.info(json.dumps(record, default=str))
+
+    # ----- engine hooks -----
+
+    def install(self, engine) -> None:
+        if engine not in self._engines:
+            self._engines.add(engine)
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < self.threshold or not conn.get_execution_options().get("slow_query_log", True):
+            return
+        entry = self.record(statement, parameters, elapsed)
+        if (self.explain_sample_rate > 0 and not executemany
+                and conn.dialect.name == "postgresql"
+                and random.random() < self.explain_sample_rate
+                and explainable(statement)
+                and self._explain_slots.acquire(blocking=False)):
+            self._explain_executor.submit(self._explain, conn.engine, entry, statement, parameters)
+
+    # ----- recording -----
+
+    def record(self, statement: str, parameters, elapsed: float) -> dict:
+        stats = current_request.get()
+        entry = {
+            "id": next(self._ids),
+            "timestamp": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "duration_ms": round(elapsed * 1000, 2),
+            "route": f"{stats.method} {stats.route}" if stats is not None else None,
+            "statement": statement,
+            "parameters": repr(parameters)[:500],
+            "plan": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning("Slow query (%.1f ms) in %s: %s", entry["duration_ms"], entry["route"],
+                       " ".join(statement.split())[:200])
+        self._write(entry)
+        return entry
+
+    def _explain(self, engine, entry: dict, statement: str, parameters) -> None:
+        try:
+            with engine.connect() as conn:
+                conn = conn.execution_options(slow_query_log=False)
+                rows = conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters
+                ).fetchall()
+                conn.rollback()
+            entry["plan"] = "\n".join(row[0] for row in rows)
+        except Exception as e:
+            entry["plan"] = f"EXPLAIN failed: {e}"
+        finally:
+            self._explain_slots.release()
+        self._write({"id": entry["id"], "plan": entry["plan"]})
+
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        """Most recent entries first"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    buffer_size=settings.SLOW_QUERY_BUFFER_SIZE,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    log_file=settings.SLOW_QUERY_LOG_FILE or None,
+    explain_queue_size=settings.SLOW_QUERY_EXPLAIN_QUEUE_SIZE,
+)
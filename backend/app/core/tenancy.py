@@ -0,0 +1,66 @@
+"""Business (tenant) scoping for ORM sessions.
+
+A session scoped with ``scope_session(db, business_id)`` only sees rows of
+that business: every ORM SELECT, UPDATE and DELETE gets
+``business_id = :business_id`` for each business-owned entity it touches,
+including joined, eagerly loaded and lazily loaded ones, and new
+business-owned objects are stamped with the business when flushed.
+
+Business-owned models are the subclasses of the mixin passed to
+``install_tenant_scoping`` (BusinessScoped in app.models.database). Core
+``insert()`` statements are not rewritten; they must set business_id
+themselves (see ``tenant_of``). A statement can opt out with
+``.execution_options(all_tenants=True)``.
+"""
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, with_loader_criteria
+
+_scoped_base = None
+
+
+def scope_session(session: Session, business_id: int) -> Session:
+    session.info["business_id"] = business_id
+    return session
+
+
+def tenant_of(session: Session) -> Optional[int]:
+    """Business the session is scoped to, or None when unscoped"""
+    return session.info.get("business_id")
+
+
+def _add_tenant_criteria(execute_state):
+    business_id = execute_state.session.info.get("business_id")
+    if business_id is None or execute_state.execution_options.get("all_tenants"):
+        return
+    # Relationship and deferred column loads inherit the criteria from the parent statement
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    if execute_state.is_select or execute_state.is_update or execute_state.is_delete:
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                _scoped_base,
+                lambda cls: cls.business_id == business_id,
+                include_aliases=True,
+            )
+        )
+
+
+def _stamp_business(session, flush_context, instances):
+    business_id = session.info.get("business_id")
+    if business_id is None:
+        return
+    for obj in session.new:
+        if isinstance(obj, _scoped_base):
+            obj.business_id = business_id
+
+
+def install_tenant_scoping(scoped_base) -> None:
+    """Register the session hooks (once) for models deriving from ``scoped_base``"""
+    global _scoped_base
+    if _scoped_base is not None:
+        return
+    _scoped_base = scoped_base
+    event.listen(Session, "do_orm_execute", _add_tenant_criteria)
+    event.listen(Session, "before_flush", _stamp_business)
@@ -0,0 +1,64 @@
+"""Warm-up requests, run by the startup hook before the worker accepts traffic.
+
+The first request to each route pays for work that is cached afterwards:
+opening pool connections (and the dialect's first-connect queries),
+configuring the ORM mappers, compiling each statement into the engine's
+compiled cache, and building the route's validation and serialization
+code. ``warm_up`` sends one in-process GET to each hot path through the
+full ASGI app so that cost is paid at startup instead.
+
+The caller passes dependency overrides that scope the warm-up to a tenant
+with no rows: the SQL is the same as for real tenants (business_id is a
+bound parameter), so it compiles and caches the same statements, but every
+query is a cheap index probe that returns nothing.
+"""
+import logging
+import time
+from typing import Callable, Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+async def _get(app, path: str, query: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query.encode(), "root_path": "",
+        "headers": [(b"host", b"warmup"), (b"user-agent", b"startup-warmup")],
+        "client": ("127.0.0.1", 0), "server": ("warmup", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_up(app, paths: Iterable[Tuple[str, str]], overrides: Dict[Callable, Callable]) -> Dict[str, dict]:
+    """GET each (path, query string) once with ``overrides`` in place; returns status and time per path"""
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides.update(overrides)
+    results = {}
+    try:
+        for path, query in paths:
+            started = time.perf_counter()
+            try:
+                status = await _get(app, path, query)
+            except Exception as e:
+                logger.warning("Warm-up request %s failed: %s", path, e)
+                status = None
+            results[path] = {"status": status, "ms": round((time.perf_counter() - started) * 1000, 1)}
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved)
+    return results
@@ -1,32 +1,49 @@
-import sys
+import time
+IMPORT_STARTED = time.perf_counter()
+
 import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import func
 from sqlalchemy import text
+from sqlalchemy import tuple_
+from sqlalchemy import select, insert, update, case, true
+from sqlalchemy import event, inspect
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 
-# 🚀 CRITICAL FIX: Add the correct path for imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-backend_dir = os.path.dirname(os.path.dirname(current_dir))
-sys.path.insert(0, backend_dir)
-
-from fastapi import FastAPI, Depends, HTTPException, Body
-from sqlalchemy.orm import Session
-import uvicorn
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Body, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, date
 from pydantic import BaseModel, Field, validator
 
-# Local imports - NOW THEY WILL WORK!
-from app.core.database import get_db, engine
-from app.core.config import settings
-from app.models.database import Base, Transaction, Customer, Supplier, Budget, Category, Business, User, Inventory
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Local imports (relative, so both app.main and backend.app.main work without sys.path changes)
+from .core.database import SessionLocal, get_db, get_read_db, get_engine, on_engine_created
+from .core.config import settings
+from .core.logging_config import setup_logging, RequestIdMiddleware
+from .core.pagination import encode_cursor, decode_cursor
+from .core.cache import TTLCache
+from .core.metrics import MetricsMiddleware, instrument_engine, registry, CONTENT_TYPE_LATEST, STARTUP_SECONDS
+from .core.query_inspector import QueryInspectionMiddleware, inspect_engine, query_budget
+from .core.slow_queries import slow_query_log
+from .core.profiling import ProfilingMiddleware, profile_engine, recent_profiles, get_profile
+from .core.partitions import PartitionMaintenance, month_start
+from .core.tenancy import install_tenant_scoping, scope_session, tenant_of
+from .core.replicas import ReadYourWritesMiddleware
+from .core.schema_check import check_schema
+from .core.warmup import warm_up
+from .models.database import Transaction, TransactionItem, Customer, CustomerScore, Supplier, Budget, Category, Business, User, Inventory, StockMovement, SupplierMonthlyTotal, BusinessScoped
+
+auth_logger = logging.getLogger("app.auth")
+startup_logger = logging.getLogger("app.startup")
+
+# Schema is managed by Alembic migrations: cd backend && alembic upgrade head
 
 # JWT Settings
 SECRET_KEY = "Boku2003"  # Change this!
@@ -36,6 +53,31 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+oauth2_optional = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+# bcrypt is CPU-bound; a small dedicated pool keeps login bursts from stalling
+# the event loop or starving the threadpool used by the sync endpoints
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+# Active-user state keyed by username, so authenticated requests skip the users lookup.
+# Entries are not renewed on use: USER_CACHE_TTL_SECONDS after a worker looked a user
+# up it reads the row again, which bounds how long a deactivation or role change
+# made by another worker (or in the database directly) takes to reach this one.
+user_cache = TTLCache(ttl_seconds=settings.USER_CACHE_TTL_SECONDS)
+
+# Category id -> name per business, for the dashboard breakdowns
+category_names = TTLCache(ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS)
+
+# Fitted sales forecast models per (business, first month, data version), see get_forecast
+forecast_models = TTLCache(ttl_seconds=settings.FORECAST_CACHE_TTL_SECONDS, max_size=256)
+
+# Cohort matrices per (business, first cohort, month close, data version), see get_cohorts
+cohort_matrices = TTLCache(ttl_seconds=settings.COHORT_CACHE_TTL_SECONDS, max_size=256)
+
+# Supplier scorecards per (business, day, expense data version), see supplier_scorecard
+supplier_scorecards = TTLCache(ttl_seconds=settings.SUPPLIER_SCORECARD_CACHE_TTL_SECONDS, max_size=256)
 
 # Pydantic Models for request/response - FIXED regex -> pattern
 
@@ -76,6 +118,18 @@ class UserResponse(BaseModel):
     
     class Config:
         from_attributes = True
+class CurrentUser(BaseModel):
+    """Authenticated user built from token claims plus cached user state"""
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str] = None
+    role: str
+    is_active: bool = True
+    business_id: Optional[int] = None
+    customer_id: Optional[int] = None
+    supplier_id: Optional[int] = None
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -122,6 +176,21 @@ class TransactionResponse(BaseModel):
             if cat_id:
                 return f"Category {cat_id}"
         return v
+# Order (transaction + line items) Pydantic Models
+class OrderItemCreate(BaseModel):
+    inventory_id: Optional[int] = None
+    description: Optional[str] = Field(None, max_length=200)
+    quantity: int = Field(1, gt=0)
+    unit_price: float = Field(..., gt=0)
+
+class OrderCreate(BaseModel):
+    customer_id: Optional[int] = None
+    category_id: Optional[int] = None
+    description: Optional[str] = None
+    payment_method: Optional[str] = Field(None, max_length=20)
+    transaction_date: Optional[date] = None
+    items: List[OrderItemCreate] = Field(..., min_length=1)
+
 class CustomerCreate(BaseModel):
     name: str = Field(..., max_length=100)
     instagram_handle: Optional[str] = Field(None, max_length=50)
@@ -249,10 +318,16 @@ class BudgetResponse(BaseModel):
 # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+async def verify_password_async(plain_password, hashed_password):
+    """Verify a bcrypt hash on the bounded password pool, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify, plain_password, hashed_password
+    )
+
 # TEMPORARY: Simple password verification (plain text)
 def verify_password(plain_password, hashed_password):
     """TEMPORARY: Simple password check (plain text)"""
-    print(f"DEBUG: Comparing '{plain_password}' with stored hash")
     # For now, just compare plain text (we'll fix later)
     # If hashed_password starts with $2b$, it's bcrypt - use simple check
     if hashed_password.startswith('$2b$'):
@@ -310,17 +385,13 @@ def authenticate_user(db: Session, username: str, password: str):
     """Authenticate user against database - FIXED VERSION"""
     user = db.query(User).filter(User.username == username).first()
     if not user:
-        print(f"DEBUG: User '{username}' not found in database")
+        auth_logger.info("Login failed: unknown user", extra={"username": username})
         return False
     
-    print(f"DEBUG: Found user: {user.username}")
-    print(f"DEBUG: Stored password hash: {user.hashed_password[:30]}...")
-    print(f"DEBUG: Password to verify: {password}")
-    
     # TEMPORARY: Simple password check
     success = verify_password(password, user.hashed_password)
     
-    print(f"DEBUG: Password verification result: {success}")
+    auth_logger.debug("Password checked", extra={"username": username, "success": success})
     
     if success:
         return user  # Return the user object, not True
@@ -338,9 +409,62 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def user_token_claims(user: User, user_data: dict) -> dict:
+    """Signed claims carried by the access token (identity, role and linked ids)"""
+    claims = {
+        "sub": user.username,
+        "uid": user.id,
+        "role": user.role,
+        "bid": user.business_id
+    }
+    for key in ("customer_id", "supplier_id"):
+        if key in user_data:
+            claims[key] = user_data[key]
+    return claims
+
+def login_user_data(user: User) -> dict:
+    """User payload returned by the login endpoints"""
+    user_data = {
+        "username": user.username,
+        "role": user.role,
+        "email": user.email,
+        "full_name": user.full_name,
+        "user_id": user.id
+    }
+    
+    # Portal logins are linked to their customer / supplier record (indexed FKs)
+    if user.role == 'customer' and user.customer_id is not None:
+        user_data["customer_id"] = user.customer_id
+    elif user.role == 'supplier' and user.supplier_id is not None:
+        user_data["supplier_id"] = user.supplier_id
+    
+    return user_data
+
+def user_state(user: User) -> dict:
+    """Snapshot of the user row kept in user_cache"""
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "full_name": user.full_name,
+        "role": user.role,
+        "is_active": user.is_active,
+        "business_id": user.business_id
+    }
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_cached_user(mapper, connection, target):
+    """Drop cached state when a user is deactivated, changes role or is removed.
+    This applies at once in this process only; other workers drop theirs within
+    USER_CACHE_TTL_SECONDS."""
+    user_cache.invalidate(target.username)
+    for old_username in inspect(target).attrs.username.history.deleted:
+        user_cache.invalidate(old_username)
+
 # Dependency to get current user from token
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Get current user from JWT token"""
+    """Get current user from JWT token claims and the cached user state"""
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
@@ -354,26 +478,93 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
+    state = user_cache.get(username)
+    if state is None:
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.username == username).first()
+        )
+        if user is None:
+            raise credentials_exception
+        state = user_state(user)
+        user_cache.set(username, state)
+    
+    # Tokens issued before a role change are no longer valid
+    if "role" in payload and payload["role"] != state["role"]:
         raise credentials_exception
-    return user
+    
+    return CurrentUser(
+        **state,
+        customer_id=payload.get("customer_id"),
+        supplier_id=payload.get("supplier_id")
+    )
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+async def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)):
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+async def require_admin(current_user: CurrentUser = Depends(get_current_active_user)):
+    """Allow only active admin users"""
+    if current_user.role != 'admin':
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+# ===== Tenancy =====
+
+async def request_business_id(token: Optional[str] = Depends(oauth2_optional)) -> int:
+    """Business of the requesting user: the cached user state if known, else the
+    token's "bid" claim. Anonymous requests, and tokens that are not JWTs (the
+    demo_token_* logins from /api/login), get DEFAULT_BUSINESS_ID unless
+    TENANT_REQUIRED is set."""
+    payload = {}
+    if token is not None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            payload = {}
+    state = user_cache.get(payload["sub"]) if payload.get("sub") else None
+    business_id = state["business_id"] if state is not None else payload.get("bid")
+    if business_id is None:
+        if settings.TENANT_REQUIRED:
+            raise HTTPException(
+                status_code=401,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return settings.DEFAULT_BUSINESS_ID
+    return business_id
+
+def get_tenant_db(db: Session = Depends(get_db), business_id: int = Depends(request_business_id)):
+    """Database session scoped to the request's business (see app.core.tenancy)"""
+    return scope_session(db, business_id)
+
+def get_tenant_read_db(db: Session = Depends(get_read_db), business_id: int = Depends(request_business_id)):
+    """Read-only session (replica when configured) scoped to the request's business"""
+    return scope_session(db, business_id)
+
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def invalidate_category_names(mapper, connection, target):
+    category_names.invalidate(target.business_id)
+
+def can_profile(token: str) -> bool:
+    """Profiling gate: the token must carry the admin role and not belong to a
+    user known (from the cache) to be inactive or demoted since it was issued"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return False
+    state = user_cache.get(payload.get("sub"))
+    if state is not None and (not state["is_active"] or state["role"] != "admin"):
+        return False
+    return payload.get("role") == "admin"
 
-app = FastAPI(
-    title=settings.APP_NAME,
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
 
-@app.get("/")
+router = APIRouter()
+
+@router.get("/")
 def root():
     return {
         "message": "Welcome to Shiny Jar Business API",
@@ -382,7 +573,7 @@ def root():
         "endpoints": ["/transactions", "/customers", "/health", "/categories"]
     }
 
-@app.get("/health")
+@router.get("/health")
 def health_check(db: Session = Depends(get_db)):
     try:
         # FIXED: Use text() for raw SQL
@@ -391,88 +582,104 @@ def health_check(db: Session = Depends(get_db)):
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
 
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text-format metrics"""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+# ========== ADMIN DIAGNOSTICS ==========
+
+@router.get("/api/admin/slow-queries")
+def get_slow_queries(limit: int = Query(50, gt=0, le=1000),
+                     current_user: CurrentUser = Depends(require_admin)):
+    """Most recent slow queries (SQL, parameters, route and sampled EXPLAIN plan)"""
+    return {
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "explain_sample_rate": settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        "queries": slow_query_log.entries(limit)
+    }
+
+@router.get("/api/admin/startup")
+def get_startup_report(current_user: CurrentUser = Depends(require_admin)):
+    """Import, app build, schema check and warm-up timings of this worker"""
+    return startup_report
+
+@router.delete("/api/admin/slow-queries")
+def clear_slow_queries(current_user: CurrentUser = Depends(require_admin)):
+    """Empty the slow query buffer"""
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
+
+@router.get("/api/admin/profiles")
+def list_profiles(limit: int = Query(20, gt=0, le=1000),
+                  current_user: CurrentUser = Depends(require_admin)):
+    """Recently profiled requests (timing summary only)"""
+    return {"profiles": [profile.summary() for profile in recent_profiles(limit)]}
+
+@router.get("/api/admin/profiles/{profile_id}")
+def get_request_profile(profile_id: str,
+                        format: str = Query("json", pattern="^(json|collapsed)$"),
+                        current_user: CurrentUser = Depends(require_admin)):
+    """One profile: DB time breakdown plus folded stacks.
+
+    ``format=collapsed`` returns only the folded stacks as text, ready for
+    flamegraph.pl or speedscope.
+    """
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return Response(content=profile.collapsed(), media_type="text/plain")
+    return profile.to_dict()
+
 # ========== AUTHENTICATION ENDPOINTS ==========
 
-@app.post("/token", response_model=Token)
+@router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    """DEBUG VERSION - Standard OAuth2 token endpoint"""
-    print(f"DEBUG: Login attempt for user: {form_data.username}")
-    print(f"DEBUG: Password length in bytes: {len(form_data.password.encode('utf-8'))}")
+    """Standard OAuth2 token endpoint"""
+    auth_logger.debug("Login attempt", extra={"username": form_data.username})
     
     try:
-        # Find user
-        user = db.query(User).filter(User.username == form_data.username).first()
-        print(f"DEBUG: User found: {user is not None}")
-        
+        # Find user (the synchronous session runs in the threadpool, not on the event loop)
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.username == form_data.username).first()
+        )
         if not user:
-            print("DEBUG: User not found in database")
+            auth_logger.info("Login failed: unknown user", extra={"username": form_data.username})
             raise HTTPException(
                 status_code=401,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        print(f"DEBUG: User hashed_password: {user.hashed_password[:30]}...")
-        print(f"DEBUG: User role: {user.role}")
-        
         # Verify password
         try:
-            password_correct = pwd_context.verify(form_data.password, user.hashed_password)
-            print(f"DEBUG: Password verification result: {password_correct}")
+            password_correct = await verify_password_async(form_data.password, user.hashed_password)
         except Exception as e:
-            print(f"DEBUG: Password verification ERROR: {str(e)}")
+            auth_logger.warning("Password verification error: %s", e, extra={"username": user.username})
             password_correct = False
         
         if not password_correct:
-            print("DEBUG: Password incorrect")
+            auth_logger.info("Login failed: wrong password", extra={"username": user.username})
             raise HTTPException(
                 status_code=401,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # Get user data (role-specific IDs come from the users row)
+        user_data = login_user_data(user)
+        
         # Create token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
+            data=user_token_claims(user, user_data), expires_delta=access_token_expires
         )
         
-        print(f"DEBUG: Token created successfully")
-        
-        # Get user data
-        user_data = {
-            "username": user.username,
-            "role": user.role,
-            "email": user.email,
-            "full_name": user.full_name,
-            "user_id": user.id
-        }
-        
-        print(f"DEBUG: Basic user data: {user_data}")
-        
-        # Add role-specific IDs
-        if user.role == 'customer':
-            customer = db.query(Customer).filter(
-                (Customer.email == user.email) | 
-                (Customer.name.ilike(f"%{user.full_name}%"))
-            ).first()
-            if customer:
-                user_data["customer_id"] = customer.id
-                print(f"DEBUG: Found customer ID: {customer.id}")
-        
-        elif user.role == 'supplier':
-            supplier = db.query(Supplier).filter(
-                (Supplier.email == user.email) |
-                (Supplier.contact_person.ilike(f"%{user.full_name}%"))
-            ).first()
-            if supplier:
-                user_data["supplier_id"] = supplier.id
-                print(f"DEBUG: Found supplier ID: {supplier.id}")
-        
-        print(f"DEBUG: Returning success response")
+        auth_logger.info("Login succeeded", extra={"username": user.username, "role": user.role})
         
         return {
             "access_token": access_token,
@@ -483,52 +690,29 @@ async def login_for_access_token(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"DEBUG: UNEXPECTED ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        auth_logger.exception("Unexpected login error", extra={"username": form_data.username})
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
-@app.post("/api/login")
+@router.post("/api/login")
 def login_simple(user: UserLogin, db: Session = Depends(get_db)):
     """Backward-compatible login endpoint (uses same authentication)"""
     # Try to authenticate
     db_user = authenticate_user(db, user.username, user.password)
     
     if db_user:
+        # Get user data
+        user_data = login_user_data(db_user)
+        
         # Create token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": db_user.username}, expires_delta=access_token_expires
+            data=user_token_claims(db_user, user_data), expires_delta=access_token_expires
         )
         
-        # Get user data
-        user_data = {
-            "username": db_user.username,
-            "role": db_user.role,
-            "email": db_user.email,
-            "full_name": db_user.full_name,
-            "user_id": db_user.id
-        }
-        
-        # Add role-specific IDs
-        if db_user.role == 'customer':
-            customer = db.query(Customer).filter(
-                (Customer.email == db_user.email) | 
-                (Customer.name.ilike(f"%{db_user.full_name}%"))
-            ).first()
-            if customer:
-                user_data["customer_id"] = customer.id
-        
-        elif db_user.role == 'supplier':
-            supplier = db.query(Supplier).filter(
-                (Supplier.email == db_user.email) |
-                (Supplier.contact_person.ilike(f"%{db_user.full_name}%"))
-            ).first()
-            if supplier:
-                user_data["supplier_id"] = supplier.id
+        auth_logger.info("Login succeeded", extra={"username": db_user.username, "role": db_user.role})
         
         return {
             "access_token": access_token,
@@ -554,13 +738,13 @@ def login_simple(user: UserLogin, db: Session = Depends(get_db)):
     
     raise HTTPException(status_code=401, detail="Invalid credentials")
 
-@app.get("/users/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_active_user)):
+@router.get("/users/me", response_model=UserResponse)
+async def read_users_me(current_user: CurrentUser = Depends(get_current_active_user)):
     """Get current user info"""
     return current_user
 
-@app.get("/api/me")
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+@router.get("/api/me")
+def get_current_user_info(current_user: CurrentUser = Depends(get_current_user)):
     """Get current user info for frontend"""
     return {
         "username": current_user.username,
@@ -571,7 +755,7 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
     }
 
 # Get expense categories
-@app.get("/api/categories")
+@router.get("/api/categories")
 def get_categories():
     return {
         "expense_categories": [
@@ -585,15 +769,23 @@ def get_categories():
     }
 
 # Transaction endpoints
-@app.get("/api/transactions", response_model=List[TransactionResponse])
+@router.get("/api/transactions", response_model=List[TransactionResponse],
+         dependencies=[Depends(query_budget(1))])
 def get_transactions(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_read_db),
     type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     limit: int = 100
 ):
-    query = db.query(Transaction)
+    query = db.query(Transaction).options(joinedload(Transaction.category))
     if type:
         query = query.filter(Transaction.type == type)
+    # Date bounds on transaction_date itself, so only the matching monthly partitions are read
+    if start_date:
+        query = query.filter(Transaction.transaction_date >= start_date)
+    if end_date:
+        query = query.filter(Transaction.transaction_date <= end_date)
     transactions = query.order_by(Transaction.transaction_date.desc()).limit(limit).all()
     
     # Get category names for each transaction
@@ -608,9 +800,9 @@ def get_transactions(
             "transaction_date": trans.transaction_date,
         }
         
-        # Add category name if we have category_id
+        # Add category name if we have category_id (eager-loaded above)
         if trans.category_id:
-            category = db.query(Category).filter(Category.id == trans.category_id).first()
+            category = trans.category
             trans_dict["category"] = category.name if category else f"Category {trans.category_id}"
         else:
             trans_dict["category"] = "Uncategorized"
@@ -619,8 +811,8 @@ def get_transactions(
     
     return result
 
-@app.post("/api/transactions", response_model=TransactionResponse)
-def create_transaction(transaction: TransactionCreate, db: Session = Depends(get_db)):
+@router.post("/api/transactions", response_model=TransactionResponse)
+def create_transaction(transaction: TransactionCreate, db: Session = Depends(get_tenant_db)):
     try:
         db_transaction = Transaction(
             amount=transaction.amount,
@@ -636,14 +828,137 @@ def create_transaction(transaction: TransactionCreate, db: Session = Depends(get
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
+# Order endpoints
+@router.post("/api/orders")
+def create_order(order: OrderCreate, db: Session = Depends(get_tenant_db)):
+    """Create a sale with its line items and stock decrements in one transaction.
+
+    The number of statements does not grow with the number of line items:
+    one locking stock read, one CASE update for all decrements, one insert
+    for the parent transaction and one multi-row insert for the items.
+    """
+    # Merge quantities of repeated inventory items
+    stock_needed = {}
+    for item in order.items:
+        if item.inventory_id is not None:
+            stock_needed[item.inventory_id] = stock_needed.get(item.inventory_id, 0) + item.quantity
+    
+    try:
+        if stock_needed:
+            stock = dict(db.execute(
+                select(Inventory.id, Inventory.quantity)
+                .where(Inventory.id.in_(stock_needed))
+                .with_for_update()
+            ).all())
+            
+            missing = sorted(set(stock_needed) - set(stock))
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Inventory items not found: {missing}")
+            
+            short = sorted(item_id for item_id, qty in stock_needed.items() if (stock[item_id] or 0) < qty)
+            if short:
+                raise HTTPException(status_code=400, detail=f"Insufficient stock for inventory items: {short}")
+            
+            db.execute(
+                update(Inventory)
+                .where(Inventory.id.in_(stock_needed))
+                .values(
+                    quantity=Inventory.quantity - case(stock_needed, value=Inventory.id),
+                    updated_at=func.now()
+                )
+                .execution_options(synchronize_session=False)
+            )
+        
+        transaction_date = order.transaction_date or date.today()
+        amount = round(sum(item.quantity * item.unit_price for item in order.items), 2)
+        
+        transaction_id = db.execute(
+            insert(Transaction).values(
+                transaction_date=transaction_date,
+                amount=amount,
+                type='income',
+                category_id=order.category_id,
+                description=order.description,
+                customer_id=order.customer_id,
+                business_id=tenant_of(db),
+                payment_method=order.payment_method
+            ).returning(Transaction.id)
+        ).scalar_one()
+        
+        # total_price is a generated column, read it back from the insert
+        line_items = db.execute(
+            insert(TransactionItem).values([
+                {
+                    "transaction_id": transaction_id,
+                    "inventory_id": item.inventory_id,
+                    "description": item.description,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price
+                }
+                for item in order.items
+            ]).returning(
+                TransactionItem.id,
+                TransactionItem.inventory_id,
+                TransactionItem.description,
+                TransactionItem.quantity,
+                TransactionItem.unit_price,
+                TransactionItem.total_price
+            )
+        ).all()
+        
+        if order.customer_id is not None:
+            # No row back means the customer belongs to another business (or does not exist)
+            updated = db.execute(
+                update(Customer)
+                .where(Customer.id == order.customer_id)
+                .values(
+                    total_spent=func.coalesce(Customer.total_spent, 0) + amount,
+                    last_purchase=transaction_date
+                )
+                .returning(Customer.id)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if updated is None:
+                raise HTTPException(status_code=404, detail="Customer not found")
+        
+        db.commit()
+        # A Core insert: the Transaction mapper events do not see it
+        invalidate_cohorts(tenant_of(db), transaction_date)
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "transaction_id": transaction_id,
+        "customer_id": order.customer_id,
+        "transaction_date": transaction_date,
+        "items": [
+            {
+                "id": row.id,
+                "inventory_id": row.inventory_id,
+                "description": row.description,
+                "quantity": row.quantity,
+                "unit_price": float(row.unit_price),
+                "total_price": float(row.total_price)
+            }
+            for row in line_items
+        ],
+        "item_count": len(line_items),
+        "total_quantity": sum(row.quantity for row in line_items),
+        "total_amount": float(sum(row.total_price for row in line_items))
+    }
+
 # Customer endpoints
-@app.get("/api/customers", response_model=List[CustomerResponse])
-def get_customers(db: Session = Depends(get_db)):
+@router.get("/api/customers", response_model=List[CustomerResponse])
+def get_customers(db: Session = Depends(get_tenant_read_db)):
     customers = db.query(Customer).order_by(Customer.name).all()
     return customers
 
-@app.post("/api/customers", response_model=CustomerResponse)
-def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
+@router.post("/api/customers", response_model=CustomerResponse)
+def create_customer(customer: CustomerCreate, db: Session = Depends(get_tenant_db)):
     try:
         db_customer = Customer(
             name=customer.name,
@@ -660,9 +975,9 @@ def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 # Customer search and update endpoints
-@app.get("/api/customers/search")
+@router.get("/api/customers/search")
 def search_customers(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_read_db),
     q: Optional[str] = None,
     limit: int = 20
 ):
@@ -678,11 +993,11 @@ def search_customers(
     customers = query.order_by(Customer.name).limit(limit).all()
     return customers
 
-@app.put("/api/customers/{customer_id}", response_model=CustomerResponse)
+@router.put("/api/customers/{customer_id}", response_model=CustomerResponse)
 def update_customer(
     customer_id: int,
     customer: CustomerCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_tenant_db)
 ):
     db_customer = db.query(Customer).filter(Customer.id == customer_id).first()
     if not db_customer:
@@ -699,8 +1014,8 @@ def update_customer(
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.delete("/api/customers/{customer_id}")
-def delete_customer(customer_id: int, db: Session = Depends(get_db)):
+@router.delete("/api/customers/{customer_id}")
+def delete_customer(customer_id: int, db: Session = Depends(get_tenant_db)):
     db_customer = db.query(Customer).filter(Customer.id == customer_id).first()
     if not db_customer:
         raise HTTPException(status_code=404, detail="Customer not found")
@@ -714,8 +1029,8 @@ def delete_customer(customer_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=f"Delete failed: {str(e)}")
 
 # Link customers to transactions (for sales tracking)
-@app.get("/api/customers/{customer_id}/transactions")
-def get_customer_transactions(customer_id: int, db: Session = Depends(get_db)):
+@router.get("/api/customers/{customer_id}/transactions")
+def get_customer_transactions(customer_id: int, db: Session = Depends(get_tenant_read_db)):
     # In a real app, we'd link transactions to customers
     # For now, we'll simulate with a note
     customer = db.query(Customer).filter(Customer.id == customer_id).first()
@@ -737,46 +1052,79 @@ def get_customer_transactions(customer_id: int, db: Session = Depends(get_db)):
 
 # ========== CUSTOMER DASHBOARD ENDPOINTS ==========
 
-@app.get("/api/customers/{customer_id}/dashboard")
-def get_customer_dashboard(customer_id: int, db: Session = Depends(get_db), 
-                          current_user: User = Depends(get_current_user)):
-    """Get customer dashboard data"""
+def transaction_page(query, cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+    """One newest-first page of a Transaction query and the cursor for the next.
+    Keyset pagination on (transaction_date, id) follows the (owner, type,
+    transaction_date) indexes, so a deep page costs the same as the first."""
+    after = decode_cursor(cursor)
+    if after is not None:
+        try:
+            after_date = date.fromisoformat(str(after[0]))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(Transaction.transaction_date, Transaction.id) < (after_date, after[1]))
+    rows = query.order_by(
+        Transaction.transaction_date.desc(), Transaction.id.desc()
+    ).limit(limit + 1).all()
+    
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].transaction_date.isoformat(), rows[-1].id)
+
+def customer_orders_page(db: Session, customer_id: int, cursor: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """One page of the customer's orders, newest first, with their category names
+    loaded in the same query; returns the orders and the cursor for the next page"""
+    orders, next_cursor = transaction_page(
+        db.query(Transaction).options(
+            joinedload(Transaction.category)
+        ).filter(
+            Transaction.customer_id == customer_id,
+            Transaction.type == 'income'
+        ),
+        cursor, limit
+    )
+    return [{
+        "id": order.id,
+        "date": order.transaction_date,
+        "description": order.description,
+        "amount": order.amount,
+        "category": order.category.name if order.category else "Uncategorized",
+        "status": "completed",  # In real app, you'd have an order status field
+        "invoice_number": f"INV-{order.id:06d}"
+    } for order in orders], next_cursor
+
+@router.get("/api/customers/{customer_id}/dashboard", dependencies=[Depends(query_budget(3))])
+def get_customer_dashboard(customer_id: int, response: Response, db: Session = Depends(get_tenant_read_db),
+                          current_user: CurrentUser = Depends(get_current_user),
+                          limit: int = Query(20, gt=0, le=100)):
+    """Get customer dashboard data: the customer with their order totals (one
+    aggregate query) and the first page of recent orders. The cursor for the
+    orders after them is returned in the X-Next-Cursor header (continue with
+    /api/customers/{customer_id}/orders)."""
     
     # Check if user has access to this customer data
-    if current_user.role != 'admin' and current_user.id != customer_id:
+    if current_user.role != 'admin' and current_user.customer_id != customer_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
-    if not customer:
-        raise HTTPException(status_code=404, detail="Customer not found")
-    
-    # Get customer's transactions
-    transactions = db.query(Transaction).filter(
-        Transaction.customer_id == customer_id,
-        Transaction.type == 'income'  # Sales to customer
-    ).order_by(Transaction.transaction_date.desc()).limit(20).all()
-    
-    # Calculate statistics
-    total_spent = db.query(func.sum(Transaction.amount)).filter(
+    # Totals from idx_transactions_customer_type_date alone, joined to the customer row
+    totals = db.query(
+        func.coalesce(func.sum(Transaction.amount), 0).label('total_spent'),
+        func.count().label('order_count')
+    ).filter(
         Transaction.customer_id == customer_id,
         Transaction.type == 'income'
-    ).scalar() or 0
+    ).subquery()
+    row = db.query(Customer, totals.c.total_spent, totals.c.order_count).join(
+        totals, true()
+    ).filter(Customer.id == customer_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    customer, total_spent, order_count = row
     
-    order_count = db.query(Transaction).filter(
-        Transaction.customer_id == customer_id,
-        Transaction.type == 'income'
-    ).count()
-    
-    # Get recent orders
-    recent_orders = []
-    for trans in transactions:
-        recent_orders.append({
-            "id": trans.id,
-            "date": trans.transaction_date,
-            "description": trans.description,
-            "amount": trans.amount,
-            "status": "completed"  # In real app, you'd have an order status field
-        })
+    recent_orders, next_cursor = customer_orders_page(db, customer_id, None, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return {
         "customer": {
@@ -798,39 +1146,32 @@ def get_customer_dashboard(customer_id: int, db: Session = Depends(get_db),
         }
     }
 
-@app.get("/api/customers/{customer_id}/orders")
-def get_customer_orders(customer_id: int, db: Session = Depends(get_db),
-                       current_user: User = Depends(get_current_user)):
-    """Get all orders for a customer"""
+@router.get("/api/customers/{customer_id}/orders", dependencies=[Depends(query_budget(2))])
+def get_customer_orders(customer_id: int, response: Response, db: Session = Depends(get_tenant_read_db),
+                       current_user: CurrentUser = Depends(get_current_user),
+                       cursor: Optional[str] = None,
+                       limit: int = Query(50, gt=0, le=500)):
+    """Orders for a customer, newest first, ``limit`` at a time. When more
+    exist, the cursor for the next page is returned in the X-Next-Cursor header."""
     
-    if current_user.role != 'admin' and current_user.id != customer_id:
+    if current_user.role != 'admin' and current_user.customer_id != customer_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    orders = db.query(Transaction).filter(
-        Transaction.customer_id == customer_id,
-        Transaction.type == 'income'
-    ).order_by(Transaction.transaction_date.desc()).all()
-    
-    return [{
-        "id": order.id,
-        "date": order.transaction_date,
-        "description": order.description,
-        "amount": order.amount,
-        "category": order.category,
-        "status": "completed",
-        "invoice_number": f"INV-{order.id:06d}"
-    } for order in orders]
+    orders, next_cursor = customer_orders_page(db, customer_id, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return orders
 
 # Supplier endpoints
 # Update the existing get_suppliers endpoint:
-@app.get("/api/suppliers", response_model=List[SupplierResponse])
-def get_suppliers(db: Session = Depends(get_db)):
+@router.get("/api/suppliers", response_model=List[SupplierResponse])
+def get_suppliers(db: Session = Depends(get_tenant_read_db)):
     suppliers = db.query(Supplier).order_by(Supplier.name).all()
     return suppliers
 
 # Add the new create_supplier endpoint:
-@app.post("/api/suppliers", response_model=SupplierResponse)
-def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_db)):
+@router.post("/api/suppliers", response_model=SupplierResponse)
+def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_tenant_db)):
     try:
         db_supplier = Supplier(
             name=supplier.name,
@@ -849,8 +1190,8 @@ def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.delete("/api/suppliers/{supplier_id}")
-def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
+@router.delete("/api/suppliers/{supplier_id}")
+def delete_supplier(supplier_id: int, db: Session = Depends(get_tenant_db)):
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
@@ -865,58 +1206,71 @@ def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
 
 # ========== SUPPLIER DASHBOARD ENDPOINTS ==========
 
-@app.get("/api/suppliers/{supplier_id}/dashboard")
-def get_supplier_dashboard(supplier_id: int, db: Session = Depends(get_db),
-                          current_user: User = Depends(get_current_user)):
-    """Get supplier dashboard data"""
+def supplier_orders_page(db: Session, supplier_id: int, cursor: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """One page of the purchases from a supplier, newest first, with their category
+    names loaded in the same query; returns the orders and the cursor for the next page"""
+    orders, next_cursor = transaction_page(
+        db.query(Transaction).options(
+            joinedload(Transaction.category)
+        ).filter(
+            Transaction.supplier_id == supplier_id,
+            Transaction.type == 'expense'
+        ),
+        cursor, limit
+    )
+    return [{
+        "id": order.id,
+        "date": order.transaction_date,
+        "description": order.description,
+        "amount": abs(order.amount),
+        "category": order.category.name if order.category else "Uncategorized",
+        "status": "delivered",
+        "po_number": f"PO-{order.id:06d}"
+    } for order in orders], next_cursor
+
+@router.get("/api/suppliers/{supplier_id}/dashboard", dependencies=[Depends(query_budget(4))])
+def get_supplier_dashboard(supplier_id: int, response: Response, db: Session = Depends(get_tenant_read_db),
+                          current_user: CurrentUser = Depends(get_current_user),
+                          limit: int = Query(10, gt=0, le=100)):
+    """Get supplier dashboard data. Totals and monthly purchases come from
+    supplier_monthly_totals (kept current by a trigger on expense writes), so no
+    aggregate runs over transactions; recent orders are the first page of
+    /api/suppliers/{supplier_id}/orders, whose next cursor is returned in the
+    X-Next-Cursor header."""
     
     # Check authorization
-    if current_user.role != 'admin' and current_user.id != supplier_id:
+    if current_user.role != 'admin' and current_user.supplier_id != supplier_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
-    if not supplier:
+    # Items supplied and delivery lead time ride along with the supplier row
+    row = db.query(
+        Supplier,
+        select(func.count()).where(Inventory.supplier_id == Supplier.id).scalar_subquery(),
+        select(func.avg(StockMovement.lag_days)).where(StockMovement.supplier_id == Supplier.id).scalar_subquery()
+    ).filter(Supplier.id == supplier_id).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Supplier not found")
+    supplier, items_supplied, lead_days = row
+    
+    monthly = [
+        (month, abs(float(total)), order_count)
+        for month, total, order_count in db.query(
+            SupplierMonthlyTotal.month, SupplierMonthlyTotal.total, SupplierMonthlyTotal.order_count
+        ).filter(
+            SupplierMonthlyTotal.supplier_id == supplier_id,
+            SupplierMonthlyTotal.order_count > 0
+        ).order_by(SupplierMonthlyTotal.month.desc())
+    ]
+    total_revenue = sum(total for _, total, _ in monthly)
+    order_count = sum(count for _, _, count in monthly)
     
-    # Get supplier's transactions (purchases from supplier)
-    transactions = db.query(Transaction).filter(
-        Transaction.supplier_id == supplier_id,
-        Transaction.type == 'expense'
-    ).order_by(Transaction.transaction_date.desc()).limit(10).all()
-    
-    # Calculate statistics
-    total_revenue = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.supplier_id == supplier_id,
-        Transaction.type == 'expense'
-    ).scalar() or 0
-    
-    order_count = db.query(Transaction).filter(
-        Transaction.supplier_id == supplier_id,
-        Transaction.type == 'expense'
-    ).count()
-    
-    # Get monthly revenue
-    monthly_data = db.query(
-        func.date_trunc('month', Transaction.transaction_date).label('month'),
-        func.sum(Transaction.amount).label('total')
-    ).filter(
-        Transaction.supplier_id == supplier_id,
-        Transaction.type == 'expense'
-    ).group_by(
-        func.date_trunc('month', Transaction.transaction_date)
-    ).order_by(
-        func.date_trunc('month', Transaction.transaction_date).desc()
-    ).limit(6).all()
+    # Spend trend: the last three closed months against the three before them
+    recent = sum(total for month, total, _ in monthly if month_start(3) <= month < month_start())
+    previous = sum(total for month, total, _ in monthly if month_start(6) <= month < month_start(3))
     
-    recent_orders = []
-    for trans in transactions:
-        recent_orders.append({
-            "id": trans.id,
-            "date": trans.transaction_date,
-            "description": trans.description,
-            "amount": trans.amount,
-            "status": "delivered"
-        })
+    recent_orders, next_cursor = supplier_orders_page(db, supplier_id, None, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return {
         "supplier": {
@@ -929,58 +1283,130 @@ def get_supplier_dashboard(supplier_id: int, db: Session = Depends(get_db),
         },
         "recent_orders": recent_orders,
         "stats": {
-            "total_revenue": float(abs(total_revenue)),
+            "total_revenue": round(total_revenue, 2),
             "order_count": order_count,
-            "avg_order_value": float(abs(total_revenue / order_count)) if order_count > 0 else 0,
-            "rating": 4.7  # In real app, this would come from a ratings table
+            "avg_order_value": round(total_revenue / order_count, 2) if order_count > 0 else 0,
+            "active_months": len(monthly),
+            "spend_trend_pct": round((recent / previous - 1) * 100, 1) if previous else None,
+            "items_supplied": items_supplied,
+            "avg_lead_days": round(float(lead_days), 1) if lead_days is not None else None
         },
         "monthly_revenue": [
-            {"month": month.strftime("%Y-%m"), "revenue": float(abs(total))}
-            for month, total in monthly_data
+            {"month": month.strftime("%Y-%m"), "revenue": total, "orders": count}
+            for month, total, count in monthly[:6]
         ]
     }
 
-@app.get("/api/suppliers/{supplier_id}/orders")
-def get_supplier_orders(supplier_id: int, db: Session = Depends(get_db),
-                       current_user: User = Depends(get_current_user)):
-    """Get all orders from a supplier"""
+@router.get("/api/suppliers/{supplier_id}/orders", dependencies=[Depends(query_budget(2))])
+def get_supplier_orders(supplier_id: int, response: Response, db: Session = Depends(get_tenant_read_db),
+                       current_user: CurrentUser = Depends(get_current_user),
+                       cursor: Optional[str] = None,
+                       limit: int = Query(50, gt=0, le=500)):
+    """Orders from a supplier, newest first, ``limit`` at a time. When more
+    exist, the cursor for the next page is returned in the X-Next-Cursor header."""
     
-    if current_user.role != 'admin' and current_user.id != supplier_id:
+    if current_user.role != 'admin' and current_user.supplier_id != supplier_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    orders = db.query(Transaction).filter(
-        Transaction.supplier_id == supplier_id,
-        Transaction.type == 'expense'
-    ).order_by(Transaction.transaction_date.desc()).all()
-    
-    return [{
-        "id": order.id,
-        "date": order.transaction_date,
-        "description": order.description,
-        "amount": abs(order.amount),
-        "category": order.category,
-        "status": "delivered",
-        "po_number": f"PO-{order.id:06d}"
-    } for order in orders]
+    orders, next_cursor = supplier_orders_page(db, supplier_id, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return orders
 
 # ========== INVENTORY ENDPOINTS ==========
 
-@app.get("/api/inventory")
-def get_inventory(db: Session = Depends(get_db)):
-    """Get all inventory items"""
-    inventory = db.query(Inventory).order_by(Inventory.name).all()
-    return inventory
+# Sort keys accepted by /api/inventory ("-" prefix = descending)
+INVENTORY_SORT_COLUMNS = {
+    "name": Inventory.name,
+    "quantity": Inventory.quantity,
+    "unit_cost": Inventory.unit_cost,
+}
 
-@app.get("/api/inventory/{item_id}")
-def get_inventory_item(item_id: int, db: Session = Depends(get_db)):
+@router.get("/api/inventory")
+def get_inventory(
+    response: Response,
+    db: Session = Depends(get_tenant_read_db),
+    category: Optional[str] = None,
+    status: Optional[str] = Query(None, pattern="^(in|low|out)$"),
+    supplier_id: Optional[int] = None,
+    q: Optional[str] = None,
+    sort: str = "name",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, gt=0, le=1000)
+):
+    """Get inventory items, filtered, sorted and paged in SQL.
+
+    Without parameters this returns every item ordered by name. When
+    ``limit`` is given and more rows exist, the cursor for the next page
+    is returned in the ``X-Next-Cursor`` header.
+    """
+    descending = sort.startswith("-")
+    sort_column = INVENTORY_SORT_COLUMNS.get(sort.lstrip("-"))
+    if sort_column is None:
+        raise HTTPException(status_code=400, detail=f"Invalid sort key: {sort}")
+    
+    query = db.query(Inventory)
+    
+    if category:
+        query = query.filter(Inventory.category == category)
+    if supplier_id is not None:
+        query = query.filter(Inventory.supplier_id == supplier_id)
+    if status == "out":
+        query = query.filter(Inventory.quantity <= 0)
+    elif status == "low":
+        query = query.filter(Inventory.quantity > 0, Inventory.quantity <= Inventory.reorder_level)
+    elif status == "in":
+        query = query.filter(Inventory.quantity > Inventory.reorder_level)
+    if q:
+        pattern = f"%{q}%"
+        supplier_match = db.query(Supplier.id).filter(Supplier.name.ilike(pattern))
+        query = query.filter(
+            Inventory.name.ilike(pattern) |
+            Inventory.category.ilike(pattern) |
+            Inventory.supplier_id.in_(supplier_match)
+        )
+    
+    # Keyset pagination on (sort column, id) so deep pages stay cheap
+    after = decode_cursor(cursor)
+    if after is not None:
+        key = tuple_(sort_column, Inventory.id)
+        query = query.filter(key < after if descending else key > after)
+    
+    if descending:
+        query = query.order_by(sort_column.desc(), Inventory.id.desc())
+    else:
+        query = query.order_by(sort_column, Inventory.id)
+    
+    if limit is None:
+        return query.all()
+    
+    items = query.limit(limit + 1).all()
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            getattr(last, sort_column.key), last.id
+        )
+    return items
+
+@router.get("/api/inventory/categories")
+def get_inventory_categories(db: Session = Depends(get_tenant_read_db)):
+    """Get distinct inventory categories (served from idx_inventory_business_category_name)"""
+    rows = db.query(Inventory.category).filter(
+        Inventory.category.isnot(None)
+    ).distinct().order_by(Inventory.category).all()
+    return [category for category, in rows]
+
+@router.get("/api/inventory/{item_id}")
+def get_inventory_item(item_id: int, db: Session = Depends(get_tenant_read_db)):
     """Get specific inventory item"""
     item = db.query(Inventory).filter(Inventory.id == item_id).first()
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     return item
 
-@app.post("/api/inventory")
-def create_inventory_item(item: dict, db: Session = Depends(get_db)):
+@router.post("/api/inventory")
+def create_inventory_item(item: dict, db: Session = Depends(get_tenant_db)):
     """Create new inventory item"""
     try:
         db_item = Inventory(**item)
@@ -992,8 +1418,8 @@ def create_inventory_item(item: dict, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.put("/api/inventory/{item_id}")
-def update_inventory_item(item_id: int, item_data: dict, db: Session = Depends(get_db)):
+@router.put("/api/inventory/{item_id}")
+def update_inventory_item(item_id: int, item_data: dict, db: Session = Depends(get_tenant_db)):
     """Update inventory item"""
     item = db.query(Inventory).filter(Inventory.id == item_id).first()
     if not item:
@@ -1012,16 +1438,20 @@ def update_inventory_item(item_id: int, item_data: dict, db: Session = Depends(g
         raise HTTPException(status_code=400, detail=str(e))
     
 # Endpoint for stock movements
-@app.post("/api/inventory/{item_id}/receive")
+@router.post("/api/inventory/{item_id}/receive")
 def receive_stock(
     item_id: int,
     quantity: int = Body(..., gt=0),
     unit_cost: Optional[float] = Body(None, gt=0),
     reference: Optional[str] = None,
     notes: Optional[str] = None,
-    db: Session = Depends(get_db)
+    transaction_id: Optional[int] = Body(None),
+    db: Session = Depends(get_tenant_db)
 ):
-    """Receive stock for an inventory item"""
+    """Receive stock for an inventory item. The delivery is recorded as a stock
+    movement against the purchase it fulfils: ``transaction_id``, else the
+    supplier's expense whose reference number is ``reference``, else the
+    supplier's latest expense."""
     # Get the item
     item = db.query(Inventory).filter(Inventory.id == item_id).first()
     if not item:
@@ -1037,8 +1467,35 @@ def receive_stock(
         
         item.updated_at = datetime.utcnow()
         
-        # Create stock movement record (you'd need a stock_movements table)
-        # For now, just update the inventory
+        # The purchase this delivery fulfils, for the supplier lead time
+        purchase = None
+        purchases = db.query(Transaction.id, Transaction.supplier_id, Transaction.transaction_date).filter(
+            Transaction.type == 'expense'
+        )
+        if transaction_id is not None:
+            purchase = purchases.filter(Transaction.id == transaction_id).first()
+            if purchase is None:
+                raise HTTPException(status_code=404, detail="Purchase transaction not found")
+        elif item.supplier_id is not None:
+            purchases = purchases.filter(
+                Transaction.supplier_id == item.supplier_id,
+                Transaction.transaction_date <= date.today()
+            )
+            if reference:
+                purchase = purchases.filter(Transaction.reference_number == reference).first()
+            if purchase is None:
+                purchase = purchases.order_by(Transaction.transaction_date.desc(), Transaction.id.desc()).first()
+        
+        db.add(StockMovement(
+            inventory_id=item.id,
+            supplier_id=purchase.supplier_id if purchase and purchase.supplier_id else item.supplier_id,
+            quantity=quantity,
+            unit_cost=unit_cost or item.unit_cost,
+            reference=reference,
+            notes=notes,
+            transaction_id=purchase.id if purchase else None,
+            lag_days=max((date.today() - purchase.transaction_date).days, 0) if purchase else None
+        ))
         
         db.commit()
         db.refresh(item)
@@ -1050,18 +1507,21 @@ def receive_stock(
             "new_unit_cost": item.unit_cost
         }
         
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
 # Budget Endpoints
-@app.get("/api/budgets", response_model=List[BudgetResponse])
-def get_budgets(db: Session = Depends(get_db)):
+@router.get("/api/budgets", response_model=List[BudgetResponse])
+def get_budgets(db: Session = Depends(get_tenant_read_db)):
     budgets = db.query(Budget).all()
     return budgets
 
-@app.post("/api/budgets", response_model=BudgetResponse)
-def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
+@router.post("/api/budgets", response_model=BudgetResponse)
+def create_budget(budget: BudgetCreate, db: Session = Depends(get_tenant_db)):
     try:
         db_budget = Budget(**budget.dict())
         db.add(db_budget)
@@ -1073,21 +1533,24 @@ def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 # Budget tracking analysis
-@app.get("/api/budgets/analysis")
-def get_budget_analysis(db: Session = Depends(get_db)):
-    # Get all budgets
-    budgets = db.query(Budget).all()
+@router.get("/api/budgets/analysis", dependencies=[Depends(query_budget(1))])
+def get_budget_analysis(db: Session = Depends(get_tenant_read_db)):
+    # Actual spending for each budget's category within its period, in one grouped query
+    budgets = db.query(
+        Budget,
+        func.coalesce(func.sum(Transaction.amount), 0)
+    ).outerjoin(
+        Transaction,
+        (Transaction.type == 'expense') &
+        (Transaction.category_id == Budget.category_id) &
+        (Transaction.transaction_date >= Budget.start_date) &
+        (Transaction.transaction_date <= func.coalesce(Budget.end_date, date.today())) &
+        # Constant lower bound, so partitions older than every budget are pruned at execution
+        (Transaction.transaction_date >= select(func.min(Budget.start_date)).scalar_subquery())
+    ).group_by(Budget.id).all()
     
     analysis = []
-    for budget in budgets:
-        # Calculate actual spending for this category in budget period
-        actual_spent = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.type == 'expense',
-            Transaction.category_id == budget.category_id,
-            Transaction.transaction_date >= budget.start_date,
-            Transaction.transaction_date <= (budget.end_date or date.today())
-        ).scalar() or 0
-        
+    for budget, actual_spent in budgets:
         remaining = budget.amount - actual_spent
         percentage_used = (actual_spent / budget.amount * 100) if budget.amount > 0 else 0
         
@@ -1104,16 +1567,16 @@ def get_budget_analysis(db: Session = Depends(get_db)):
     
     return analysis
 
-@app.get("/api/budgets/{budget_id}")
-def get_budget(budget_id: int, db: Session = Depends(get_db)):
+@router.get("/api/budgets/{budget_id}")
+def get_budget(budget_id: int, db: Session = Depends(get_tenant_read_db)):
     """Get specific budget"""
     budget = db.query(Budget).filter(Budget.id == budget_id).first()
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
     return budget
 
-@app.put("/api/budgets/{budget_id}")
-def update_budget(budget_id: int, budget_update: BudgetCreate, db: Session = Depends(get_db)):
+@router.put("/api/budgets/{budget_id}")
+def update_budget(budget_id: int, budget_update: BudgetCreate, db: Session = Depends(get_tenant_db)):
     """Update budget"""
     budget = db.query(Budget).filter(Budget.id == budget_id).first()
     if not budget:
@@ -1130,9 +1593,9 @@ def update_budget(budget_id: int, budget_update: BudgetCreate, db: Session = Dep
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.get("/api/analytics/sales-trend")
+@router.get("/api/analytics/sales-trend")
 def get_sales_trend(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_tenant_read_db),
     months: int = 12
 ):
     """Get sales trend data for analytics"""
@@ -1141,7 +1604,8 @@ def get_sales_trend(
         func.date_trunc('month', Transaction.transaction_date).label('month'),
         func.sum(Transaction.amount).label('total')
     ).filter(
-        Transaction.type == 'income'
+        Transaction.type == 'income',
+        Transaction.transaction_date >= month_start(months - 1)  # only the last `months` partitions
     ).group_by(
         func.date_trunc('month', Transaction.transaction_date)
     ).order_by(
@@ -1156,8 +1620,8 @@ def get_sales_trend(
         for month, total in monthly_data
     ]
 
-@app.get("/api/analytics/customer-segments")
-def get_customer_segments(db: Session = Depends(get_db)):
+@router.get("/api/analytics/customer-segments")
+def get_customer_segments(db: Session = Depends(get_tenant_read_db)):
     """Get customer segmentation data"""
     customers = db.query(Customer).all()
     
@@ -1191,9 +1655,548 @@ def get_customer_segments(db: Session = Depends(get_db)):
     
     return segments
 
+# ========== FORECASTING ==========
+
+# Spending bands of /api/analytics/customer-segments: (key, name, upper bound; the last has none)
+CUSTOMER_SEGMENTS = (("new", "New", 100), ("regular", "Regular", 500), ("vip", "VIP", 1000), ("premium", "Premium", None))
+
+def customer_segment():
+    """SQL expression for the customer's spending band; NULL for sales without a customer"""
+    spent = func.coalesce(Customer.total_spent, 0)
+    return case(
+        (Customer.id.is_(None), None),
+        *[(spent < bound, key) for key, _, bound in CUSTOMER_SEGMENTS if bound is not None],
+        else_=CUSTOMER_SEGMENTS[-1][0],
+    )
+
+def month_index(value) -> int:
+    return value.year * 12 + value.month - 1
+
+def month_label(index: int) -> str:
+    return f"{index // 12}-{index % 12 + 1:02d}"
+
+def transaction_data_version(db: Session, start: Optional[date], end: date, type_: str = 'income') -> str:
+    """Fingerprint of the income (or expenses) booked in [start, end), or before
+    ``end`` when start is None. Count, sum and latest date come from the
+    (business_id, type, transaction_date) INCLUDE (amount) index alone, so checking
+    it costs far less than recomputing what depends on those transactions."""
+    query = db.query(Transaction).filter(
+        Transaction.type == type_,
+        Transaction.transaction_date < end
+    )
+    if start is not None:
+        query = query.filter(Transaction.transaction_date >= start)
+    count, total, latest = query.with_entities(
+        func.count(), func.sum(Transaction.amount), func.max(Transaction.transaction_date)
+    ).one()
+    return f"{count}-{round(total or 0, 2)}-{latest.isoformat() if latest else ''}"
+
+def fit_sales_forecast(db: Session, start: date, end: date) -> dict:
+    """Monthly income in [start, end) per (category, customer segment) in one grouped
+    query, summed into the total, per-category and per-segment series, and one
+    Holt-Winters fit for all of them (app.core.forecasting)"""
+    # numpy is only needed here; importing app.main stays light
+    import numpy as np
+    from .core.forecasting import fit
+
+    started = time.perf_counter()
+    month = func.date_trunc('month', Transaction.transaction_date)
+    segment = customer_segment()
+    rows = db.query(
+        month, Transaction.category_id, segment, func.sum(Transaction.amount)
+    ).outerjoin(
+        Customer, Customer.id == Transaction.customer_id
+    ).filter(
+        Transaction.type == 'income',
+        Transaction.transaction_date >= start,
+        Transaction.transaction_date < end
+    ).group_by(
+        month, Transaction.category_id, segment
+    ).all()
+
+    categories = sorted({row[1] for row in rows}, key=lambda category_id: (category_id is None, category_id or 0))
+    keys = ([("total", "total")] + [("category", category_id) for category_id in categories]
+            + [("segment", key) for key, _, _ in CUSTOMER_SEGMENTS])
+    position = {key: i for i, key in enumerate(keys)}
+    first_month = month_index(start)
+    y = np.zeros((len(keys), month_index(end) - first_month))
+    if rows:
+        columns = np.array([month_index(row[0]) - first_month for row in rows])
+        amounts = np.array([float(row[3]) for row in rows])
+        np.add.at(y, (0, columns), amounts)
+        np.add.at(y, (np.array([position["category", row[1]] for row in rows]), columns), amounts)
+        with_segment = np.array([row[2] is not None for row in rows], dtype=bool)
+        segment_rows = np.array([position["segment", row[2]] for row in rows if row[2] is not None], dtype=int)
+        np.add.at(y, (segment_rows, columns[with_segment]), amounts[with_segment])
+
+    # Fit from the first month with any sales
+    sold = np.flatnonzero(y[0])
+    if len(sold) == 0:
+        return {"keys": [], "first_month": month_index(end), "history": y[:, :0], "model": None,
+                "fit_ms": round((time.perf_counter() - started) * 1000, 2)}
+    y = y[:, sold[0]:]
+    return {"keys": keys, "first_month": first_month + int(sold[0]), "history": y, "model": fit(y),
+            "fit_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+@router.get("/api/forecast", dependencies=[Depends(query_budget(3))])
+def get_forecast(
+    db: Session = Depends(get_tenant_read_db),
+    horizon: int = Query(3, ge=1, le=24),
+    interval: float = Query(0.95, gt=0.5, lt=1),
+    kind: Optional[str] = Query(None, pattern="^(total|category|segment)$"),
+    include_history: bool = True
+):
+    """Sales forecast with prediction intervals for total sales, each category and
+    each customer segment. Fitted on the complete months of the last
+    FORECAST_HISTORY_MONTHS; the fit is cached and redone when the income of those
+    months changes, so changing the horizon or interval does not refit."""
+    end = month_start()
+    start = month_start(settings.FORECAST_HISTORY_MONTHS)
+    version = transaction_data_version(db, start, end)
+    cache_key = (tenant_of(db), start, version)
+    fitted = forecast_models.get(cache_key)
+    cached = fitted is not None
+    if not cached:
+        fitted = fit_sales_forecast(db, start, end)
+        forecast_models.set(cache_key, fitted)
+
+    model = fitted["model"]
+    series = []
+    if model is not None:
+        category_map = category_names.get_or_set(
+            tenant_of(db), lambda: dict(db.query(Category.id, Category.name).all())
+        )
+        segment_names = {key: name for key, name, _ in CUSTOMER_SEGMENTS}
+        mean, lower, upper = model.forecast(horizon, interval)
+        history_months = [month_label(fitted["first_month"] + i) for i in range(model.n_obs)]
+        forecast_months = [month_label(month_index(end) + h) for h in range(horizon)]
+        for i, (series_kind, key) in enumerate(fitted["keys"]):
+            if kind and series_kind != kind:
+                continue
+            if series_kind == "total":
+                name = "Total sales"
+            elif series_kind == "category":
+                name = category_map.get(key, f"Category {key}") if key is not None else "Uncategorized"
+            else:
+                name = segment_names[key]
+            entry = {
+                "kind": series_kind,
+                "key": key,
+                "name": name,
+                "model": model.model,
+                "params": {"alpha": float(model.alpha[i]), "beta": float(model.beta[i]), "gamma": float(model.gamma[i])},
+                "forecast": [
+                    {"month": month, "value": round(float(mean[i, h]), 2),
+                     "lower": round(float(lower[i, h]), 2), "upper": round(float(upper[i, h]), 2)}
+                    for h, month in enumerate(forecast_months)
+                ],
+            }
+            if include_history:
+                entry["history"] = [
+                    {"month": month, "sales": round(float(fitted["history"][i, t]), 2)}
+                    for t, month in enumerate(history_months)
+                ]
+            series.append(entry)
+
+    return {
+        "history_start": month_label(fitted["first_month"]),
+        "history_end": month_label(month_index(end) - 1),
+        "data_version": version,
+        "cached": cached,
+        "fit_ms": fitted["fit_ms"],
+        "horizon": horizon,
+        "interval": interval,
+        "series": series
+    }
+
+# ========== CUSTOMER SCORES (RFM) ==========
+
+# pg_try_advisory_xact_lock(RFM_LOCK_KEY, business_id): one refresh per business at a time across workers
+RFM_LOCK_KEY = 0x52464D
+
+def refresh_customer_scores(db: Session, full: bool = False) -> dict:
+    """Rescore the customers of the session's business (app.core.rfm) and store the scores.
+
+    Incremental by default: only customers with a transaction changed since the last
+    refresh started (updated_at from the stored changes_through, less
+    RFM_CHANGE_OVERLAP_SECONDS) are aggregated and rescored, ranked against the stored
+    figures of everyone else. The overlap covers writes that commit after a refresh
+    has read them; a longer one, a deleted transaction, or the customer an income was
+    moved away from are only caught by the full rescoring. The first run, ``full``
+    and scores older than RFM_FULL_REFRESH_HOURS rescore everyone, which also moves
+    recency along for customers who did not buy.
+    """
+    # numpy is only needed here; importing app.main stays light
+    import numpy as np
+    from .core.rfm import score_customers
+
+    started = time.perf_counter()
+    if db.get_bind().dialect.name == "postgresql" and not db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key, :business_id)"),
+        {"key": RFM_LOCK_KEY, "business_id": tenant_of(db)}
+    ).scalar():
+        return {"mode": "skipped", "scored": 0}
+    
+    oldest, watermark, stored = db.query(
+        func.min(CustomerScore.scored_at), func.max(CustomerScore.changes_through), func.count()
+    ).select_from(CustomerScore).one()
+    now = datetime.utcnow()
+    full = (full or not stored or watermark is None
+            or oldest < now - timedelta(hours=settings.RFM_FULL_REFRESH_HOURS))
+    # The database clock that stamps updated_at; in PostgreSQL now() is the start of this
+    # transaction, so it is no later than the snapshot of any query below
+    through = db.query(func.now()).scalar()
+    
+    # One aggregate pass per customer: first and last purchase, count, total
+    purchases = db.query(
+        Transaction.customer_id,
+        func.min(Transaction.transaction_date),
+        func.max(Transaction.transaction_date),
+        func.count(),
+        func.sum(Transaction.amount)
+    ).filter(
+        Transaction.type == 'income',
+        Transaction.customer_id.isnot(None)
+    )
+    if not full:
+        # Any change counts (an income turned expense takes the customer's score away)
+        touched = {customer_id for (customer_id,) in db.query(Transaction.customer_id).filter(
+            Transaction.updated_at >= watermark - timedelta(seconds=settings.RFM_CHANGE_OVERLAP_SECONDS),
+            Transaction.customer_id.isnot(None)
+        ).distinct()}
+        if not touched:
+            return {"mode": "incremental", "scored": 0, "changes_through": watermark,
+                    "ms": round((time.perf_counter() - started) * 1000, 2)}
+        purchases = purchases.filter(Transaction.customer_id.in_(touched))
+    rows = purchases.group_by(Transaction.customer_id).all()
+    
+    # Everyone else is ranked from their stored figures
+    population = list(rows)
+    if not full:
+        population += [row for row in db.query(
+            CustomerScore.customer_id, CustomerScore.first_purchase, CustomerScore.last_purchase,
+            CustomerScore.frequency, CustomerScore.monetary
+        ) if row[0] not in touched]
+    
+    if full:
+        db.query(CustomerScore).delete(synchronize_session=False)
+    else:
+        db.query(CustomerScore).filter(CustomerScore.customer_id.in_(touched)).delete(synchronize_session=False)
+    if rows:
+        scored = np.zeros(len(population), dtype=bool)
+        scored[:len(rows)] = True
+        scores = score_customers(
+            date.today().toordinal(),
+            np.array([row[1].toordinal() for row in population]),
+            np.array([row[2].toordinal() for row in population]),
+            np.array([row[3] for row in population]),
+            np.array([float(row[4] or 0) for row in population]),
+            scored,
+        )
+        columns = {name: values.tolist() for name, values in scores.items()}
+        db.execute(insert(CustomerScore), [
+            {
+                "customer_id": customer_id,
+                "first_purchase": first_purchase,
+                "last_purchase": last_purchase,
+                "frequency": frequency,
+                "monetary": float(monetary or 0),
+                **{name: values[i] for name, values in columns.items()},
+                "changes_through": through,
+                "scored_at": now,
+                "business_id": tenant_of(db),
+            }
+            for i, (customer_id, first_purchase, last_purchase, frequency, monetary) in enumerate(rows)
+        ])
+    db.commit()
+    return {"mode": "full" if full else "incremental", "scored": len(rows), "customers": len(population),
+            "changes_through": through, "ms": round((time.perf_counter() - started) * 1000, 2)}
+
+def refresh_all_customer_scores() -> None:
+    """Score refresh for every business, run by RfmMaintenance"""
+    with SessionLocal(bind=get_engine()) as db:
+        business_ids = [business_id for (business_id,) in db.query(Business.id)]
+    for business_id in business_ids:
+        with SessionLocal(bind=get_engine()) as db:
+            refresh_customer_scores(scope_session(db, business_id))
+
+@router.post("/api/analytics/rfm/refresh")
+def refresh_rfm(
+    full: bool = False,
+    db: Session = Depends(get_tenant_db),
+    current_user: CurrentUser = Depends(require_admin)
+):
+    """Rescore now (incrementally unless ``full``) instead of waiting for the background refresh"""
+    try:
+        return refresh_customer_scores(db, full=full)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/api/analytics/rfm", dependencies=[Depends(query_budget(1))])
+def get_rfm_scores(
+    response: Response,
+    db: Session = Depends(get_tenant_read_db),
+    band: Optional[List[str]] = Query(None),
+    churn: Optional[str] = Query(None, pattern="^(low|medium|high)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, gt=0, le=1000)
+):
+    """Stored customer scores, highest R + F + M first. ``band`` (repeatable) keeps
+    only those RFM bands (champions, loyal, needs_attention, hibernating) and
+    ``churn`` one churn-risk band. When more rows exist, the cursor for the next
+    page is returned in the ``X-Next-Cursor`` header."""
+    from .core.rfm import RFM_BANDS
+
+    unknown = sorted(set(band or ()) - {name for name, _ in RFM_BANDS})
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown band: {', '.join(unknown)}")
+    
+    query = db.query(CustomerScore, Customer.name).join(Customer, Customer.id == CustomerScore.customer_id)
+    if band:
+        query = query.filter(CustomerScore.band.in_(band))
+    if churn:
+        query = query.filter(CustomerScore.churn_band == churn)
+    
+    # Keyset pagination on (rfm_score, customer_id), highest first
+    after = decode_cursor(cursor)
+    if after is not None:
+        query = query.filter(tuple_(CustomerScore.rfm_score, CustomerScore.customer_id) < after)
+    rows = query.order_by(CustomerScore.rfm_score.desc(), CustomerScore.customer_id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.rfm_score, last.customer_id)
+    
+    today = date.today()
+    return [
+        {
+            "customer_id": score.customer_id,
+            "name": name,
+            "recency_days": (today - score.last_purchase).days,
+            "frequency": score.frequency,
+            "monetary": score.monetary,
+            "recency_score": score.recency_score,
+            "frequency_score": score.frequency_score,
+            "monetary_score": score.monetary_score,
+            "rfm_score": score.rfm_score,
+            "band": score.band,
+            "churn_risk": score.churn_risk,
+            "churn_band": score.churn_band,
+            "last_purchase": score.last_purchase.isoformat(),
+            "scored_at": score.scored_at.isoformat()
+        }
+        for score, name in rows
+    ]
+
+# ========== CUSTOMER COHORTS ==========
+
+def build_cohort_matrix(db: Session, start: date, end: date) -> dict:
+    """Customers active and income per (acquisition month, month since acquisition)
+    for the customers acquired in [start, end), counting income before ``end``.
+
+    A customer's acquisition month is the month of their first purchase, found with
+    a window over each customer's monthly income, so one statement groups the whole
+    matrix."""
+    month = func.date_trunc('month', Transaction.transaction_date)
+    monthly = db.query(
+        Transaction.customer_id.label('customer_id'),
+        month.label('month'),
+        func.sum(Transaction.amount).label('revenue')
+    ).filter(
+        Transaction.type == 'income',
+        Transaction.customer_id.isnot(None),
+        Transaction.transaction_date < end
+    ).group_by(
+        Transaction.customer_id, month
+    ).subquery()
+    activity = db.query(
+        monthly.c.month,
+        monthly.c.revenue,
+        func.min(monthly.c.month).over(partition_by=monthly.c.customer_id).label('cohort')
+    ).subquery()
+    rows = db.query(
+        activity.c.cohort, activity.c.month, func.count(), func.sum(activity.c.revenue)
+    ).filter(
+        activity.c.cohort >= start
+    ).group_by(
+        activity.c.cohort, activity.c.month
+    ).all()
+
+    first, close = month_index(start), month_index(end)
+    cohorts = {}
+    for cohort, active_month, customers, revenue in rows:
+        entry = cohorts.setdefault(month_index(cohort), {
+            "active": [0] * (close - month_index(cohort)),
+            "revenue": [0.0] * (close - month_index(cohort))
+        })
+        offset = month_index(active_month) - month_index(cohort)
+        entry["active"][offset] = customers
+        entry["revenue"][offset] = round(float(revenue or 0), 2)
+    return {
+        "cohorts": [
+            {
+                "cohort": month_label(index),
+                "customers": cohorts[index]["active"][0],
+                "active": cohorts[index]["active"],
+                "retention": [round(active / cohorts[index]["active"][0], 4) for active in cohorts[index]["active"]],
+                "revenue": cohorts[index]["revenue"],
+                "revenue_per_customer": [round(revenue / cohorts[index]["active"][0], 2)
+                                         for revenue in cohorts[index]["revenue"]]
+            }
+            for index in range(first, close) if index in cohorts
+        ]
+    }
+
+def invalidate_cohorts(business_id: Optional[int], transaction_date: Optional[date]) -> None:
+    """Drop the business's cached cohort matrices when income dated in a closed
+    month (a backdated write) changed; the open month is not part of them"""
+    if transaction_date is not None and transaction_date < month_start():
+        cohort_matrices.invalidate_where(lambda key: key[0] == business_id)
+
+@event.listens_for(Transaction, "after_insert")
+@event.listens_for(Transaction, "after_update")
+@event.listens_for(Transaction, "after_delete")
+def invalidate_cohorts_on_write(mapper, connection, target):
+    state = inspect(target)
+    if 'income' not in (target.type, *state.attrs.type.history.deleted):
+        return
+    for transaction_date in (target.transaction_date, *state.attrs.transaction_date.history.deleted):
+        invalidate_cohorts(target.business_id, transaction_date)
+
+@router.get("/api/analytics/cohorts", dependencies=[Depends(query_budget(1))])
+def get_cohorts(
+    db: Session = Depends(get_tenant_read_db),
+    months: int = Query(12, ge=1, le=60)
+):
+    """Retention and revenue matrices for the customers acquired in the last
+    ``months`` closed months. Entry i of a cohort's ``active``, ``retention`` and
+    ``revenue`` lists is the i-th month since acquisition (0 is the acquisition
+    month). Closed months do not change, so the matrix is cached by month
+    boundary until the next month closes or income in a closed month is booked,
+    edited or deleted here (invalidate_cohorts); backdated writes made by other
+    processes show once the entry expires (COHORT_CACHE_TTL_SECONDS)."""
+    end = month_start()
+    start = month_start(months)
+    cache_key = (tenant_of(db), start, end)
+    matrix = cohort_matrices.get(cache_key)
+    cached = matrix is not None
+    if not cached:
+        matrix = build_cohort_matrix(db, start, end)
+        cohort_matrices.set(cache_key, matrix)
+    return {
+        "first_cohort": month_label(month_index(start)),
+        "through": month_label(month_index(end) - 1),
+        "cached": cached,
+        **matrix
+    }
+
+# ========== SUPPLIER SCORECARD ==========
+
+# Spend trend: the last SCORECARD_TREND_DAYS against the same span before them
+SCORECARD_TREND_DAYS = 90
+
+def build_supplier_scorecard(db: Session, today: date) -> List[dict]:
+    """Scorecard of every supplier in one statement: expense totals per supplier,
+    inventory items supplied and delivery lead times, each grouped once and
+    joined to the suppliers"""
+    recent_start = today - timedelta(days=SCORECARD_TREND_DAYS)
+    previous_start = recent_start - timedelta(days=SCORECARD_TREND_DAYS)
+    spend = db.query(
+        Transaction.supplier_id.label('supplier_id'),
+        func.sum(Transaction.amount).label('spend'),
+        func.count().label('orders'),
+        func.min(Transaction.transaction_date).label('first_order'),
+        func.max(Transaction.transaction_date).label('last_order'),
+        func.sum(case((Transaction.transaction_date >= recent_start, Transaction.amount), else_=0)).label('recent_spend'),
+        func.sum(case(
+            ((Transaction.transaction_date >= previous_start) & (Transaction.transaction_date < recent_start),
+             Transaction.amount),
+            else_=0
+        )).label('previous_spend')
+    ).filter(
+        Transaction.type == 'expense',
+        Transaction.supplier_id.isnot(None)
+    ).group_by(Transaction.supplier_id).subquery()
+    supplied = db.query(
+        Inventory.supplier_id.label('supplier_id'),
+        func.count().label('item_count'),
+        func.sum(Inventory.quantity * Inventory.unit_cost).label('stock_value')
+    ).filter(Inventory.supplier_id.isnot(None)).group_by(Inventory.supplier_id).subquery()
+    deliveries = db.query(
+        StockMovement.supplier_id.label('supplier_id'),
+        func.count().label('deliveries'),
+        func.avg(StockMovement.lag_days).label('lead_days'),
+        func.max(StockMovement.received_at).label('last_delivery')
+    ).filter(StockMovement.supplier_id.isnot(None)).group_by(StockMovement.supplier_id).subquery()
+    rows = db.query(
+        Supplier.id, Supplier.name,
+        spend.c.spend, spend.c.orders, spend.c.first_order, spend.c.last_order,
+        spend.c.recent_spend, spend.c.previous_spend,
+        supplied.c.item_count, supplied.c.stock_value,
+        deliveries.c.deliveries, deliveries.c.lead_days, deliveries.c.last_delivery
+    ).outerjoin(
+        spend, spend.c.supplier_id == Supplier.id
+    ).outerjoin(
+        supplied, supplied.c.supplier_id == Supplier.id
+    ).outerjoin(
+        deliveries, deliveries.c.supplier_id == Supplier.id
+    ).all()
+
+    scorecard = []
+    for (supplier_id, name, total, orders, first_order, last_order, recent, previous,
+         item_count, stock_value, delivery_count, lead_days, last_delivery) in rows:
+        total, recent, previous = (abs(float(value or 0)) for value in (total, recent, previous))
+        orders = orders or 0
+        scorecard.append({
+            "supplier_id": supplier_id,
+            "name": name,
+            "total_spend": round(total, 2),
+            "order_count": orders,
+            "avg_order_value": round(total / orders, 2) if orders else 0,
+            "first_order": first_order.isoformat() if first_order else None,
+            "last_order": last_order.isoformat() if last_order else None,
+            "days_between_orders": round((last_order - first_order).days / (orders - 1), 1) if orders > 1 else None,
+            "recent_spend": round(recent, 2),
+            "previous_spend": round(previous, 2),
+            "spend_trend_pct": round((recent / previous - 1) * 100, 1) if previous else None,
+            "items_supplied": item_count or 0,
+            "stock_value": round(float(stock_value or 0), 2),
+            "deliveries": delivery_count or 0,
+            "avg_lead_days": round(float(lead_days), 1) if lead_days is not None else None,
+            "last_delivery": last_delivery.isoformat() if last_delivery else None
+        })
+    scorecard.sort(key=lambda entry: (-entry["total_spend"], entry["name"]))
+    return scorecard
+
+def supplier_scorecard(db: Session) -> Tuple[List[dict], bool]:
+    """(scorecard, whether it came from the cache). Cached per day and expense
+    data version, so a new or edited purchase is reflected on the next request."""
+    today = date.today()
+    cache_key = (tenant_of(db), today, transaction_data_version(db, None, today + timedelta(days=1), 'expense'))
+    scorecard = supplier_scorecards.get(cache_key)
+    cached = scorecard is not None
+    if not cached:
+        scorecard = build_supplier_scorecard(db, today)
+        supplier_scorecards.set(cache_key, scorecard)
+    return scorecard, cached
+
+@router.get("/api/analytics/suppliers", dependencies=[Depends(query_budget(2))])
+def get_supplier_scorecard(db: Session = Depends(get_tenant_read_db)):
+    """Supplier scorecard: spend, orders, average order, days between orders, spend
+    trend over the last SCORECARD_TREND_DAYS, inventory items supplied and average
+    lead time from purchase to stock received. Highest spend first."""
+    scorecard, cached = supplier_scorecard(db)
+    return {
+        "as_of": date.today().isoformat(),
+        "trend_days": SCORECARD_TREND_DAYS,
+        "cached": cached,
+        "suppliers": scorecard
+    }
+
 # Dashboard stats
-@app.get("/api/stats")
-def get_stats(db: Session = Depends(get_db)):
+@router.get("/api/stats")
+def get_stats(db: Session = Depends(get_tenant_read_db)):
     # Total income
     total_income = db.query(Transaction).filter(
         Transaction.type == 'income'
@@ -1226,9 +2229,9 @@ def get_stats(db: Session = Depends(get_db)):
     }
 
 # Dashboard comprehensive stats
-@app.get("/api/dashboard")
+@router.get("/api/dashboard", dependencies=[Depends(query_budget(11))])
 # def get_dashboard_stats(db: Session = Depends(get_db)):
-def get_dashboard_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):         # needs authentication
+def get_dashboard_stats(db: Session = Depends(get_tenant_read_db), current_user: CurrentUser = Depends(get_current_user)):         # needs authentication
     # Basic stats
     total_income = db.query(Transaction).filter(
         Transaction.type == 'income'
@@ -1245,6 +2248,8 @@ def get_dashboard_stats(db: Session = Depends(get_db), current_user: User = Depe
         func.date_trunc('month', Transaction.transaction_date).label('month'),  # FIXED
         Transaction.type,
         func.sum(Transaction.amount).label('total')
+    ).filter(
+        Transaction.transaction_date >= month_start(11)  # last 12 monthly partitions only
     ).group_by(
         func.date_trunc('month', Transaction.transaction_date),  # FIXED
         Transaction.type
@@ -1281,11 +2286,10 @@ def get_dashboard_stats(db: Session = Depends(get_db), current_user: User = Depe
         Customer.total_spent.desc()
     ).limit(20).all()
     
-    # Get category names for the category IDs
-    category_map = {}
-    categories = db.query(Category).all()
-    for cat in categories:
-        category_map[cat.id] = cat.name
+    # Category names for the category IDs (cached per business)
+    category_map = category_names.get_or_set(
+        tenant_of(db), lambda: dict(db.query(Category.id, Category.name).all())
+    )
     
     return {
         "summary": {
@@ -1332,7 +2336,137 @@ def get_dashboard_stats(db: Session = Depends(get_db), current_user: User = Depe
         ]
     }
 
+# ===== Application factory =====
+
+# Hot read paths requested once at startup (see app.core.warmup)
+WARMUP_PATHS = [
+    ("/api/dashboard", ""),
+    ("/api/stats", ""),
+    ("/api/transactions", "limit=100"),
+    ("/api/customers", ""),
+    ("/api/customers/search", "q=a&limit=20"),
+    ("/api/suppliers", ""),
+    ("/api/inventory", "limit=100"),
+    ("/api/budgets/analysis", ""),
+    ("/api/analytics/sales-trend", ""),
+    ("/api/analytics/customer-segments", ""),
+]
+
+# No business has id 0, so warm-up queries run the real SQL but match no rows
+WARMUP_BUSINESS_ID = 0
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+startup_report: Dict[str, Any] = {"import_seconds": round(IMPORT_SECONDS, 4)}
+
+def instrument(engine):
+    """Listeners for every engine, attached when it is created"""
+    if settings.QUERY_INSPECTION:
+        inspect_engine(engine)
+    profile_engine(engine)
+    instrument_engine(engine)
+    # Statements slower than SLOW_QUERY_MS, with sampled EXPLAIN ANALYZE plans
+    slow_query_log.install(engine)
+
+def create_app() -> FastAPI:
+    """Build the API app. Nothing here connects to the database: engines are
+    created on first use, and the startup hooks check the schema, start
+    partition maintenance and the customer score refresh, and warm up the hot
+    paths before traffic arrives.
+
+    Run with ``uvicorn app.main:create_app --factory`` (or ``app.main:app``).
+    """
+    started = time.perf_counter()
+    setup_logging()
+    # Sessions from get_tenant_db only see (and write) rows of the request's business
+    install_tenant_scoping(BusinessScoped)
+    on_engine_created(instrument)
+
+    app = FastAPI(
+        title=settings.APP_NAME,
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc"
+    )
+    app.include_router(router)
+
+    # Reads from clients that wrote in the last READ_YOUR_WRITES_SECONDS go to the primary
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+    # Dev/test: flag N+1 patterns and endpoints going over their query budget.
+    # Added first so it runs inside MetricsMiddleware, which owns the request stats.
+    if settings.QUERY_INSPECTION:
+        app.add_middleware(QueryInspectionMiddleware)
+
+    # Admin requests sent with "X-Profile: 1" are stack-sampled; others only pay a header check
+    app.add_middleware(ProfilingMiddleware, authorize=can_profile)
+
+    # Per-route request/latency/size metrics and SQL usage, served on /metrics
+    app.add_middleware(MetricsMiddleware)
+
+    # Outermost: request id for log correlation, echoed in X-Request-ID
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.on_event("startup")
+    def check_database_schema():
+        phase_started = time.perf_counter()
+        startup_report["schema"] = check_schema(get_engine(), settings.SCHEMA_CHECK)
+        record_startup_phase("schema_check", phase_started)
+
+    # Monthly transactions partitions, created PARTITION_MONTHS_AHEAD months in advance
+    @app.on_event("startup")
+    def start_partition_maintenance():
+        app.state.partition_maintenance = PartitionMaintenance(
+            get_engine(), settings.PARTITION_MONTHS_AHEAD, settings.PARTITION_CHECK_HOURS
+        )
+        app.state.partition_maintenance.start()
+
+    # Customer RFM / churn-risk scores, rescored incrementally every RFM_REFRESH_MINUTES
+    @app.on_event("startup")
+    def start_rfm_maintenance():
+        from .core.rfm import RfmMaintenance
+        app.state.rfm_maintenance = RfmMaintenance(refresh_all_customer_scores, settings.RFM_REFRESH_MINUTES)
+        app.state.rfm_maintenance.start()
+
+    @app.on_event("startup")
+    async def warm_up_hot_paths():
+        schema = startup_report.get("schema") or {}
+        if settings.STARTUP_WARMUP and schema.get("status") != "unreachable":
+            phase_started = time.perf_counter()
+            startup_report["warmup"] = await warm_up(app, WARMUP_PATHS, {
+                request_business_id: lambda: WARMUP_BUSINESS_ID,
+                get_current_user: lambda: CurrentUser(
+                    id=0, username="startup-warmup", email="warmup@localhost", role="admin"
+                ),
+            })
+            record_startup_phase("warmup", phase_started)
+        startup_logger.info("Startup complete", extra={"startup": startup_report})
+
+    @app.on_event("shutdown")
+    def stop_maintenance():
+        for name in ("partition_maintenance", "rfm_maintenance"):
+            maintenance = getattr(app.state, name, None)
+            if maintenance is not None:
+                maintenance.stop()
+
+    record_startup_phase("create_app", started)
+    return app
+
+def record_startup_phase(phase: str, started: float) -> None:
+    seconds = time.perf_counter() - started
+    startup_report[f"{phase}_seconds"] = round(seconds, 4)
+    STARTUP_SECONDS.set((phase,), seconds)
+
+def __getattr__(name):
+    # ``app`` is built on first access (uvicorn app.main:app, run.py, benchmarks), not at import
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == "__main__":
+    # python -m app.main (from backend/)
+    import uvicorn
     print(f"🚀 Starting {settings.APP_NAME} on http://localhost:8000")
     print(f"📊 Database: {settings.DATABASE_URL}")
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(create_app(), host="0.0.0.0", port=8000)
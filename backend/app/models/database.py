@@ -1,7 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Date, Index, Numeric, Computed
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from backend.app.core.database import Base
+from ..core.database import Base
+
+class BusinessScoped:
+    """Rows owned by one business; sessions scoped to a tenant only see their own
+    (see app.core.tenancy)"""
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
 
 class Business(Base):
     __tablename__ = "businesses"
@@ -31,27 +36,33 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     role = Column(String(20), default="user")
     business_id = Column(Integer, ForeignKey("businesses.id"))
+    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)  # portal link for role 'customer'
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), index=True)  # portal link for role 'supplier'
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
     business = relationship("Business", back_populates="users")
     transactions = relationship("Transaction", back_populates="user")
 
-class Category(Base):
+class Category(Base, BusinessScoped):
     __tablename__ = "categories"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), nullable=False)
     type = Column(String(10))  # expense, income, both
     color = Column(String(7), default="#3B82F6")
-    business_id = Column(Integer, ForeignKey("businesses.id"))
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
     
     # Relationships
     business = relationship("Business", back_populates="categories")
     transactions = relationship("Transaction", back_populates="category")
     budgets = relationship("Budget", back_populates="category")
+    
+    __table_args__ = (
+        Index("idx_categories_business", "business_id"),
+    )
 
-class Supplier(Base):
+class Supplier(Base, BusinessScoped):
     __tablename__ = "suppliers"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -62,15 +73,19 @@ class Supplier(Base):
     website = Column(String(200))
     address = Column(Text)
     notes = Column(Text)
-    business_id = Column(Integer, ForeignKey("businesses.id"))
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
     business = relationship("Business", back_populates="suppliers")
     transactions = relationship("Transaction", back_populates="supplier")
     inventory = relationship("Inventory", back_populates="supplier")
+    
+    __table_args__ = (
+        Index("idx_suppliers_business_name", "business_id", "name"),
+    )
 
-class Customer(Base):
+class Customer(Base, BusinessScoped):
     __tablename__ = "customers"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -83,14 +98,21 @@ class Customer(Base):
     total_spent = Column(Float, default=0.0)
     last_purchase = Column(Date)
     notes = Column(Text)
-    business_id = Column(Integer, ForeignKey("businesses.id"))
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
     business = relationship("Business", back_populates="customers")
     transactions = relationship("Transaction", back_populates="customer")
+    
+    # Indexes (schema changes go through alembic/versions)
+    __table_args__ = (
+        Index("idx_customers_instagram", "instagram_handle"),
+        Index("idx_customers_email", "email"),
+        Index("idx_customers_business_total_spent", "business_id", "total_spent"),  # top customers
+    )
 
-class Inventory(Base):
+class Inventory(Base, BusinessScoped):
     __tablename__ = "inventory"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -98,18 +120,72 @@ class Inventory(Base):
     description = Column(Text)
     category = Column(String(50))
     unit_cost = Column(Float, nullable=False)
-    quantity = Column(Integer, default=0)
+    quantity = Column(Integer, nullable=False, default=0, server_default="0")
     reorder_level = Column(Integer, default=10)
     supplier_id = Column(Integer, ForeignKey("suppliers.id"))
-    business_id = Column(Integer, ForeignKey("businesses.id"))
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
     supplier = relationship("Supplier", back_populates="inventory")
     business = relationship("Business")
+    
+    # Indexes for filtered/sorted inventory listings
+    __table_args__ = (
+        Index("idx_inventory_business_category_name", "business_id", "category", "name"),
+        Index("idx_inventory_business_quantity", "business_id", "quantity", "id"),
+        Index("idx_inventory_supplier", "supplier_id"),
+    )
+
+class StockMovement(Base, BusinessScoped):
+    """Stock received into inventory (POST /api/inventory/{id}/receive), with the
+    purchase it fulfils when known"""
+    __tablename__ = "stock_movements"
+    
+    id = Column(Integer, primary_key=True)
+    inventory_id = Column(Integer, ForeignKey("inventory.id", ondelete="CASCADE"), nullable=False)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="SET NULL"))
+    quantity = Column(Integer, nullable=False)
+    unit_cost = Column(Float)
+    reference = Column(String(50))
+    notes = Column(Text)
+    # No foreign key (transactions is partitioned, see TransactionItem); lag_days runs
+    # from that expense's date to the day the stock was received
+    transaction_id = Column(Integer)
+    lag_days = Column(Integer)
+    received_at = Column(DateTime, nullable=False, default=func.now())
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
+    
+    # Relationships
+    inventory = relationship("Inventory")
+    supplier = relationship("Supplier")
+    
+    # Per-supplier scorecard aggregates
+    __table_args__ = (
+        Index("idx_stock_movements_business_supplier", "business_id", "supplier_id"),
+        Index("idx_stock_movements_inventory", "inventory_id"),
+    )
+
+class SupplierMonthlyTotal(Base, BusinessScoped):
+    """Expenses per supplier and month, kept current by the PostgreSQL trigger
+    transactions_supplier_monthly_totals (alembic revision 0006) on every expense
+    insert, update and delete; the supplier portal reads these instead of
+    transactions"""
+    __tablename__ = "supplier_monthly_totals"
+    
+    # business_id leads the key: a row per business the expenses were booked under
+    business_id = Column(Integer, ForeignKey("businesses.id"), primary_key=True)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month
+    total = Column(Numeric(12, 2), nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
 
-class Transaction(Base):
+class Transaction(Base, BusinessScoped):
+    # Range-partitioned by month on transaction_date in PostgreSQL, with primary key
+    # (id, transaction_date); the partitioned table is created by the Alembic baseline,
+    # scripts/init.sql or scripts/partition_transactions.sql, not by create_all.
+    # id stays unique (one sequence).
     __tablename__ = "transactions"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -121,7 +197,7 @@ class Transaction(Base):
     customer_id = Column(Integer, ForeignKey("customers.id"))
     supplier_id = Column(Integer, ForeignKey("suppliers.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
-    business_id = Column(Integer, ForeignKey("businesses.id"))
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
     payment_method = Column(String(20))
     reference_number = Column(String(50))
     created_at = Column(DateTime, default=func.now())
@@ -145,8 +221,50 @@ class Transaction(Base):
     supplier = relationship("Supplier", back_populates="transactions")
     user = relationship("User", back_populates="transactions")
     business = relationship("Business", back_populates="transactions")
+    items = relationship("TransactionItem", back_populates="transaction",
+                         primaryjoin="Transaction.id == foreign(TransactionItem.transaction_id)",
+                         cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Hot access paths (alembic revisions 0002, 0003); the included columns make the
+    # tenant-scoped customer / supplier / budget / dashboard sums index-only scans
+    __table_args__ = (
+        Index("idx_transactions_date", "transaction_date", postgresql_using="brin"),
+        Index("idx_transactions_customer_type_date", "customer_id", "type", "transaction_date",
+              postgresql_include=["amount", "business_id"]),
+        Index("idx_transactions_supplier_type_date", "supplier_id", "type", "transaction_date",
+              postgresql_include=["amount", "business_id"]),
+        Index("idx_transactions_business_type_date", "business_id", "type", "transaction_date",
+              postgresql_include=["amount", "category_id"]),
+        Index("idx_transactions_business_type_category_date", "business_id", "type", "category_id",
+              "transaction_date", postgresql_include=["amount"]),
+        # Changed transactions for the incremental score refresh (revision 0009)
+        Index("idx_transactions_business_updated", "business_id", "updated_at",
+              postgresql_include=["customer_id", "type"]),
+    )
+
+class TransactionItem(Base):
+    __tablename__ = "transaction_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # No foreign key: a partitioned table can only be referenced through a key that
+    # includes transaction_date. Deletes cascade through the transactions_delete_items trigger.
+    transaction_id = Column(Integer)
+    inventory_id = Column(Integer, ForeignKey("inventory.id"))
+    description = Column(String(200))
+    quantity = Column(Integer, nullable=False, default=1)
+    unit_price = Column(Numeric(10, 2), nullable=False)
+    total_price = Column(Numeric(10, 2), Computed("quantity * unit_price", persisted=True))  # generated by the database
+    
+    # Relationships
+    transaction = relationship("Transaction", back_populates="items",
+                               primaryjoin="foreign(TransactionItem.transaction_id) == Transaction.id")
+    inventory = relationship("Inventory")
+    
+    __table_args__ = (
+        Index("idx_transaction_items_transaction", "transaction_id"),
+    )
 
-class Budget(Base):
+class Budget(Base, BusinessScoped):
     __tablename__ = "budgets"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -156,12 +274,45 @@ class Budget(Base):
     period = Column(String(20))  # daily, weekly, monthly, quarterly, yearly
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
-    business_id = Column(Integer, ForeignKey("businesses.id"))
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
     category = relationship("Category", back_populates="budgets")
     business = relationship("Business", back_populates="budgets")
+    
+    __table_args__ = (
+        Index("idx_budgets_business", "business_id"),
+    )
+
+class CustomerScore(Base, BusinessScoped):
+    """RFM and churn-risk scores per customer (app.core.rfm), rewritten by the
+    refresh; customers without purchases have no row"""
+    __tablename__ = "customer_scores"
+    
+    customer_id = Column(Integer, ForeignKey("customers.id", ondelete="CASCADE"), primary_key=True)
+    first_purchase = Column(Date, nullable=False)
+    last_purchase = Column(Date, nullable=False)
+    frequency = Column(Integer, nullable=False)
+    monetary = Column(Float, nullable=False)
+    recency_score = Column(Integer, nullable=False)
+    frequency_score = Column(Integer, nullable=False)
+    monetary_score = Column(Integer, nullable=False)
+    rfm_score = Column(Integer, nullable=False)
+    band = Column(String(20), nullable=False)
+    churn_risk = Column(Float, nullable=False)
+    churn_band = Column(String(10), nullable=False)
+    changes_through = Column(DateTime)  # database time the refresh started; NULL rescores everyone
+    scored_at = Column(DateTime, nullable=False)
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
+    
+    # Relationships
+    customer = relationship("Customer")
+    
+    # Listing by score (keyset on rfm_score, customer_id) with optional band / churn filters
+    __table_args__ = (
+        Index("idx_customer_scores_business_score", "business_id", "rfm_score", "customer_id"),
+    )
 
 
 
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Load test: simulated admin, customer and supplier sessions.
+
+Each virtual user logs in through /token, then loops over its journey
+(the requests the Streamlit pages make), pausing a random think time
+between steps:
+
+- admin: dashboard, stats, analytics (segments, sales trend, transactions),
+  reports (transactions, customers, suppliers, budgets), budget analysis,
+  inventory;
+- customer: portal dashboard and order history for the linked customer;
+- supplier: portal dashboard and order history for the linked supplier.
+
+The number of active users follows a load profile (k6-style stages,
+linearly interpolated). The report has per-endpoint latency percentiles,
+error counts and throughput plus a per-second timeline, printed as a
+table and optionally written as JSON.
+
+Users are found from the login response (customer_id / supplier_id), so
+point it at a database with linked portal users, e.g. one loaded by
+generate_data.py --user-password.
+
+Usage:
+    python backend/benchmarks/load_test.py --users 50 --profile ramp --duration 120
+    python backend/benchmarks/load_test.py --stages 30s:10,1m:100,30s:100,10s:0 --mix admin=1,customer=8,supplier=1
+    python backend/benchmarks/load_test.py --start-server --workers 4 --users 200 --json load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+
+JOURNEYS = {
+    "admin": [
+        ("GET", "/api/dashboard", None),
+        ("GET", "/api/stats", None),
+        ("GET", "/api/analytics/customer-segments", None),
+        ("GET", "/api/analytics/sales-trend", None),
+        ("GET", "/api/transactions", {"limit": 1000}),
+        ("GET", "/api/transactions", {"limit": 5000}),
+        ("GET", "/api/customers", None),
+        ("GET", "/api/suppliers", None),
+        ("GET", "/api/budgets", None),
+        ("GET", "/api/budgets/analysis", None),
+        ("GET", "/api/inventory", {"limit": 100}),
+    ],
+    "customer": [
+        ("GET", "/api/customers/{customer_id}/dashboard", None),
+        ("GET", "/api/customers/{customer_id}/orders", None),
+    ],
+    "supplier": [
+        ("GET", "/api/suppliers/{supplier_id}/dashboard", None),
+        ("GET", "/api/suppliers/{supplier_id}/orders", None),
+    ],
+}
+
+
+# ----- load profiles -----
+
+def parse_duration(value):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(ms|s|m)?", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"bad duration: {value}")
+    number, unit = float(match.group(1)), match.group(2) or "s"
+    return number * {"ms": 0.001, "s": 1, "m": 60}[unit]
+
+
+def parse_stages(spec):
+    """``"30s:10,1m:50"`` -> [(30.0, 10), (60.0, 50)]: reach the target over the duration"""
+    stages = []
+    for item in spec.split(","):
+        duration, target = item.split(":")
+        stages.append((parse_duration(duration), int(target)))
+    return stages
+
+
+def profile_stages(profile, users, duration, ramp_up):
+    if profile == "constant":
+        return [(0, users), (duration, users)]
+    if profile == "ramp":
+        return [(ramp_up, users), (duration, users), (ramp_up / 2, 0)]
+    if profile == "step":
+        steps = 5
+        stages = []
+        for i in range(1, steps + 1):
+            level = round(users * i / steps)
+            stages += [(0, level), (duration / steps, level)]
+        return stages
+    if profile == "spike":
+        base = max(1, users // 10)
+        return [(ramp_up, base), (duration / 3, base), (1, users), (duration / 3, users),
+                (1, base), (duration / 3, base)]
+    raise ValueError(profile)
+
+
+def target_users(stages, elapsed):
+    """Active users wanted ``elapsed`` seconds in; None once the stages are over"""
+    start_users, stage_start = 0, 0.0
+    for duration, target in stages:
+        if elapsed < stage_start + duration:
+            progress = (elapsed - stage_start) / duration
+            return round(start_users + (target - start_users) * progress)
+        start_users, stage_start = target, stage_start + duration
+    return None
+
+
+# ----- measurement -----
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.timeline = defaultdict(lambda: {"requests": 0, "errors": 0, "users": 0})
+        self.journeys = defaultdict(list)
+        self.started = time.perf_counter()
+
+    def second(self):
+        return int(time.perf_counter() - self.started)
+
+    def record(self, name, elapsed, error=None):
+        self.latencies[name].append(elapsed)
+        bucket = self.timeline[self.second()]
+        bucket["requests"] += 1
+        if error is not None:
+            self.errors[name][error] += 1
+            bucket["errors"] += 1
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(values, elapsed):
+    return {
+        "count": len(values),
+        "rps": round(len(values) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {
+            "p50": round(percentile(values, 50) * 1000, 1),
+            "p90": round(percentile(values, 90) * 1000, 1),
+            "p95": round(percentile(values, 95) * 1000, 1),
+            "p99": round(percentile(values, 99) * 1000, 1),
+            "max": round(max(values) * 1000, 1),
+        },
+    }
+
+
+# ----- virtual users -----
+
+class VirtualUser:
+    def __init__(self, role, credentials, client, stats, think_time):
+        self.role = role
+        self.username, self.password = credentials
+        self.client = client
+        self.stats = stats
+        self.think_time = think_time
+        self.headers = {}
+        self.ids = {}
+        self.stopping = False
+
+    async def request(self, method, name, url, **kwargs):
+        started = time.perf_counter()
+        error = None
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+            if response.status_code >= 400:
+                error = str(response.status_code)
+        except httpx.HTTPError as e:
+            response = None
+            error = type(e).__name__
+        self.stats.record(f"{method} {name}", time.perf_counter() - started, error)
+        return response if error is None else None
+
+    async def login(self):
+        response = await self.request("POST", "/token", "/token",
+                                      data={"username": self.username, "password": self.password})
+        if response is None:
+            return False
+        body = response.json()
+        self.headers = {"Authorization": f"Bearer {body['access_token']}"}
+        self.ids = {key: body["user"].get(key) for key in ("customer_id", "supplier_id")}
+        return True
+
+    async def think(self):
+        if self.think_time > 0:
+            await asyncio.sleep(random.expovariate(1 / self.think_time))
+
+    async def run(self):
+        while not self.stopping and not await self.login():
+            await asyncio.sleep(1)
+        while not self.stopping:
+            started = time.perf_counter()
+            for method, path, params in JOURNEYS[self.role]:
+                if self.stopping:
+                    return
+                await self.request(method, path, path.format(**self.ids), params=params)
+                await self.think()
+            self.stats.journeys[self.role].append(time.perf_counter() - started)
+
+
+async def run_load(args, stages):
+    stats = Stats()
+    roles, weights = zip(*args.mix.items())
+    max_users = max(target for _, target in stages)
+    limits = httpx.Limits(max_connections=max_users, max_keepalive_connections=max_users)
+    users = []
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        while True:
+            elapsed = time.perf_counter() - stats.started
+            wanted = target_users(stages, elapsed)
+            if wanted is None:
+                break
+            active = [user for user, _ in users if not user.stopping]
+            for _ in range(wanted - len(active)):
+                role = random.choices(roles, weights)[0]
+                user = VirtualUser(role, args.credentials[role], client, stats, args.think_time)
+                users.append((user, asyncio.create_task(user.run())))
+            for user in active[wanted:]:
+                user.stopping = True
+            stats.timeline[stats.second()]["users"] = max(wanted, len(active))
+            await asyncio.sleep(0.25)
+
+        for user, _ in users:
+            user.stopping = True
+        await asyncio.gather(*(task for _, task in users), return_exceptions=True)
+
+    return stats, time.perf_counter() - stats.started
+
+
+def build_report(args, stages, stats, elapsed):
+    all_latencies = [value for values in stats.latencies.values() for value in values]
+    total_errors = sum(sum(codes.values()) for codes in stats.errors.values())
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "stages": [{"duration_s": d, "target_users": t} for d, t in stages],
+            "mix": args.mix,
+            "think_time_s": args.think_time,
+            "seed": args.seed,
+        },
+        "duration_s": round(elapsed, 1),
+        "total": {
+            **(summarize(all_latencies, elapsed) if all_latencies else {"count": 0}),
+            "errors": total_errors,
+            "error_rate": round(total_errors / len(all_latencies), 4) if all_latencies else 0,
+        },
+        "endpoints": {
+            name: {**summarize(values, elapsed), "errors": dict(stats.errors.get(name, {}))}
+            for name, values in sorted(stats.latencies.items())
+        },
+        "journeys": {
+            role: {"completed": len(values),
+                   "p50_s": round(percentile(values, 50), 2), "p95_s": round(percentile(values, 95), 2)}
+            for role, values in sorted(stats.journeys.items()) if values
+        },
+        "timeline": [
+            {"second": second, **bucket} for second, bucket in sorted(stats.timeline.items())
+        ],
+    }
+
+
+def print_report(report):
+    total = report["total"]
+    print(f"{'endpoint':<48} {'count':>7} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  errors")
+    for name, result in report["endpoints"].items():
+        latency = result["latency_ms"]
+        errors = ", ".join(f"{code}×{count}" for code, count in result["errors"].items()) or "-"
+        print(f"{name:<48} {result['count']:>7} {result['rps']:>7.1f} {latency['p50']:>8.1f} "
+              f"{latency['p95']:>8.1f} {latency['p99']:>8.1f} {latency['max']:>8.1f}  {errors}")
+    if total["count"]:
+        latency = total["latency_ms"]
+        print(f"{'TOTAL':<48} {total['count']:>7} {total['rps']:>7.1f} {latency['p50']:>8.1f} "
+              f"{latency['p95']:>8.1f} {latency['p99']:>8.1f} {latency['max']:>8.1f}  "
+              f"{total['error_rate']:.2%}")
+    peak = max((bucket["users"] for bucket in report["timeline"]), default=0)
+    print(f"\n{report['duration_s']} s, peak {peak} users; journeys: " + ", ".join(
+        f"{role} {j['completed']} (p50 {j['p50_s']} s)" for role, j in report["journeys"].items()))
+
+
+# ----- server -----
+
+def start_server(args):
+    """Run uvicorn on the configured database and wait for /health"""
+    port = httpx.URL(args.base_url).port or 8000
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=backend_dir,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{args.base_url}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            sys.exit("server exited during startup")
+        time.sleep(0.5)
+    process.terminate()
+    sys.exit("server did not become healthy within 60 s")
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        role, weight = item.split("=")
+        if role not in JOURNEYS:
+            raise argparse.ArgumentTypeError(f"unknown role {role}; expected one of {', '.join(JOURNEYS)}")
+        mix[role] = float(weight)
+    return mix
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20, help="peak virtual users")
+    parser.add_argument("--profile", choices=["constant", "ramp", "step", "spike"], default="ramp")
+    parser.add_argument("--duration", type=parse_duration, default=60.0, help="time at load, e.g. 90s or 5m")
+    parser.add_argument("--ramp-up", type=parse_duration, default=20.0)
+    parser.add_argument("--stages", help="explicit stages, e.g. 30s:10,1m:50,10s:0 (overrides --profile)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("admin=2,customer=6,supplier=2"),
+                        help="relative share of each role")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between steps")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--password", default="bench-password", help="password for all three users")
+    parser.add_argument("--admin", default="bench_admin")
+    parser.add_argument("--customer", default="bench_customer")
+    parser.add_argument("--supplier", default="bench_supplier")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--start-server", action="store_true", help="start uvicorn for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --start-server")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    args.credentials = {role: (getattr(args, role), args.password) for role in JOURNEYS}
+    stages = parse_stages(args.stages) if args.stages else profile_stages(
+        args.profile, args.users, args.duration, args.ramp_up)
+
+    server = start_server(args) if args.start_server else None
+    try:
+        stats, elapsed = asyncio.run(run_load(args, stages))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = build_report(args, stages, stats, elapsed)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Peak-memory budgets for list and export endpoints.
+
+Seeds a large synthetic dataset, calls each list/export endpoint once to
+warm up and once under tracemalloc, and compares the peak Python
+allocation of the request with the budget in memory_budgets.json for that
+scale. Exits non-zero when any endpoint goes over, so a change that
+reintroduces whole-table materialization fails CI.
+
+The dataset lives in in-memory SQLite with the fixed --end-date, so the
+numbers are reproducible from one machine to the next; what is measured
+is the application's own allocation (ORM objects, dicts, JSON encoding),
+not the database's.
+
+Budgets are in KiB per scale. After an intentional change, re-record
+them with ``--update`` (measured peak plus --headroom) and commit the file.
+
+Usage:
+    python backend/benchmarks/memory_budgets.py --scale m
+    python backend/benchmarks/memory_budgets.py --scale m --update --headroom 1.25
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+from fastapi.testclient import TestClient
+
+from endpoints import create_bench_engine, login, main, seed, use_engine
+from synthetic import SCALES, DatasetSpec
+
+BUDGETS_FILE = os.path.join(current_dir, "memory_budgets.json")
+
+# (name, role, path, params); the name is the key in the budgets file
+CASES = [
+    ("GET /api/customers", None, "/api/customers", None),
+    ("GET /api/customers/search", None, "/api/customers/search", {"q": "a", "limit": 20}),
+    ("GET /api/suppliers", None, "/api/suppliers", None),
+    ("GET /api/inventory [all]", None, "/api/inventory", None),
+    ("GET /api/inventory [page]", None, "/api/inventory", {"limit": 100}),
+    ("GET /api/transactions [1000]", None, "/api/transactions", {"limit": 1000}),
+    ("GET /api/transactions [10000]", None, "/api/transactions", {"limit": 10000}),
+    ("GET /api/budgets", None, "/api/budgets", None),
+    ("GET /api/customers/{customer_id}/orders", "customer", "/api/customers/1/orders", None),
+    ("GET /api/suppliers/{supplier_id}/orders", "supplier", "/api/suppliers/1/orders", None),
+    ("GET /api/analytics/customer-segments", None, "/api/analytics/customer-segments", None),
+]
+
+
+def peak_request_memory(client, url, headers, params):
+    """Peak traced allocation (bytes) while serving one request, and the response size"""
+    client.get(url, headers=headers, params=params)  # warm caches, compiled queries, imports
+    gc.collect()
+    tracemalloc.start()
+    try:
+        response = client.get(url, headers=headers, params=params)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    response.raise_for_status()
+    return peak, len(response.content)
+
+
+def load_budgets():
+    if not os.path.exists(BUDGETS_FILE):
+        return {}
+    with open(BUDGETS_FILE) as f:
+        return json.load(f)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES, key=lambda s: SCALES[s]), default="m")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", default="2025-12-31",
+                        help="fixed so budgets do not drift with the calendar")
+    parser.add_argument("--only", help="only endpoints whose name contains this text")
+    parser.add_argument("--update", action="store_true", help="record measured peaks as the new budgets")
+    parser.add_argument("--headroom", type=float, default=1.25, help="budget = peak x headroom with --update")
+    parser.add_argument("--json", dest="json_path", help="also write the measurements here")
+    args = parser.parse_args()
+
+    from datetime import date
+    spec = DatasetSpec.from_scale(args.scale, seed=args.seed, end_date=date.fromisoformat(args.end_date))
+    engine = create_bench_engine("sqlite://")
+    print(f"Seeding scale {args.scale} ({spec.transactions:,} transactions)...", file=sys.stderr)
+    seed(engine, spec, chunk_size=10_000)
+    use_engine(engine)
+
+    client = TestClient(main.app)
+    headers = {
+        None: {},
+        "customer": login(client, "bench_customer"),
+        "supplier": login(client, "bench_supplier"),
+    }
+
+    budgets = load_budgets()
+    scale_budgets = budgets.get(args.scale, {})
+    results, over = {}, []
+    print(f"{'endpoint':<45} {'peak KiB':>10} {'budget':>10} {'response KiB':>13}")
+    for name, role, url, params in CASES:
+        if args.only and args.only not in name:
+            continue
+        peak, size = peak_request_memory(client, url, headers[role], params)
+        peak_kib = round(peak / 1024)
+        budget = scale_budgets.get(name)
+        results[name] = {"peak_kib": peak_kib, "budget_kib": budget, "response_kib": round(size / 1024)}
+        status = ""
+        if budget is None:
+            status = "no budget"
+        elif peak_kib > budget:
+            status = "OVER BUDGET"
+            over.append(name)
+        print(f"{name:<45} {peak_kib:>10,} {budget if budget is not None else '-':>10} "
+              f"{round(size / 1024):>13,}  {status}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"scale": args.scale, "endpoints": results}, f, indent=2, sort_keys=True)
+
+    if args.update:
+        scale_budgets.update({name: int(r["peak_kib"] * args.headroom) for name, r in results.items()})
+        budgets[args.scale] = dict(sorted(scale_budgets.items()))
+        with open(BUDGETS_FILE, "w") as f:
+            json.dump(budgets, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Budgets for scale {args.scale} written to {BUDGETS_FILE}", file=sys.stderr)
+    elif over:
+        print(f"{len(over)} endpoint(s) over their memory budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
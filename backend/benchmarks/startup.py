@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Backend cold-start timings: import, app build, schema check and warm-up.
+
+Each run is a fresh interpreter. The import is measured with DATABASE_URL
+pointing at a closed port, so it fails if importing app.main touches the
+database (or needs the PostgreSQL driver). ``-X importtime`` output gives the
+slowest modules imported under app.main. The startup phases (create_app,
+schema check, warm-up of the hot read paths) are then measured against a
+scratch SQLite file created with the models.
+
+Usage:
+    python backend/benchmarks/startup.py --runs 5
+    python backend/benchmarks/startup.py --runs 5 --max-import-seconds 1.5 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(current_dir)
+
+UNREACHABLE_DATABASE = "postgresql://startup-check@127.0.0.1:1/startup_check"
+
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from app import main
+from app.core.database import get_engine
+from app.models.database import Base
+Base.metadata.create_all(get_engine())
+from fastapi.testclient import TestClient
+with TestClient(main.app):
+    pass
+report = dict(main.startup_report, total_seconds=round(time.perf_counter() - started, 4))
+print(json.dumps(report))
+"""
+
+
+def run_python(code, env_overrides, *flags):
+    env = dict(os.environ, LOG_LEVEL="ERROR", SLOW_QUERY_LOG_FILE="", **env_overrides)
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=backend_dir, env=env,
+                          capture_output=True, text=True)
+
+
+def slowest_imports(importtime_output, limit):
+    """(cumulative ms, module) for the slowest modules imported directly by the
+    command, or by what it imports, from ``-X importtime`` output"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        if depth <= 1:
+            rows.append((int(cumulative) / 1000, module.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--max-import-seconds", type=float, help="fail when the median import is slower")
+    parser.add_argument("--json", dest="json_path", help="also write the measurements here")
+    args = parser.parse_args()
+
+    env = {"DATABASE_URL": UNREACHABLE_DATABASE, "REPLICA_DATABASE_URL": ""}
+    probe = run_python(
+        "import sys, time; t = time.perf_counter(); import app.main; "
+        "from app.core.database import engines; "
+        "print(time.perf_counter() - t, len(engines()), 'psycopg2' in sys.modules)", env)
+    if probe.returncode != 0:
+        sys.exit(f"importing app.main failed without a database:\n{probe.stderr}")
+    _, engines_created, driver_loaded = probe.stdout.split()
+    if engines_created != "0" or driver_loaded == "True":
+        sys.exit("importing app.main created an engine or loaded the database driver")
+
+    import_seconds = []
+    for _ in range(args.runs):
+        result = run_python("import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)", env)
+        import_seconds.append(float(result.stdout))
+    importtime = run_python("import app.main", env, "-X", "importtime")
+
+    startups = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for run in range(args.runs):
+            result = run_python(STARTUP_SCRIPT, {"DATABASE_URL": f"sqlite:///{scratch}/startup{run}.db",
+                                                 "REPLICA_DATABASE_URL": ""})
+            if result.returncode != 0:
+                sys.exit(f"startup failed:\n{result.stderr}")
+            startups.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    def median(key):
+        values = [report[key] for report in startups if key in report]
+        return statistics.median(values) if values else None
+
+    summary = {
+        "import_seconds": round(statistics.median(import_seconds), 4),
+        "create_app_seconds": median("create_app_seconds"),
+        "schema_check_seconds": median("schema_check_seconds"),
+        "warmup_seconds": median("warmup_seconds"),
+        "total_seconds": median("total_seconds"),
+        "slowest_imports_ms": [[round(ms, 1), module] for ms, module in
+                               slowest_imports(importtime.stderr, args.top)],
+    }
+
+    print(f"import app.main (no database)  {summary['import_seconds'] * 1000:>8.1f} ms  (median of {args.runs})")
+    for phase in ("create_app", "schema_check", "warmup", "total"):
+        value = summary[f"{phase}_seconds"]
+        if value is not None:
+            print(f"{phase:<30} {value * 1000:>8.1f} ms")
+    print("\nslowest imports (cumulative):")
+    for ms, module in summary["slowest_imports_ms"]:
+        print(f"  {ms:>8.1f} ms  {module}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+    if args.max_import_seconds and summary["import_seconds"] > args.max_import_seconds:
+        print(f"\nimport takes {summary['import_seconds']:.3f}s, over {args.max_import_seconds}s",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
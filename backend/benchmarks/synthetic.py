@@ -0,0 +1,370 @@
+"""Seeded synthetic jewelry-shop data.
+
+Rows are produced table by table, in foreign-key order, as plain dicts
+with explicit ids, so the same (spec, seed) always yields the same data
+whatever it is written to. Everything is generated lazily; callers pull
+chunks with ``chunked`` and never hold a whole table in memory.
+"""
+import itertools
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# name -> (transactions, customers)
+SCALES = {
+    "xs": (1_000, 100),
+    "s": (10_000, 1_000),
+    "m": (100_000, 10_000),
+    "l": (1_000_000, 100_000),
+}
+
+# Same categories as backend/scripts/init.sql
+EXPENSE_CATEGORIES = [
+    ("Materials", "#EF4444"), ("Packaging", "#3B82F6"), ("Shipping", "#8B5CF6"),
+    ("Marketing", "#10B981"), ("Tools & Equipment", "#F59E0B"), ("Office Supplies", "#6366F1"),
+    ("Website & Hosting", "#EC4899"), ("Professional Services", "#14B8A6"),
+]
+INCOME_CATEGORIES = [
+    ("Necklaces", "#10B981"), ("Earrings", "#3B82F6"), ("Bracelets", "#8B5CF6"),
+    ("Rings", "#F59E0B"), ("Custom Orders", "#EC4899"), ("Repairs", "#14B8A6"),
+    ("Workshops", "#84CC16"),
+]
+CATEGORIES_PER_BUSINESS = len(EXPENSE_CATEGORIES) + len(INCOME_CATEGORIES)
+
+# Relative share of expense spend per expense category (same order as above)
+EXPENSE_WEIGHTS = [40, 10, 12, 10, 6, 4, 3, 5]
+# (typical price, spread) per income category, lognormal
+INCOME_PRICES = [(85, 0.5), (45, 0.45), (55, 0.5), (120, 0.6), (220, 0.6), (30, 0.4), (65, 0.3)]
+INCOME_WEIGHTS = [22, 26, 20, 12, 8, 7, 5]
+
+# Seasonality by month (Valentine's, Mother's Day, Christmas)
+MONTH_WEIGHTS = {1: 0.8, 2: 1.3, 3: 0.9, 4: 0.9, 5: 1.2, 6: 0.9, 7: 0.8, 8: 0.8,
+                 9: 0.9, 10: 1.0, 11: 1.4, 12: 1.8}
+
+FIRST_NAMES = ["Emma", "Luca", "Sophie", "Marcus", "Isabella", "Oliver", "Chloe", "Noah", "Mia",
+               "Liam", "Ava", "Ethan", "Zoe", "Lucas", "Lily", "Mateo", "Ana", "Ines", "Rafael",
+               "Beatriz", "Joana", "Tiago", "Sara", "Diogo", "Leonor", "Hugo", "Clara", "Miguel"]
+LAST_NAMES = ["Johnson", "Rossi", "Chen", "Lee", "Garcia", "Smith", "Williams", "Brown", "Taylor",
+              "Miller", "Davis", "Silva", "Santos", "Ferreira", "Costa", "Martins", "Pereira",
+              "Oliveira", "Moreau", "Muller", "Novak", "Kowalski", "Jensen", "Romano"]
+HANDLE_SUFFIXES = ["jewels", "style", "designs", "creates", "sparkle", "shine", "gems", "loves"]
+
+SUPPLIER_STEMS = ["Silver World", "Golden Beads", "Crystal Palace", "Leather Crafts", "Pearl Paradise",
+                  "Gemstone Wholesale", "Metal Findings", "Packaging Solutions", "Tool Masters",
+                  "Shipping Express", "Marketing Pros", "Web Services", "Bead Bazaar", "Chain Works"]
+SUPPLIER_FORMS = ["Inc.", "Co.", "Ltd", "Corp", "GmbH", "Lda", "S.A."]
+
+# (name template, inventory category, unit cost range, matching expense category index)
+ITEM_TEMPLATES = [
+    ("{metal} Chain {size}mm", "Materials", (8, 40), 0),
+    ("{metal} Earring Hooks", "Materials", (0.3, 2), 0),
+    ("{stone} Beads {size}mm", "Materials", (5, 45), 0),
+    ("{metal} Clasps", "Materials", (0.8, 4), 0),
+    ("{metal} Wire {size}mm", "Materials", (3, 20), 0),
+    ("{stone} Cabochon {size}mm", "Materials", (4, 60), 0),
+    ("Velvet Jewelry Box {size}cm", "Packaging", (0.8, 3), 1),
+    ("Gift Pouch {size}cm", "Packaging", (0.2, 1), 1),
+    ("Shipping Box {size}cm", "Shipping", (0.3, 1.2), 2),
+    ("{metal} Pliers Set", "Tools", (15, 70), 4),
+]
+METALS = ["Sterling Silver", "Gold-plated", "Rose Gold", "Brass", "Copper", "Stainless Steel"]
+STONES = ["Amethyst", "Rose Quartz", "Freshwater Pearl", "Onyx", "Turquoise", "Moonstone", "Garnet"]
+ITEM_SIZES = [1, 2, 3, 4, 5, 6, 8, 10, 12]
+
+SALE_DESCRIPTIONS = ["{metal} necklace", "{stone} earrings", "{metal} bracelet", "{stone} ring",
+                     "Custom engraved {metal} ring", "Chain repair", "Beading workshop seat"]
+PAYMENT_METHODS = ["card", "card", "card", "paypal", "mbway", "cash", "bank_transfer"]
+
+
+@dataclass
+class DatasetSpec:
+    transactions: int = 1_000
+    customers: int = 100
+    businesses: int = 1
+    seed: int = 42
+    days: int = 730
+    end_date: date = field(default_factory=date.today)
+    expense_share: float = 0.25
+
+    @classmethod
+    def from_scale(cls, scale: str, **overrides) -> "DatasetSpec":
+        transactions, customers = SCALES[scale]
+        return cls(transactions=transactions, customers=customers, **overrides)
+
+    @property
+    def suppliers(self) -> int:
+        return max(5 * self.businesses, self.customers // 20)
+
+    @property
+    def inventory_items(self) -> int:
+        return max(20 * self.businesses, self.suppliers * 8)
+
+    @property
+    def start_date(self) -> date:
+        return self.end_date - timedelta(days=self.days - 1)
+
+    def row_counts(self) -> Dict[str, int]:
+        """Rows per table (transaction_items is data-dependent and left out)"""
+        expense_categories = len(EXPENSE_CATEGORIES) * self.businesses
+        return {
+            "businesses": self.businesses,
+            "categories": CATEGORIES_PER_BUSINESS * self.businesses,
+            "suppliers": self.suppliers,
+            "customers": self.customers,
+            "inventory": self.inventory_items,
+            "users": 3,
+            "transactions": self.transactions,
+            "budgets": expense_categories,
+        }
+
+
+# ----- helpers -----
+
+def _owner(row_id: int, businesses: int) -> int:
+    """Business that owns a customer/supplier/inventory row (round robin)"""
+    return (row_id - 1) % businesses + 1
+
+
+def _members(business_id: int, total: int, businesses: int) -> int:
+    """How many of ``total`` round-robin rows belong to ``business_id``"""
+    return len(range(business_id, total + 1, businesses))
+
+
+def _member_id(business_id: int, index: int, businesses: int) -> int:
+    return business_id + index * businesses
+
+
+def category_id(business_id: int, kind: str, index: int) -> int:
+    offset = index if kind == "expense" else len(EXPENSE_CATEGORIES) + index
+    return (business_id - 1) * CATEGORIES_PER_BUSINESS + offset + 1
+
+
+def _person(rng: random.Random, row_id: int) -> Tuple[str, str, str]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first.lower()}_{rng.choice(HANDLE_SUFFIXES)}{row_id}"
+    email = f"{first.lower()}.{last.lower()}{row_id}@example.com"
+    return f"{first} {last}", handle, email
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    return template.format(metal=rng.choice(METALS), stone=rng.choice(STONES),
+                           size=rng.choice(ITEM_SIZES))
+
+
+def _seasonal_day(rng: random.Random, spec: DatasetSpec) -> date:
+    peak = max(MONTH_WEIGHTS.values())
+    while True:
+        day = spec.start_date + timedelta(days=rng.randrange(spec.days))
+        if rng.random() * peak <= MONTH_WEIGHTS[day.month]:
+            return day
+
+
+# ----- table generators -----
+
+def businesses(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    for business_id in range(1, spec.businesses + 1):
+        name = "Shiny Jar" if business_id == 1 else f"Shiny Jar {business_id}"
+        yield {"id": business_id, "name": name,
+               "instagram_handle": name.lower().replace(" ", "_"), "currency": "EUR"}
+
+
+def categories(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    for business_id in range(1, spec.businesses + 1):
+        for kind, entries in (("expense", EXPENSE_CATEGORIES), ("income", INCOME_CATEGORIES)):
+            for index, (name, color) in enumerate(entries):
+                yield {"id": category_id(business_id, kind, index), "name": name,
+                       "type": kind, "color": color, "business_id": business_id}
+
+
+def suppliers(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    for supplier_id in range(1, spec.suppliers + 1):
+        stem = SUPPLIER_STEMS[(supplier_id - 1) % len(SUPPLIER_STEMS)]
+        contact, _, _ = _person(rng, supplier_id)
+        domain = f"{stem.lower().replace(' ', '')}{supplier_id}.com"
+        yield {
+            "id": supplier_id,
+            "name": f"{stem} {rng.choice(SUPPLIER_FORMS)} #{supplier_id}",
+            "contact_person": contact,
+            "email": f"sales@{domain}",
+            "phone": f"+351{rng.randrange(10**8, 10**9)}",
+            "website": domain,
+            "business_id": _owner(supplier_id, spec.businesses),
+        }
+
+
+def customers(spec: DatasetSpec, rng: random.Random,
+              totals: Optional[Dict[int, Tuple[float, date, date]]] = None) -> Iterator[dict]:
+    """Customers; ``totals`` (see customer_totals) makes total_spent, last_purchase
+    and customer_since agree with the transactions"""
+    totals = totals or {}
+    for customer_id in range(1, spec.customers + 1):
+        name, handle, email = _person(rng, customer_id)
+        since = spec.start_date + timedelta(days=rng.randrange(spec.days))
+        total_spent, first_purchase, last_purchase = totals.get(customer_id, (0.0, since, None))
+        yield {
+            "id": customer_id,
+            "name": name,
+            "instagram_handle": handle,
+            "email": email,
+            "phone": f"+351{rng.randrange(10**8, 10**9)}",
+            "customer_since": min(since, first_purchase),
+            "total_spent": round(total_spent, 2),
+            "last_purchase": last_purchase,
+            "business_id": _owner(customer_id, spec.businesses),
+        }
+
+
+def inventory(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    for item_id in range(1, spec.inventory_items + 1):
+        template, category, (low, high), _ = ITEM_TEMPLATES[(item_id - 1) % len(ITEM_TEMPLATES)]
+        business_id = _owner(item_id, spec.businesses)
+        supplier_count = _members(business_id, spec.suppliers, spec.businesses)
+        reorder_level = rng.choice([5, 10, 20, 50, 100])
+        yield {
+            "id": item_id,
+            "name": f"{_fill(template, rng)} #{item_id}",
+            "category": category,
+            "unit_cost": round(rng.uniform(low, high), 2),
+            # about one in ten items is low or out of stock
+            "quantity": rng.randrange(0, reorder_level * 2) if rng.random() < 0.1
+            else rng.randrange(reorder_level, reorder_level * 10),
+            "reorder_level": reorder_level,
+            "supplier_id": _member_id(business_id, rng.randrange(supplier_count), spec.businesses),
+            "business_id": business_id,
+            "created_at": datetime.combine(spec.start_date, datetime.min.time()),
+        }
+
+
+def users(spec: DatasetSpec, rng: random.Random, password_hash: str = "") -> Iterator[dict]:
+    """One admin plus a customer and a supplier portal user linked to row 1"""
+    base = {"hashed_password": password_hash, "is_active": True, "business_id": 1,
+            "customer_id": None, "supplier_id": None}
+    yield {**base, "id": 1, "username": "bench_admin", "email": "admin@bench.example.com",
+           "full_name": "Bench Admin", "role": "admin"}
+    yield {**base, "id": 2, "username": "bench_customer", "email": "customer@bench.example.com",
+           "full_name": "Bench Customer", "role": "customer", "customer_id": 1}
+    yield {**base, "id": 3, "username": "bench_supplier", "email": "supplier@bench.example.com",
+           "full_name": "Bench Supplier", "role": "supplier", "supplier_id": 1}
+
+
+def transactions(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    customers_per_business = [_members(b, spec.customers, spec.businesses)
+                              for b in range(1, spec.businesses + 1)]
+    suppliers_per_business = [_members(b, spec.suppliers, spec.businesses)
+                              for b in range(1, spec.businesses + 1)]
+    for transaction_id in range(1, spec.transactions + 1):
+        business_id = rng.randrange(spec.businesses) + 1
+        day = _seasonal_day(rng, spec)
+        row = {
+            "id": transaction_id,
+            "transaction_date": day,
+            "business_id": business_id,
+            "user_id": 1,
+            "customer_id": None,
+            "supplier_id": None,
+            "payment_method": rng.choice(PAYMENT_METHODS),
+            "reference_number": f"TX{transaction_id:09d}",
+            "created_at": datetime.combine(day, datetime.min.time()) + timedelta(seconds=rng.randrange(86400)),
+        }
+        if rng.random() < spec.expense_share:
+            index = rng.choices(range(len(EXPENSE_CATEGORIES)), EXPENSE_WEIGHTS)[0]
+            supplier_index = int(suppliers_per_business[business_id - 1] * rng.random() ** 1.5)
+            row.update({
+                "type": "expense",
+                "amount": round(rng.lognormvariate(math.log(90), 0.8), 2),
+                "category_id": category_id(business_id, "expense", index),
+                "supplier_id": _member_id(business_id, supplier_index, spec.businesses),
+                "description": f"{EXPENSE_CATEGORIES[index][0]} purchase",
+            })
+        else:
+            index = rng.choices(range(len(INCOME_CATEGORIES)), INCOME_WEIGHTS)[0]
+            price, spread = INCOME_PRICES[index]
+            # a minority of customers place most of the orders
+            customer_index = int(customers_per_business[business_id - 1] * rng.random() ** 2)
+            row.update({
+                "type": "income",
+                "amount": round(rng.lognormvariate(math.log(price), spread), 2),
+                "category_id": category_id(business_id, "income", index),
+                "customer_id": _member_id(business_id, customer_index, spec.businesses),
+                "description": _fill(rng.choice(SALE_DESCRIPTIONS), rng).capitalize(),
+            })
+        yield row
+
+
+def transaction_items(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    """One to three line items per sale, adding up to the sale amount.
+
+    Replays the transactions stream, so it needs no state beyond the current row.
+    """
+    item_id = itertools.count(1)
+    for sale in generate(spec, "transactions"):
+        if sale["type"] != "income":
+            continue
+        lines = rng.choices((1, 2, 3), (70, 22, 8))[0]
+        cents = round(sale["amount"] * 100)
+        cuts = sorted(rng.sample(range(1, cents), lines - 1)) if cents > lines else []
+        for low, high in zip([0] + cuts, cuts + [cents]):
+            yield {
+                "id": next(item_id),
+                "transaction_id": sale["id"],
+                "inventory_id": None,
+                "description": sale["description"] if lines == 1 else _fill(rng.choice(SALE_DESCRIPTIONS), rng).capitalize(),
+                "quantity": 1,
+                "unit_price": (high - low) / 100,
+            }
+
+
+def customer_totals(spec: DatasetSpec) -> Dict[int, Tuple[float, date, date]]:
+    """(total spent, first purchase, last purchase) per customer, from one pass over the transactions stream"""
+    totals: Dict[int, Tuple[float, date, date]] = {}
+    for row in generate(spec, "transactions"):
+        if row["customer_id"] is not None:
+            day = row["transaction_date"]
+            spent, first, last = totals.get(row["customer_id"], (0.0, day, day))
+            totals[row["customer_id"]] = (spent + row["amount"], min(first, day), max(last, day))
+    return totals
+
+
+def budgets(spec: DatasetSpec, rng: random.Random) -> Iterator[dict]:
+    budget_id = itertools.count(1)
+    monthly_spend = spec.transactions * spec.expense_share * 90 / max(spec.days / 30, 1)
+    for business_id in range(1, spec.businesses + 1):
+        for index, (name, _) in enumerate(EXPENSE_CATEGORIES):
+            share = EXPENSE_WEIGHTS[index] / sum(EXPENSE_WEIGHTS)
+            yield {
+                "id": next(budget_id),
+                "name": f"{name} budget",
+                "category_id": category_id(business_id, "expense", index),
+                "amount": round(monthly_spend * share / spec.businesses * rng.uniform(0.8, 1.3), 2),
+                "period": "monthly",
+                "start_date": spec.end_date.replace(day=1),
+                "business_id": business_id,
+            }
+
+
+# Foreign-key order
+TABLES = ["businesses", "categories", "suppliers", "customers", "inventory", "users",
+          "transactions", "transaction_items", "budgets"]
+
+_GENERATORS = {
+    "businesses": businesses, "categories": categories, "suppliers": suppliers,
+    "customers": customers, "inventory": inventory, "users": users,
+    "transactions": transactions, "transaction_items": transaction_items, "budgets": budgets,
+}
+
+
+def generate(spec: DatasetSpec, table: str, **kwargs) -> Iterator[dict]:
+    """Rows of one table; each table has its own seeded stream, so tables can be generated independently"""
+    rng = random.Random(f"{spec.seed}:{table}")
+    return _GENERATORS[table](spec, rng, **kwargs)
+
+
+def chunked(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
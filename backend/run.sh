@@ -8,5 +8,8 @@ export PYTHONPATH=/home/beni/shiny_jar_suite/backend:$PYTHONPATH
 # Activate virtual environment
 source venv/bin/activate
 
+# Apply database migrations
+alembic upgrade head
+
 # Run with correct path
 python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
@@ -1,4 +1,7 @@
 -- Complete Shiny Jar Database Schema
+DROP TABLE IF EXISTS customer_scores CASCADE;
+DROP TABLE IF EXISTS stock_movements CASCADE;
+DROP TABLE IF EXISTS supplier_monthly_totals CASCADE;
 DROP TABLE IF EXISTS transaction_items CASCADE;
 DROP TABLE IF EXISTS transactions CASCADE;
 DROP TABLE IF EXISTS inventory CASCADE;
@@ -7,6 +10,7 @@ DROP TABLE IF EXISTS customers CASCADE;
 DROP TABLE IF EXISTS categories CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
 DROP TABLE IF EXISTS businesses CASCADE;
+DROP TABLE IF EXISTS alembic_version;
 
 -- Core tables
 CREATE TABLE businesses (
@@ -34,7 +38,7 @@ CREATE TABLE categories (
     name VARCHAR(50) NOT NULL,
     type VARCHAR(10) CHECK (type IN ('expense', 'income', 'both')),
     color VARCHAR(7) DEFAULT '#3B82F6',
-    business_id INTEGER REFERENCES businesses(id),
+    business_id INTEGER NOT NULL REFERENCES businesses(id),
     UNIQUE(name, business_id)
 );
 
@@ -47,7 +51,7 @@ CREATE TABLE suppliers (
     website VARCHAR(200),
     address TEXT,
     notes TEXT,
-    business_id INTEGER REFERENCES businesses(id),
+    business_id INTEGER NOT NULL REFERENCES businesses(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -62,7 +66,7 @@ CREATE TABLE customers (
     total_spent DECIMAL(10,2) DEFAULT 0.00,
     last_purchase DATE,
     notes TEXT,
-    business_id INTEGER REFERENCES businesses(id),
+    business_id INTEGER NOT NULL REFERENCES businesses(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -72,17 +76,22 @@ CREATE TABLE inventory (
     description TEXT,
     category VARCHAR(50),
     unit_cost DECIMAL(10,2) NOT NULL,
-    quantity INTEGER DEFAULT 0,
+    quantity INTEGER NOT NULL DEFAULT 0,
     reorder_level INTEGER DEFAULT 10,
     supplier_id INTEGER REFERENCES suppliers(id),
-    business_id INTEGER REFERENCES businesses(id),
+    business_id INTEGER NOT NULL REFERENCES businesses(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Main transactions table with proper foreign keys
+-- Portal logins are linked explicitly to their customer / supplier record
+ALTER TABLE users ADD COLUMN customer_id INTEGER REFERENCES customers(id);
+ALTER TABLE users ADD COLUMN supplier_id INTEGER REFERENCES suppliers(id);
+
+-- Main transactions table with proper foreign keys, range-partitioned by month
+-- (see scripts/partition_transactions.sql for the partition functions)
 CREATE TABLE transactions (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     transaction_date DATE NOT NULL DEFAULT CURRENT_DATE,
     amount DECIMAL(10,2) NOT NULL,
     type VARCHAR(10) NOT NULL CHECK (type IN ('expense', 'income')),
@@ -91,17 +100,78 @@ CREATE TABLE transactions (
     customer_id INTEGER REFERENCES customers(id),
     supplier_id INTEGER REFERENCES suppliers(id),
     user_id INTEGER REFERENCES users(id),
-    business_id INTEGER REFERENCES businesses(id),
+    business_id INTEGER NOT NULL REFERENCES businesses(id),
     payment_method VARCHAR(20),
     reference_number VARCHAR(50),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
--- Transaction items for detailed line items
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
+
+CREATE TABLE transactions_default PARTITION OF transactions DEFAULT;
+
+CREATE OR REPLACE FUNCTION create_transaction_partition(p_month DATE) RETURNS BOOLEAN AS $$
+DECLARE
+    start_date DATE := date_trunc('month', p_month)::date;
+    end_date DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'transactions_y' || to_char(start_date, 'YYYY') || 'm' || to_char(start_date, 'MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+    -- Move the month's rows out of the default partition; they are not being deleted
+    PERFORM set_config('app.moving_transactions', 'on', true);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM transactions_default WHERE transaction_date >= %L AND transaction_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name);
+    PERFORM set_config('app.moving_transactions', 'off', true);
+    EXECUTE format('ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, start_date, end_date);
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Creates every missing monthly partition from p_from through p_to; returns how many
+CREATE OR REPLACE FUNCTION ensure_transaction_partitions(p_from DATE, p_to DATE) RETURNS INTEGER AS $$
+DECLARE
+    month DATE := date_trunc('month', p_from)::date;
+    created INTEGER := 0;
+BEGIN
+    WHILE month <= p_to LOOP
+        IF create_transaction_partition(month) THEN
+            created := created + 1;
+        END IF;
+        month := (month + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION delete_transaction_items() RETURNS TRIGGER AS $$
+BEGIN
+    -- Not a delete: a partition being filled, or an UPDATE that moved the row to another month
+    IF current_setting('app.moving_transactions', true) = 'on'
+       OR EXISTS (SELECT 1 FROM transactions WHERE id = OLD.id) THEN
+        RETURN NULL;
+    END IF;
+    DELETE FROM transaction_items WHERE transaction_id = OLD.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER transactions_delete_items
+    AFTER DELETE ON transactions
+    FOR EACH ROW EXECUTE FUNCTION delete_transaction_items();
+
+SELECT ensure_transaction_partitions('2024-01-01', (CURRENT_DATE + INTERVAL '12 months')::date);
+
+-- Transaction items for detailed line items; deleting a transaction deletes them
+-- through the transactions_delete_items trigger
 CREATE TABLE transaction_items (
     id SERIAL PRIMARY KEY,
-    transaction_id INTEGER REFERENCES transactions(id) ON DELETE CASCADE,
+    transaction_id INTEGER,
     inventory_id INTEGER REFERENCES inventory(id),
     description VARCHAR(200),
     quantity INTEGER NOT NULL DEFAULT 1,
@@ -118,11 +188,88 @@ CREATE TABLE budgets (
     period VARCHAR(20) CHECK (period IN ('daily', 'weekly', 'monthly', 'quarterly', 'yearly')),
     start_date DATE NOT NULL,
     end_date DATE,
-    business_id INTEGER REFERENCES businesses(id),
+    business_id INTEGER NOT NULL REFERENCES businesses(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(category_id, period, business_id)
 );
 
+-- RFM and churn-risk scores per customer, rewritten by the score refresh
+CREATE TABLE customer_scores (
+    customer_id INTEGER PRIMARY KEY REFERENCES customers(id) ON DELETE CASCADE,
+    first_purchase DATE NOT NULL,
+    last_purchase DATE NOT NULL,
+    frequency INTEGER NOT NULL,
+    monetary FLOAT NOT NULL,
+    recency_score INTEGER NOT NULL,
+    frequency_score INTEGER NOT NULL,
+    monetary_score INTEGER NOT NULL,
+    rfm_score INTEGER NOT NULL,
+    band VARCHAR(20) NOT NULL,
+    churn_risk FLOAT NOT NULL,
+    churn_band VARCHAR(10) NOT NULL,
+    changes_through TIMESTAMP,
+    scored_at TIMESTAMP NOT NULL,
+    business_id INTEGER NOT NULL REFERENCES businesses(id)
+);
+
+CREATE TABLE stock_movements (
+    id SERIAL PRIMARY KEY,
+    inventory_id INTEGER NOT NULL REFERENCES inventory(id) ON DELETE CASCADE,
+    supplier_id INTEGER REFERENCES suppliers(id) ON DELETE SET NULL,
+    quantity INTEGER NOT NULL,
+    unit_cost FLOAT,
+    reference VARCHAR(50),
+    notes TEXT,
+    transaction_id INTEGER,
+    lag_days INTEGER,
+    received_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    business_id INTEGER NOT NULL REFERENCES businesses(id)
+);
+
+-- Expenses per supplier and month for the supplier portal, kept current by a
+-- trigger on every expense write (partition moves are not writes)
+CREATE TABLE supplier_monthly_totals (
+    supplier_id INTEGER NOT NULL REFERENCES suppliers(id) ON DELETE CASCADE,
+    month DATE NOT NULL,
+    total DECIMAL(12,2) NOT NULL DEFAULT 0,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    business_id INTEGER NOT NULL REFERENCES businesses(id),
+    -- business_id leads the key: a row per business the expenses were booked
+    -- under, and the tenant filter is the key's prefix
+    PRIMARY KEY (business_id, supplier_id, month)
+);
+
+CREATE OR REPLACE FUNCTION add_supplier_monthly_total(p_supplier INTEGER, p_business INTEGER, p_date DATE,
+                                                      p_amount NUMERIC, p_orders INTEGER) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO supplier_monthly_totals AS totals (supplier_id, month, total, order_count, business_id)
+    VALUES (p_supplier, date_trunc('month', p_date)::date, p_amount, p_orders, p_business)
+    ON CONFLICT (business_id, supplier_id, month) DO UPDATE
+        SET total = totals.total + EXCLUDED.total,
+            order_count = totals.order_count + EXCLUDED.order_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_supplier_monthly_totals() RETURNS TRIGGER AS $$
+BEGIN
+    -- A partition being filled moves rows, it does not add or remove expenses
+    IF current_setting('app.moving_transactions', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.type = 'expense' AND OLD.supplier_id IS NOT NULL THEN
+        PERFORM add_supplier_monthly_total(OLD.supplier_id, OLD.business_id, OLD.transaction_date, -OLD.amount, -1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.type = 'expense' AND NEW.supplier_id IS NOT NULL THEN
+        PERFORM add_supplier_monthly_total(NEW.supplier_id, NEW.business_id, NEW.transaction_date, NEW.amount, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER transactions_supplier_monthly_totals
+    AFTER INSERT OR DELETE OR UPDATE OF type, supplier_id, amount, transaction_date, business_id ON transactions
+    FOR EACH ROW EXECUTE FUNCTION maintain_supplier_monthly_totals();
+
 -- Insert Shiny Jar business
 INSERT INTO businesses (name, instagram_handle, currency) 
 VALUES ('Shiny Jar', 'shiny_jar', 'EUR');
@@ -247,12 +394,31 @@ INSERT INTO budgets (name, category_id, amount, period, start_date, end_date, bu
 ('Yearly Website Budget', 6, 1200.00, 'yearly', '2024-01-01', '2024-12-31', 1);
 
 -- Create indexes for performance
-CREATE INDEX idx_transactions_date ON transactions(transaction_date);
-CREATE INDEX idx_transactions_customer ON transactions(customer_id);
-CREATE INDEX idx_transactions_supplier ON transactions(supplier_id);
-CREATE INDEX idx_transactions_type ON transactions(type);
+CREATE INDEX idx_transactions_date ON transactions USING brin (transaction_date);
+CREATE INDEX idx_transaction_items_transaction ON transaction_items(transaction_id);
+CREATE INDEX idx_transactions_customer_type_date ON transactions(customer_id, type, transaction_date) INCLUDE (amount, business_id);
+CREATE INDEX idx_transactions_supplier_type_date ON transactions(supplier_id, type, transaction_date) INCLUDE (amount, business_id);
+CREATE INDEX idx_transactions_business_type_date ON transactions(business_id, type, transaction_date) INCLUDE (amount, category_id);
+CREATE INDEX idx_transactions_business_type_category_date ON transactions(business_id, type, category_id, transaction_date) INCLUDE (amount);
+CREATE INDEX idx_transactions_business_updated ON transactions(business_id, updated_at) INCLUDE (customer_id, type);
+CREATE INDEX idx_customers_business_total_spent ON customers(business_id, total_spent);
 CREATE INDEX idx_customers_instagram ON customers(instagram_handle);
 CREATE INDEX idx_customers_email ON customers(email);
+CREATE INDEX idx_categories_business ON categories(business_id);
+CREATE INDEX idx_suppliers_business_name ON suppliers(business_id, name);
+CREATE INDEX idx_budgets_business ON budgets(business_id);
+CREATE INDEX idx_inventory_business_category_name ON inventory(business_id, category, name);
+CREATE INDEX idx_inventory_business_quantity ON inventory(business_id, quantity, id);
+CREATE INDEX idx_inventory_supplier ON inventory(supplier_id);
+CREATE INDEX idx_users_customer ON users(customer_id);
+CREATE INDEX idx_users_supplier ON users(supplier_id);
+CREATE INDEX idx_customer_scores_business_score ON customer_scores(business_id, rfm_score, customer_id);
+CREATE INDEX idx_stock_movements_business_supplier ON stock_movements(business_id, supplier_id);
+CREATE INDEX idx_stock_movements_inventory ON stock_movements(inventory_id);
+
+-- This schema matches the latest Alembic revision (backend/alembic/versions)
+CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY);
+INSERT INTO alembic_version (version_num) VALUES ('0009');
 
 SELECT '✅ Database initialized with complete business schema!' as status;
 
@@ -0,0 +1,29 @@
+-- Link existing portal logins to their customer / supplier record.
+-- Replaces the per-login email / ILIKE name matching in the backend.
+-- alembic upgrade head does the same (revision 0007); keep the two in sync.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS customer_id INTEGER REFERENCES customers(id);
+ALTER TABLE users ADD COLUMN IF NOT EXISTS supplier_id INTEGER REFERENCES suppliers(id);
+
+-- Same matching rules the login endpoints used: email first, then name
+UPDATE users u
+SET customer_id = (
+    SELECT c.id FROM customers c
+    WHERE c.email = u.email OR c.name ILIKE '%' || u.full_name || '%'
+    ORDER BY (c.email = u.email) DESC NULLS LAST, c.id
+    LIMIT 1
+)
+WHERE u.role = 'customer' AND u.customer_id IS NULL;
+
+UPDATE users u
+SET supplier_id = (
+    SELECT s.id FROM suppliers s
+    WHERE s.email = u.email OR s.contact_person ILIKE '%' || u.full_name || '%'
+    ORDER BY (s.email = u.email) DESC NULLS LAST, s.id
+    LIMIT 1
+)
+WHERE u.role = 'supplier' AND u.supplier_id IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_users_customer ON users(customer_id);
+CREATE INDEX IF NOT EXISTS idx_users_supplier ON users(supplier_id);
+
+SELECT username, role, customer_id, supplier_id FROM users ORDER BY id;
@@ -0,0 +1,152 @@
+-- Convert transactions into a table range-partitioned by month on transaction_date.
+-- init.sql already creates this layout; run this once against an existing database
+-- (including one restored from shinyjar_db.sql):
+--   docker-compose exec -T postgres psql -U shinyjar -d shinyjar_db -v ON_ERROR_STOP=1 \
+--       < backend/scripts/partition_transactions.sql
+-- Needs PostgreSQL 12+. transactions is locked for the duration of the copy.
+--
+-- Partitions are named transactions_yYYYYmMM. Rows for a month without a partition
+-- land in transactions_default and are moved out when that month's partition is
+-- created, which the backend does at startup and daily (PARTITION_MONTHS_AHEAD).
+BEGIN;
+
+-- The secondary indexes are rebuilt on the partitioned table as they are now, so
+-- the script keeps whatever set the database's alembic revision built. The date
+-- index is re-created as BRIN below.
+CREATE TEMP TABLE transaction_indexes ON COMMIT DROP AS
+SELECT i.relname AS name, pg_get_indexdef(x.indexrelid) AS definition
+FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+WHERE x.indrelid = 'transactions'::regclass
+  AND NOT x.indisprimary
+  AND i.relname <> 'idx_transactions_date';
+
+ALTER TABLE transactions RENAME TO transactions_unpartitioned;
+ALTER INDEX transactions_pkey RENAME TO transactions_unpartitioned_pkey;
+DROP INDEX IF EXISTS idx_transactions_date;
+DO $$
+DECLARE
+    idx RECORD;
+BEGIN
+    FOR idx IN SELECT name FROM transaction_indexes LOOP
+        EXECUTE format('DROP INDEX %I', idx.name);
+    END LOOP;
+END $$;
+
+-- A foreign key can only reference a unique key of a partitioned table that includes
+-- the partition column, so transaction_items keeps its ON DELETE CASCADE as a trigger
+ALTER TABLE transaction_items DROP CONSTRAINT IF EXISTS transaction_items_transaction_id_fkey;
+
+CREATE TABLE transactions (
+    LIKE transactions_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    PRIMARY KEY (id, transaction_date),
+    FOREIGN KEY (category_id) REFERENCES categories(id),
+    FOREIGN KEY (customer_id) REFERENCES customers(id),
+    FOREIGN KEY (supplier_id) REFERENCES suppliers(id),
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (business_id) REFERENCES businesses(id)
+) PARTITION BY RANGE (transaction_date);
+ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id;
+
+CREATE TABLE transactions_default PARTITION OF transactions DEFAULT;
+
+-- Keep in sync with init.sql
+CREATE OR REPLACE FUNCTION create_transaction_partition(p_month DATE) RETURNS BOOLEAN AS $$
+DECLARE
+    start_date DATE := date_trunc('month', p_month)::date;
+    end_date DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'transactions_y' || to_char(start_date, 'YYYY') || 'm' || to_char(start_date, 'MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+    -- Move the month's rows out of the default partition; they are not being deleted
+    PERFORM set_config('app.moving_transactions', 'on', true);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM transactions_default WHERE transaction_date >= %L AND transaction_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name);
+    PERFORM set_config('app.moving_transactions', 'off', true);
+    EXECUTE format('ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, start_date, end_date);
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Creates every missing monthly partition from p_from through p_to; returns how many
+CREATE OR REPLACE FUNCTION ensure_transaction_partitions(p_from DATE, p_to DATE) RETURNS INTEGER AS $$
+DECLARE
+    month DATE := date_trunc('month', p_from)::date;
+    created INTEGER := 0;
+BEGIN
+    WHILE month <= p_to LOOP
+        IF create_transaction_partition(month) THEN
+            created := created + 1;
+        END IF;
+        month := (month + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION delete_transaction_items() RETURNS TRIGGER AS $$
+BEGIN
+    -- Not a delete: a partition being filled, or an UPDATE that moved the row to another month
+    IF current_setting('app.moving_transactions', true) = 'on'
+       OR EXISTS (SELECT 1 FROM transactions WHERE id = OLD.id) THEN
+        RETURN NULL;
+    END IF;
+    DELETE FROM transaction_items WHERE transaction_id = OLD.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER transactions_delete_items
+    AFTER DELETE ON transactions
+    FOR EACH ROW EXECUTE FUNCTION delete_transaction_items();
+
+-- One partition per month of history, plus a year ahead
+SELECT ensure_transaction_partitions(
+    COALESCE((SELECT MIN(transaction_date) FROM transactions_unpartitioned), CURRENT_DATE),
+    GREATEST((SELECT MAX(transaction_date) FROM transactions_unpartitioned), (CURRENT_DATE + INTERVAL '12 months')::date)
+) AS partitions_created;
+
+INSERT INTO transactions SELECT * FROM transactions_unpartitioned;
+
+-- Databases at alembic revision 0006 or later keep supplier_monthly_totals current with
+-- a trigger; it went with the old table. Re-created after the copy, which moves
+-- expenses rather than adding them.
+DO $$
+BEGIN
+    IF to_regproc('maintain_supplier_monthly_totals') IS NOT NULL THEN
+        CREATE TRIGGER transactions_supplier_monthly_totals
+            AFTER INSERT OR DELETE OR UPDATE OF type, supplier_id, amount, transaction_date, business_id ON transactions
+            FOR EACH ROW EXECUTE FUNCTION maintain_supplier_monthly_totals();
+    END IF;
+END $$;
+
+-- Indexes on the parent are created on every partition, present and future.
+-- Rows are appended roughly in date order, so a BRIN index answers date ranges
+-- inside a partition at a fraction of a btree's size.
+CREATE INDEX idx_transactions_date ON transactions USING brin (transaction_date);
+DO $$
+DECLARE
+    idx RECORD;
+BEGIN
+    -- The definitions name the table "transactions", now the partitioned one
+    FOR idx IN SELECT definition FROM transaction_indexes LOOP
+        EXECUTE idx.definition;
+    END LOOP;
+END $$;
+CREATE INDEX IF NOT EXISTS idx_transaction_items_transaction ON transaction_items(transaction_id);
+
+DROP TABLE transactions_unpartitioned;
+
+COMMIT;
+
+ANALYZE transactions;
+
+SELECT inhrelid::regclass AS partition, pg_get_expr(c.relpartbound, c.oid) AS bounds
+FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+WHERE inhparent = 'transactions'::regclass
+ORDER BY 1;
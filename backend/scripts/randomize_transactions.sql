@@ -1,4 +1,4 @@
-INSERT INTO transactions (transaction_date, amount, type, category_id, description, customer_id, payment_method)
+INSERT INTO transactions (transaction_date, amount, type, category_id, description, customer_id, payment_method, business_id)
 SELECT 
     -- Generates a random date within the last 730 days (approx. 2 years)
     CURRENT_DATE - (random() * 730)::int AS transaction_date,
@@ -8,7 +8,9 @@ SELECT
     (ARRAY[9, 10, 11, 12, 13])[floor(random() * 5 + 1)] AS category_id,
     'Randomized Transaction' AS description,
     cust_id AS customer_id,
-    (ARRAY['card', 'paypal', 'bank_transfer', 'stripe'])[floor(random() * 4 + 1)] AS payment_method
+    (ARRAY['card', 'paypal', 'bank_transfer', 'stripe'])[floor(random() * 4 + 1)] AS payment_method,
+    -- Categories 9-13 are Shiny Jar's (business 1)
+    1 AS business_id
 FROM 
     -- Specifies the target customer IDs
     unnest(ARRAY[2, 3, 4]) AS cust_id,
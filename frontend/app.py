@@ -5,8 +5,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 import requests
 from datetime import datetime, timedelta
+from collections import deque
+import importlib
+import sys
 import time
 
+SCRIPT_STARTED = time.perf_counter()
+
 # ========== PAGE CONFIG (MUST BE FIRST) ==========
 st.set_page_config(
     page_title="Shiny Jar CRM | Jewelry Business Suite",
@@ -35,156 +40,55 @@ except ImportError as e:
     auth = DummyAuth()
     show_login_page = lambda: st.info("Login system loading...")
 
-# ========== IMPORT PAGES ==========
-# Initialize all page variables first with safe defaults
-show_budget_page = None
-show_suppliers_page = None
-show_analytics_page = None
-show_reports_page = None
-show_inventory_page = None
-generate_inventory_report = None
-
-# Customer page functions
-show_customer_dashboard = None
-show_customer_orders = None
-show_customer_invoices = None
-show_customer_profile = None
-
-# Supplier page functions  
-show_supplier_dashboard = None
-show_supplier_orders = None
-show_supplier_products = None
-show_supplier_payments = None
-show_supplier_profile = None
-
-# Page availability flags - ADD THESE!
-CUSTOMER_PAGES_AVAILABLE = False
-SUPPLIER_PAGES_AVAILABLE = False
-INVENTORY_AVAILABLE = False
-PAGES_AVAILABLE = False
-
-# Try to import with error handling
-try:
-    from pages.budget import show_budget_page           #, show_budget_alerts, show_budget_analysis, show_budget_overview, show_create_budget
-    from pages.suppliers import show_suppliers_page     #, show_add_supplier, show_all_suppliers, show_purchase_history, show_supplier_performance
-    from pages.analytics import show_analytics_page     #, show_business_intelligence, show_customer_insights, show_profit_analysis, show_sales_forecasting
-    from pages.reports import show_reports_page         #, show_custom_reports, show_customer_reports, show_financial_reports, show_supplier_reports
-    # from pages.inventory import show_inventory_page, generate_inventory_report
-    INVENTORY_AVAILABLE = True
-    PAGES_AVAILABLE = True
-except ImportError as e:
-    st.warning(f"⚠️ Some admin pages not available: {str(e)}")
-    PAGES_AVAILABLE = False
-    INVENTORY_AVAILABLE = False
-    
-    # Create fallback functions
-    def show_budget_page(): 
-        st.info("💰 Budget Management")
-    
-    def show_suppliers_page(): 
-        st.info("🏭 Supplier Management")
-    
-    def show_analytics_page(): 
-        st.info("📈 Advanced Analytics")
-    
-    def show_reports_page(): 
-        st.info("📊 Professional Reports")
-    
-    def show_inventory_page(): 
-        st.info("📦 Inventory Management")
-    
-    def generate_inventory_report(): 
-        st.info("📄 Inventory Reports")
-
-# Try to import customer dashboard - UPDATE THIS SECTION:
-try:
-    from pages.customer_dashboard import show_customer_dashboard
-    CUSTOMER_PAGES_AVAILABLE = True
-except ImportError:
-    CUSTOMER_PAGES_AVAILABLE = False
-    def show_customer_dashboard(): 
-        st.info("👤 Customer Dashboard")
-        
-try:
-    from pages.customer_dashboard import display_customer_real_data
-    CUSTOMER_PAGES_AVAILABLE = True
-except ImportError:
-    CUSTOMER_PAGES_AVAILABLE = False
-    def display_customer_real_data(): 
-        st.info("👤 Customer Data")
-        
-try:
-    from pages.customer_dashboard import show_customer_demo_dashboard
-    CUSTOMER_PAGES_AVAILABLE = True
-except ImportError:
-    CUSTOMER_PAGES_AVAILABLE = False
-    def show_customer_demo_dashboard(): 
-        st.info("👤 Customer Demo Dashboard")
-
-try:
-    from pages.customer_dashboard import show_customer_orders
-    CUSTOMER_PAGES_AVAILABLE = CUSTOMER_PAGES_AVAILABLE or True
-except ImportError:
-    CUSTOMER_PAGES_AVAILABLE = CUSTOMER_PAGES_AVAILABLE or False
-    def show_customer_orders(): 
-        st.info("🛍️ Customer Orders")
-
-try:
-    from pages.customer_dashboard import show_customer_invoices
-    CUSTOMER_PAGES_AVAILABLE = CUSTOMER_PAGES_AVAILABLE or True
-except ImportError:
-    CUSTOMER_PAGES_AVAILABLE = CUSTOMER_PAGES_AVAILABLE or False
-    def show_customer_invoices(): 
-        st.info("💳 Customer Invoices")
-
-try:
-    from pages.customer_dashboard import show_customer_profile
-    CUSTOMER_PAGES_AVAILABLE = CUSTOMER_PAGES_AVAILABLE or True
-except ImportError:
-    CUSTOMER_PAGES_AVAILABLE = CUSTOMER_PAGES_AVAILABLE or False
-    def show_customer_profile(): 
-        st.info("👤 Customer Profile")
-
-# Try to import supplier dashboard - UPDATE THIS SECTION:
-try:
-    from pages.supplier_dashboard import show_supplier_dashboard
-    SUPPLIER_PAGES_AVAILABLE = True
-except ImportError:
-    SUPPLIER_PAGES_AVAILABLE = False
-    def show_supplier_dashboard(): 
-        st.info("🏭 Supplier Dashboard")
-
-try:
-    from pages.supplier_dashboard import show_supplier_orders
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or True
-except ImportError:
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or False
-    def show_supplier_orders(): 
-        st.info("📦 Supplier Orders")
-
-try:
-    from pages.supplier_dashboard import show_supplier_products
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or True
-except ImportError:
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or False
-    def show_supplier_products(): 
-        st.info("📋 Supplier Products")
+# ========== LAZY PAGE LOADING ==========
+# Page modules are imported the first time someone navigates to them, not on
+# every script run: a session only pays for the pages it opens. Imported
+# modules stay in sys.modules, so later reruns reuse them. Routes are listed
+# in PAGE_ROUTES below main_app; each is either a function in this file or a
+# (module, function, placeholder) tuple that load_page resolves.
 
-try:
-    from pages.supplier_dashboard import show_supplier_payments
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or True
-except ImportError:
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or False
-    def show_supplier_payments(): 
-        st.info("💰 Supplier Payments")
-
-try:
-    from pages.supplier_dashboard import show_supplier_profile
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or True
-except ImportError:
-    SUPPLIER_PAGES_AVAILABLE = SUPPLIER_PAGES_AVAILABLE or False
-    def show_supplier_profile(): 
-        st.info("🏢 Supplier Profile")
+def load_page(module_name, function_name, placeholder):
+    """Import a page module on first use and return its page function;
+    a placeholder page when the module is not available"""
+    try:
+        return getattr(importlib.import_module(module_name), function_name)
+    except (ImportError, AttributeError) as e:
+        def show_placeholder():
+            st.warning(f"⚠️ Page not available: {str(e)}")
+            st.info(placeholder)
+        return show_placeholder
+
+@st.cache_resource
+def page_timings():
+    """Render times per page for this server process, shared by all sessions"""
+    return {}
+
+def record_page_timing(page, elapsed_ms, import_ms=None):
+    """The first render of a page in the process is its cold cost (module import,
+    first API calls); later renders are warm reruns"""
+    timings = page_timings()
+    entry = timings.get(page)
+    if entry is None:
+        timings[page] = {"cold_ms": elapsed_ms, "import_ms": import_ms, "warm_ms": deque(maxlen=50)}
+    else:
+        entry["warm_ms"].append(elapsed_ms)
+
+def show_page_timings():
+    """Sidebar report of the cold and warm render cost per page"""
+    rows = []
+    for page, entry in sorted(page_timings().items()):
+        warm = sorted(entry["warm_ms"])
+        rows.append({
+            "Page": page,
+            "Cold (ms)": round(entry["cold_ms"], 1),
+            "Import (ms)": round(entry["import_ms"], 1) if entry["import_ms"] is not None else None,
+            "Warm median (ms)": round(warm[len(warm) // 2], 1) if warm else None,
+            "Warm runs": len(warm),
+        })
+    if rows:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    else:
+        st.caption("No pages rendered yet")
 
 # ========== DARK MODERN STYLES ==========
 def apply_dark_theme():
@@ -1314,11 +1218,15 @@ def show_all_transactions():
             headers = auth.get_auth_header()
             api_url = st.session_state.api_url
             
-            # Get all transactions first
+            # Date range is applied by the API; type and name filters below
             response = requests.get(
                 f"{api_url}/api/transactions",
                 headers=headers,
-                params={"limit": 1000},  # Get more for filtering
+                params={
+                    "limit": 1000,  # Get more for filtering
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat()
+                },
                 timeout=10
             )
             
@@ -1737,45 +1645,10 @@ def show_add_supplier_form():
 
 
 def show_supplier_analytics():
-    """Supplier analytics and performance"""
-    st.subheader("📊 Supplier Analytics")
-    st.info("Supplier performance metrics and analytics coming soon!")
-    
-    # Placeholder for now
-    st.write("""
-    ### 📈 Planned Analytics:
-    
-    - **Supplier Performance Ratings**
-    - **Order Frequency & Volume**
-    - **Delivery Time Analysis**
-    - **Cost Comparison**
-    - **Quality Ratings**
-    - **Payment Terms Analysis**
-    """)
-    
-    # Quick stats if available
-    try:
-        headers = auth.get_auth_header()
-        response = requests.get(
-            f"{st.session_state.api_url}/api/suppliers",
-            headers=headers,
-            timeout=5
-        )
-        
-        if response.status_code == 200:
-            suppliers = response.json()
-            if suppliers:
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Total Suppliers", len(suppliers))
-                with col2:
-                    with_contact = sum(1 for s in suppliers if s.get('contact_person'))
-                    st.metric("With Contact", with_contact)
-                with col3:
-                    with_email = sum(1 for s in suppliers if s.get('email'))
-                    st.metric("With Email", with_email)
-    except:
-        pass
+    """Supplier scorecard: spend, order frequency, items supplied and lead times"""
+    # Shared with pages/suppliers.py; imported on first use like the page modules
+    from pages.suppliers import show_supplier_performance
+    show_supplier_performance(st.session_state.api_url, headers=auth.get_auth_header())
 
 
 def show_supplier_details(supplier_id):
@@ -1811,7 +1684,8 @@ def show_supplier_details(supplier_id):
                 st.metric("Total Revenue", f"€{stats.get('total_revenue', 0):,.2f}")
                 st.metric("Order Count", stats.get('order_count', 0))
                 st.metric("Avg Order", f"€{stats.get('avg_order_value', 0):,.2f}")
-                st.metric("Rating", f"{stats.get('rating', 0)}/5")
+                lead_days = stats.get('avg_lead_days')
+                st.metric("Avg Lead Time", f"{lead_days:.1f} days" if lead_days is not None else "N/A")
         
         else:
             # Fallback to basic supplier info
@@ -2108,6 +1982,8 @@ def show_inventory_dashboard():
         st.info("Make sure backend is running and inventory endpoints are available")
 
 
+INVENTORY_PAGE_SIZE = 100
+
 def show_all_inventory_items():
     """Display all inventory items with search and filters - FIXED VERSION"""
     st.subheader("📋 All Inventory Items")
@@ -2132,15 +2008,34 @@ def show_all_inventory_items():
         if st.button("🔄 Refresh", use_container_width=True, key="inv_refresh"):
             st.rerun()
     
+    # Filters, search and paging are evaluated by the backend in SQL
+    params = {"limit": INVENTORY_PAGE_SIZE}
+    if search_query:
+        params["q"] = search_query
+    if category_filter != "All":
+        params["category"] = category_filter
+    if status_filter != "All":
+        params["status"] = {"In Stock": "in", "Low Stock": "low", "Out of Stock": "out"}[status_filter]
+    
+    # Reset to the first page whenever the filters change
+    filter_key = (search_query, category_filter, status_filter)
+    if st.session_state.get("inv_filter_key") != filter_key:
+        st.session_state.inv_filter_key = filter_key
+        st.session_state.inv_cursors = [None]
+    if st.session_state.inv_cursors[-1]:
+        params["cursor"] = st.session_state.inv_cursors[-1]
+    
     try:
         headers = auth.get_auth_header()
         api_url = st.session_state.api_url
         
         with st.spinner("🔄 Loading inventory..."):
-            response = requests.get(f"{api_url}/api/inventory", headers=headers, timeout=10)
+            response = requests.get(f"{api_url}/api/inventory", headers=headers,
+                                    params=params, timeout=10)
             
             if response.status_code == 200:
                 inventory_items = response.json()
+                next_cursor = response.headers.get("X-Next-Cursor")
                 
                 # DEBUG: Show what we get
                 with st.expander("🔍 Debug: First Item", expanded=False):
@@ -2185,28 +2080,9 @@ def show_all_inventory_items():
                             "Last Updated": item.get('updated_at', '')[:10] if item.get('updated_at') else ''
                         })
                     
-                    # Apply filters
+                    # Already filtered by the backend
                     filtered_items = display_items
                     
-                    if search_query:
-                        filtered_items = [item for item in filtered_items 
-                                        if search_query.lower() in item['Name'].lower() 
-                                        or search_query.lower() in item['Category'].lower()
-                                        or search_query.lower() in item['Supplier'].lower()]
-                    
-                    if category_filter != "All":
-                        filtered_items = [item for item in filtered_items 
-                                        if item['Category'] == category_filter]
-                    
-                    if status_filter != "All":
-                        status_map = {
-                            "In Stock": "🟢 In Stock",
-                            "Low Stock": "🟡 Low Stock", 
-                            "Out of Stock": "🔴 Out of Stock"
-                        }
-                        filtered_items = [item for item in filtered_items 
-                                        if item['Status'] == status_map[status_filter]]
-                    
                     if filtered_items:
                         # Create DataFrame
                         df = pd.DataFrame(filtered_items)
@@ -2227,6 +2103,21 @@ def show_all_inventory_items():
                             }
                         )
                         
+                        # Pager
+                        page_col1, page_col2, page_col3 = st.columns([1, 2, 1])
+                        with page_col1:
+                            if st.button("⬅️ Previous", use_container_width=True, key="inv_prev_page",
+                                         disabled=len(st.session_state.inv_cursors) <= 1):
+                                st.session_state.inv_cursors.pop()
+                                st.rerun()
+                        with page_col2:
+                            st.caption(f"Page {len(st.session_state.inv_cursors)}")
+                        with page_col3:
+                            if st.button("Next ➡️", use_container_width=True, key="inv_next_page",
+                                         disabled=not next_cursor):
+                                st.session_state.inv_cursors.append(next_cursor)
+                                st.rerun()
+                        
                         # Item actions - REMOVE DUPLICATE BUTTON ISSUE
                         st.subheader("🛠️ Item Actions")
                         
@@ -2328,11 +2219,9 @@ def get_inventory_categories():
     """Get unique inventory categories"""
     try:
         headers = auth.get_auth_header()
-        response = requests.get(f"{st.session_state.api_url}/api/inventory", headers=headers, timeout=5)
+        response = requests.get(f"{st.session_state.api_url}/api/inventory/categories", headers=headers, timeout=5)
         if response.status_code == 200:
-            items = response.json()
-            categories = set(item.get('category', '') for item in items if item.get('category'))
-            return sorted(list(categories))
+            return response.json()
     except:
         pass
     return []
@@ -3023,91 +2912,35 @@ def main_app():
             if st.button("Update URL", use_container_width=True):
                 st.session_state.api_url = new_url
                 st.success("URL updated!")
-    
+
+        # Cold (first render in this server process) and warm (rerun) cost per page
+        if user_role not in ("customer", "supplier"):
+            with st.expander("⏱️ Page timings"):
+                show_page_timings()
+
     # ========== MAIN CONTENT ==========
     
     current_page = st.session_state.page
     
     # Route to appropriate page based on role
-    if user_role == "customer":
-        if current_page == "My Dashboard":
-            if CUSTOMER_PAGES_AVAILABLE:
-                show_customer_dashboard()
-            else:
-                st.info("👤 Customer Dashboard - Page module not loaded")
-        elif current_page == "My Orders":
-            if CUSTOMER_PAGES_AVAILABLE:
-                show_customer_orders()
-            else:
-                st.info("🛍️ Customer Orders - Page module not loaded")
-        elif current_page == "My Invoices":
-            if CUSTOMER_PAGES_AVAILABLE:
-                show_customer_invoices()
-            else:
-                st.info("💳 Customer Invoices - Page module not loaded")
-        elif current_page == "My Profile":
-            if CUSTOMER_PAGES_AVAILABLE:
-                show_customer_profile()
-            else:
-                st.info("👤 Customer Profile - Page module not loaded")
-    
-    elif user_role == "supplier":
-        if current_page == "My Dashboard":
-            if SUPPLIER_PAGES_AVAILABLE:
-                show_supplier_dashboard()
-            else:
-                st.info("🏭 Supplier Dashboard - Page module not loaded")
-        elif current_page == "My Orders":
-            if SUPPLIER_PAGES_AVAILABLE:
-                show_supplier_orders()
-            else:
-                st.info("📦 Supplier Orders - Page module not loaded")
-        elif current_page == "My Products":
-            if SUPPLIER_PAGES_AVAILABLE:
-                show_supplier_products()
-            else:
-                st.info("📋 Supplier Products - Page module not loaded")
-        elif current_page == "My Payments":
-            if SUPPLIER_PAGES_AVAILABLE:
-                show_supplier_payments()
-            else:
-                st.info("💰 Supplier Payments - Page module not loaded")
-        elif current_page == "My Profile":
-            if SUPPLIER_PAGES_AVAILABLE:
-                show_supplier_profile()
-            else:
-                st.info("🏢 Supplier Profile - Page module not loaded")
-    
-    
-    else:  # admin/demo user
-        if current_page == "Dashboard":
-            show_dashboard()
-        elif current_page == "Expenses":
-            show_expenses_page()
-        elif current_page == "Customers":
-            show_customers_page()
-        elif current_page == "Suppliers":
-            show_suppliers_page()
-        elif current_page == "Inventory":
-            if INVENTORY_AVAILABLE:
-                show_inventory_page()
-            else:
-                st.info("📦 Inventory Management")
-        elif current_page == "Budget":
-            if PAGES_AVAILABLE:
-                show_budget_page()
-            else:
-                st.info("📋 Budget Management")
-        elif current_page == "Analytics":
-            if PAGES_AVAILABLE:
-                show_analytics_page()
-            else:
-                st.info("📈 Advanced Analytics")
-        elif current_page == "Reports":
-            if PAGES_AVAILABLE:
-                show_reports_page()
-            else:
-                st.info("📊 Professional Reports")
+    routes = PAGE_ROUTES.get(user_role, PAGE_ROUTES["admin"])
+    if current_page in routes:
+        render_page(current_page, routes[current_page])
+
+def render_page(page, route):
+    """Render a page, importing its module on first navigation, and record the render time"""
+    started = time.perf_counter()
+    import_ms = None
+    if callable(route):
+        show = route
+    else:
+        module_name = route[0]
+        cold_import = module_name not in sys.modules
+        show = load_page(*route)
+        if cold_import:
+            import_ms = (time.perf_counter() - started) * 1000
+    show()
+    record_page_timing(page, (time.perf_counter() - started) * 1000, import_ms)
 
 def show_customer_demo_dashboard():
     """Demo customer dashboard"""
@@ -3161,9 +2994,39 @@ def show_supplier_demo_dashboard():
     
     st.dataframe(orders, use_container_width=True, hide_index=True)
 
+# ========== PAGE ROUTES ==========
+# Functions are pages defined in this file; tuples are page modules imported
+# on first navigation
+PAGE_ROUTES = {
+    "customer": {
+        "My Dashboard": ("pages.customer_dashboard", "show_customer_dashboard", "👤 Customer Dashboard - Page module not loaded"),
+        "My Orders": ("pages.customer_dashboard", "show_customer_orders", "🛍️ Customer Orders - Page module not loaded"),
+        "My Invoices": ("pages.customer_dashboard", "show_customer_invoices", "💳 Customer Invoices - Page module not loaded"),
+        "My Profile": ("pages.customer_dashboard", "show_customer_profile", "👤 Customer Profile - Page module not loaded"),
+    },
+    "supplier": {
+        "My Dashboard": ("pages.supplier_dashboard", "show_supplier_dashboard", "🏭 Supplier Dashboard - Page module not loaded"),
+        "My Orders": ("pages.supplier_dashboard", "show_supplier_orders", "📦 Supplier Orders - Page module not loaded"),
+        "My Products": ("pages.supplier_dashboard", "show_supplier_products", "📋 Supplier Products - Page module not loaded"),
+        "My Payments": ("pages.supplier_dashboard", "show_supplier_payments", "💰 Supplier Payments - Page module not loaded"),
+        "My Profile": ("pages.supplier_dashboard", "show_supplier_profile", "🏢 Supplier Profile - Page module not loaded"),
+    },
+    "admin": {
+        "Dashboard": show_dashboard,
+        "Expenses": show_expenses_page,
+        "Customers": show_customers_page,
+        "Suppliers": show_suppliers_page,
+        "Inventory": show_inventory_page,
+        "Budget": ("pages.budget", "show_budget_page", "📋 Budget Management"),
+        "Analytics": ("pages.analytics", "show_analytics_page", "📈 Advanced Analytics"),
+        "Reports": ("pages.reports", "show_reports_page", "📊 Professional Reports"),
+    },
+}
+
 # ========== MAIN EXECUTION ==========
 if __name__ == "__main__":
     if AUTH_AVAILABLE and not auth.is_authenticated():
         show_login_page()
     else:
         main_app()
+    record_page_timing("(script run)", (time.perf_counter() - SCRIPT_STARTED) * 1000)
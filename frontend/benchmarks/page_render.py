@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Streamlit cold and warm render cost per page.
+
+Each page is rendered in a fresh interpreter with Streamlit's AppTest: the
+first run is the cold cost (importing app.py's dependencies, the page module
+on first navigation, first API calls), the reruns that follow are the warm
+cost a user pays on every interaction. The login page is measured the same
+way, so the startup cost of a session that has not signed in yet shows too.
+
+The pages call the backend at --api-url; without a running backend they take
+their demo/error paths, which still measures the import and render cost.
+
+Usage:
+    python frontend/benchmarks/page_render.py --reruns 5
+    python frontend/benchmarks/page_render.py --role admin --page Analytics --json render.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+frontend_dir = os.path.dirname(current_dir)
+
+PAGES = {
+    "admin": ["Dashboard", "Expenses", "Customers", "Suppliers", "Inventory", "Budget", "Analytics", "Reports"],
+    "customer": ["My Dashboard", "My Orders", "My Invoices", "My Profile"],
+    "supplier": ["My Dashboard", "My Orders", "My Products", "My Payments", "My Profile"],
+}
+
+RENDER_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+role, page, api_url, reruns, timeout = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]), float(sys.argv[5])
+at = AppTest.from_file("app.py", default_timeout=timeout)
+if role != "login":
+    state = dict(logged_in=True, role=role, username="render-check", page=page, api_url=api_url,
+                 api_mode="backend")
+    for key, value in state.items():
+        at.session_state[key] = value
+runs, errors = [], []
+for _ in range(reruns + 1):
+    run_started = time.perf_counter()
+    try:
+        at.run()
+    except Exception as e:
+        # AppTest itself can fail to replay some widget states on a rerun
+        errors.append(f"run {len(runs) + 1}: {type(e).__name__}: {e}")
+        break
+    runs.append((time.perf_counter() - run_started) * 1000)
+if not runs:
+    sys.exit(errors[0])
+modules = sorted(name for name in sys.modules if name.startswith("pages.") or name in
+                 ("sklearn", "reportlab", "openpyxl", "PIL"))
+print(json.dumps({"cold_ms": runs[0], "warm_ms": runs[1:], "errors": errors + [str(e.value) for e in at.exception],
+                  "modules": modules, "total_ms": (time.perf_counter() - started) * 1000}))
+"""
+
+
+def render(role, page, args):
+    result = subprocess.run(
+        [sys.executable, "-c", RENDER_SCRIPT, role, page, args.api_url, str(args.reruns), str(args.timeout)],
+        cwd=frontend_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"failed": result.stderr.strip().splitlines()[-1:] or ["no output"]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--role", choices=sorted(PAGES), action="append", help="roles to render (default: all)")
+    parser.add_argument("--page", action="append", help="only these pages")
+    parser.add_argument("--reruns", type=int, default=5, help="warm reruns after the cold run")
+    parser.add_argument("--api-url", default="http://localhost:8000")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds allowed per script run")
+    parser.add_argument("--json", dest="json_path", help="also write the measurements here")
+    args = parser.parse_args()
+
+    targets = [("login", "(login page)")]
+    for role in args.role or sorted(PAGES):
+        targets += [(role, page) for page in PAGES[role] if not args.page or page in args.page]
+
+    results = {}
+    print(f"{'role':<9} {'page':<14} {'cold ms':>9} {'warm ms':>9}  modules loaded")
+    for role, page in targets:
+        result = results.setdefault(role, {})[page] = render(role, page, args)
+        if "failed" in result:
+            print(f"{role:<9} {page:<14} failed: {result['failed'][0]}")
+            continue
+        warm = statistics.median(result["warm_ms"]) if result["warm_ms"] else float("nan")
+        loaded = ", ".join(result["modules"]) or "-"
+        print(f"{role:<9} {page:<14} {result['cold_ms']:>9.1f} {warm:>9.1f}  {loaded}")
+        for error in result["errors"]:
+            print(f"{'':<25} error: {error}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -5,16 +5,16 @@ import plotly.express as px
 import plotly.graph_objects as go
 import requests
 from datetime import datetime, timedelta
+from auth import auth
 import numpy as np
 import warnings
+from importlib.util import find_spec
 warnings.filterwarnings('ignore')
 
-# Try to import sklearn, but provide fallback if not available
-try:
-    from sklearn.linear_model import LinearRegression
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+# scikit-learn takes longer to import than the rest of the page; check it is
+# installed here and import it when a forecast is fitted
+SKLEARN_AVAILABLE = find_spec("sklearn") is not None
+if not SKLEARN_AVAILABLE:
     st.warning("⚠️ scikit-learn not installed. Some forecasting features will be limited.")
     # Simple linear regression fallback
     class SimpleLinearRegression:
@@ -54,9 +54,100 @@ def show_analytics_page():
     with tab4:
         show_business_intelligence(api_url)
 
+def show_backend_forecast(api_url, forecast_months):
+    """Forecasts fitted and cached by the backend (/api/forecast): total sales, each
+    category and each customer segment, with 95% prediction intervals.
+    Returns False when the backend has no forecast endpoint."""
+    try:
+        response = requests.get(f"{api_url}/api/forecast", params={"horizon": forecast_months},
+                                headers=auth.get_auth_header(), timeout=10)
+    except requests.RequestException:
+        return False
+    if response.status_code != 200:
+        return False
+    
+    forecast = response.json()
+    series = forecast["series"]
+    if not series:
+        st.info("No sales data available for forecasting. Add some income transactions first!")
+        return True
+    
+    names = [s["name"] if s["kind"] != "segment" else f"Segment: {s['name']}" for s in series]
+    selected = series[names.index(st.selectbox("Series", names, key="forecast_series"))]
+    history = pd.DataFrame(selected["history"])
+    predicted = pd.DataFrame(selected["forecast"])
+    history['date'] = pd.to_datetime(history['month'])
+    predicted['date'] = pd.to_datetime(predicted['month'])
+    
+    st.success(f"✅ Forecast for the next {forecast_months} months "
+               f"({selected['model']}, fitted on {forecast['history_start']} to {forecast['history_end']})")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Next Month Forecast", f"€{predicted['value'].iloc[0]:,.0f}")
+    with col2:
+        last_month = history['sales'].iloc[-1]
+        growth = ((predicted['value'].iloc[-1] / last_month) - 1) * 100 if last_month else 0
+        st.metric("Growth Rate", f"{growth:.1f}%")
+    with col3:
+        st.metric("Total Forecast", f"€{predicted['value'].sum():,.0f}")
+    with col4:
+        st.metric("Best Month", f"€{history['sales'].max():,.0f}")
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=history['date'], y=history['sales'], mode='lines+markers', name='Historical Sales',
+        line=dict(color='#4ECDC4', width=3), marker=dict(size=8)
+    ))
+    fig.add_trace(go.Scatter(
+        x=predicted['date'], y=predicted['value'], mode='lines+markers', name='Forecast',
+        line=dict(color='#FF6B6B', width=3, dash='dash'), marker=dict(size=8, symbol='diamond')
+    ))
+    fig.add_trace(go.Scatter(
+        x=list(predicted['date']) + list(predicted['date'])[::-1],
+        y=list(predicted['upper']) + list(predicted['lower'])[::-1],
+        fill='toself', fillcolor='rgba(255, 107, 107, 0.2)', line=dict(color='rgba(255, 255, 255, 0)'),
+        name='95% Prediction Interval', showlegend=True
+    ))
+    fig.update_layout(
+        title=f"{selected['name']} Forecast with Prediction Interval",
+        xaxis_title='Date', yaxis_title='Sales Amount (€)', hovermode='x unified',
+        height=500, template='plotly_white'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader("📅 Detailed Forecast")
+    display_df = pd.DataFrame({
+        'Month': predicted['date'].dt.strftime('%B %Y'),
+        'Forecasted Sales': predicted['value'].apply(lambda x: f"€{x:,.0f}"),
+        'Lower Bound (95%)': predicted['lower'].apply(lambda x: f"€{x:,.0f}"),
+        'Upper Bound (95%)': predicted['upper'].apply(lambda x: f"€{x:,.0f}")
+    })
+    st.dataframe(display_df, use_container_width=True, hide_index=True)
+    
+    st.download_button(
+        label="📥 Export Forecast Data",
+        data=predicted[['month', 'value', 'lower', 'upper']].rename(columns={
+            'value': 'Forecasted_Sales', 'lower': 'Lower_Bound', 'upper': 'Upper_Bound'
+        }).to_csv(index=False),
+        file_name="sales_forecast.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
+    return True
+
 def show_sales_forecasting(api_url):
     st.subheader("📈 Sales Forecasting & Predictions")
     
+    # Forecast configuration
+    st.sidebar.subheader("Forecast Settings")
+    forecast_months = st.sidebar.slider("Months to forecast", 1, 12, 3)
+    
+    # The backend fits and caches the models; moving the slider does not refit
+    if show_backend_forecast(api_url, forecast_months):
+        return
+    
+    # Fallback for backends without /api/forecast: fit a trend line here
     # Fetch sales data
     try:
         response = requests.get(f"{api_url}/api/transactions", params={"limit": 1000})
@@ -82,12 +173,9 @@ def show_sales_forecasting(api_url):
                     monthly_sales = sales_df.resample('M')['amount'].sum().reset_index()
                     monthly_sales['month_num'] = range(len(monthly_sales))
                     
-                    # Forecast configuration
-                    st.sidebar.subheader("Forecast Settings")
-                    forecast_months = st.sidebar.slider("Months to forecast", 1, 12, 3)
-                    
                     # Use appropriate regression model
                     if SKLEARN_AVAILABLE:
+                        from sklearn.linear_model import LinearRegression
                         model = LinearRegression()
                     else:
                         model = SimpleLinearRegression()
@@ -263,6 +351,51 @@ def show_sales_forecasting(api_url):
         st.error(f"Error in sales forecasting: {str(e)}")
         st.info("Try installing scikit-learn for better forecasting: `pip install scikit-learn`")
 
+def show_rfm_scores(api_url):
+    """RFM bands and churn risk scored by the backend (/api/analytics/rfm).
+    Shows nothing when the backend has no scores."""
+    try:
+        response = requests.get(f"{api_url}/api/analytics/rfm", params={"limit": 1000},
+                                headers=auth.get_auth_header(), timeout=10)
+    except requests.RequestException:
+        return
+    if response.status_code != 200 or not response.json():
+        return
+    
+    scores_df = pd.DataFrame(response.json())
+    st.subheader("RFM Segments & Churn Risk")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        band_counts = scores_df['band'].value_counts().reindex(
+            ['champions', 'loyal', 'needs_attention', 'hibernating'], fill_value=0)
+        fig = px.bar(
+            x=band_counts.index.str.replace('_', ' ').str.title(),
+            y=band_counts.values,
+            title='Customers per RFM Band',
+            labels={'x': 'Band', 'y': 'Customers'},
+            color=band_counts.values,
+            color_continuous_scale='Teal'
+        )
+        fig.update_layout(height=350, coloraxis_showscale=False)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.metric("Champions", int(band_counts['champions']))
+        st.metric("High Churn Risk", int((scores_df['churn_band'] == 'high').sum()))
+        st.metric("Avg Days Since Purchase", f"{scores_df['recency_days'].mean():.0f}")
+    
+    # Valuable customers drifting away: good RFM score, high churn risk
+    at_risk = scores_df[(scores_df['churn_band'] == 'high') & scores_df['band'].isin(['champions', 'loyal'])]
+    if not at_risk.empty:
+        st.warning(f"⚠️ {len(at_risk)} loyal customers are overdue for their next purchase")
+        st.dataframe(
+            at_risk[['name', 'band', 'rfm_score', 'recency_days', 'frequency', 'monetary', 'churn_risk']]
+            .sort_values('churn_risk', ascending=False)
+            .rename(columns={'name': 'Customer', 'band': 'Band', 'rfm_score': 'RFM', 'recency_days': 'Days Since Purchase',
+                             'frequency': 'Purchases', 'monetary': 'Spent (€)', 'churn_risk': 'Churn Risk'}),
+            use_container_width=True, hide_index=True
+        )
+
 def show_customer_insights(api_url):
     st.subheader("👥 Customer Analytics & Segmentation")
     
@@ -333,6 +466,8 @@ def show_customer_insights(api_url):
                 fig2.update_layout(height=400)
                 st.plotly_chart(fig2, use_container_width=True)
                 
+                show_rfm_scores(api_url)
+                
                 # Customer acquisition trends
                 st.subheader("Customer Acquisition Timeline")
                 
@@ -5,6 +5,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import requests
 from datetime import datetime, timedelta
+from auth import auth
 
 # Customer Dashboard Backend real Data
 def show_customer_dashboard():
@@ -403,38 +404,63 @@ def show_customer_demo_dashboard():
             st.info("Review system coming soon!")
 
 # ========== OTHER CUSTOMER PAGES ==========
+def fetch_customer_orders_page(customer_id, headers, state, limit=50):
+    """Append the next page of /api/customers/{id}/orders to ``state``; the backend
+    returns the cursor for the page after it in the X-Next-Cursor header"""
+    params = {"limit": limit}
+    if state["cursor"]:
+        params["cursor"] = state["cursor"]
+    response = requests.get(
+        f"{st.session_state.api_url}/api/customers/{customer_id}/orders",
+        params=params,
+        headers=headers,
+        timeout=10
+    )
+    if response.status_code != 200:
+        return False
+    state["orders"] += response.json()
+    state["cursor"] = response.headers.get("X-Next-Cursor")
+    state["done"] = state["cursor"] is None
+    return True
+
 def show_customer_orders():
     """Customer orders page"""
     st.markdown('<h1 class="main-header">🛍️ My Orders</h1>', unsafe_allow_html=True)
     
-    # Fetch real orders from backend
+    # Fetch real orders from backend, one page at a time
     auth_header = st.session_state.get('auth_header', {})
     customer_id = st.session_state.get('customer_id')
     
     if customer_id:
+        state_key = f"customer_orders_{customer_id}"
+        if state_key not in st.session_state or st.button("🔄 Refresh Orders"):
+            st.session_state[state_key] = {"orders": [], "cursor": None, "done": False}
+        state = st.session_state[state_key]
+        
         try:
-            response = requests.get(
-                f"{st.session_state.api_url}/api/customers/{customer_id}/transactions",
-                headers=auth_header,
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                orders_data = response.json().get('transactions', [])
+            if not state["orders"] and not state["done"] and \
+                    not fetch_customer_orders_page(customer_id, auth_header, state):
+                st.warning("⚠️ Could not fetch orders from backend")
+            elif state["orders"]:
+                orders_df = pd.DataFrame(state["orders"])
                 
-                if orders_data:
-                    orders_df = pd.DataFrame(orders_data)
-                    
-                    # Display orders
-                    st.dataframe(
-                        orders_df[['date', 'description', 'amount', 'status']],
-                        use_container_width=True,
-                        hide_index=True
-                    )
-                else:
-                    st.info("📭 You have no orders yet")
+                # Display orders
+                st.dataframe(
+                    orders_df[['date', 'invoice_number', 'category', 'description', 'amount', 'status']],
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "amount": st.column_config.NumberColumn("Amount", format="€%.2f"),
+                    }
+                )
+                
+                if not state["done"]:
+                    st.caption(f"Showing your {len(state['orders'])} most recent orders")
+                    if st.button("⬇️ Load More Orders", use_container_width=True):
+                        fetch_customer_orders_page(customer_id, auth_header, state)
+                        st.rerun()
             else:
-                st.warning("⚠️ Could not fetch orders from backend")
+                st.info("📭 You have no orders yet")
                 
         except Exception as e:
             st.error(f"❌ Error: {str(e)}")
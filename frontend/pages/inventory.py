@@ -51,7 +51,15 @@ def show_inventory_items_tab():
         headers = auth.get_auth_header()
         api_url = st.session_state.get('api_url', 'http://localhost:8000')
         
-        response = requests.get(f"{api_url}/api/inventory", headers=headers, timeout=10)
+        # Search and category filtering happen in SQL on the backend
+        params = {}
+        if search_query:
+            params["q"] = search_query
+        if category_filter != "All":
+            params["category"] = category_filter
+        
+        response = requests.get(f"{api_url}/api/inventory", headers=headers,
+                                params=params, timeout=10)
         
         if response.status_code == 200:
             items = response.json()
@@ -86,18 +94,9 @@ def show_inventory_items_tab():
                         "Supplier": str(item.get('supplier_id', ''))
                     })
                 
-                # Apply filters
+                # Already filtered by the backend
                 filtered_items = display_items
                 
-                if search_query:
-                    filtered_items = [item for item in filtered_items 
-                                    if search_query.lower() in item['Name'].lower() 
-                                    or search_query.lower() in item['Category'].lower()]
-                
-                if category_filter != "All":
-                    filtered_items = [item for item in filtered_items 
-                                    if item['Category'] == category_filter]
-                
                 if filtered_items:
                     df = pd.DataFrame(filtered_items)
                     st.dataframe(df, use_container_width=True, hide_index=True)
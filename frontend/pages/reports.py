@@ -8,27 +8,17 @@ from datetime import datetime, timedelta
 import io
 import base64
 import json
+from importlib.util import find_spec
+from auth import auth
 
-# Try to import reportlab, but provide fallback
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+# reportlab and openpyxl are only needed when an export is generated; check
+# they are installed here and import them in the export functions
+REPORTLAB_AVAILABLE = find_spec("reportlab") is not None
+if not REPORTLAB_AVAILABLE:
     st.warning("⚠️ reportlab not installed. PDF export features will be limited.")
 
-# Try to import openpyxl
-try:
-    import openpyxl
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-    from openpyxl.utils import get_column_letter
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+OPENPYXL_AVAILABLE = find_spec("openpyxl") is not None
+if not OPENPYXL_AVAILABLE:
     st.warning("⚠️ openpyxl not installed. Excel export features will be limited.")
 
 def show_reports_page():
@@ -103,10 +93,14 @@ def show_financial_reports(api_url):
         with st.spinner(f"Generating {report_type}..."):
             try:
                 # Fetch data
-                transactions_response = requests.get(f"{api_url}/api/transactions", params={"limit": 10000})
+                transactions_response = requests.get(f"{api_url}/api/transactions", params={
+                    "limit": 10000,
+                    "start_date": pd.Timestamp(start_date).date().isoformat(),
+                    "end_date": pd.Timestamp(end_date).date().isoformat()
+                })
                 
                 if transactions_response.status_code == 200:
-                    transactions = response.json()
+                    transactions = transactions_response.json()
                     
                     if transactions:
                         df = pd.DataFrame(transactions)
@@ -287,6 +281,10 @@ def create_pdf_income_statement(start_date, end_date, revenue, expenses, net_inc
     """Create PDF income statement"""
     if not REPORTLAB_AVAILABLE:
         return b"PDF export requires reportlab library"
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
     
     buffer = io.BytesIO()
     
@@ -387,6 +385,9 @@ def create_excel_income_statement(start_date, end_date, revenue, expenses, net_i
     """Create Excel income statement"""
     if not OPENPYXL_AVAILABLE:
         return b"Excel export requires openpyxl library"
+    import openpyxl
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
     
     buffer = io.BytesIO()
     
@@ -477,6 +478,79 @@ def create_excel_income_statement(start_date, end_date, revenue, expenses, net_i
     buffer.seek(0)
     return buffer.getvalue()
 
+def show_cohort_report(api_url, report_type, start_date):
+    """Acquisition or retention by first-purchase month from /api/analytics/cohorts,
+    for the closed months since ``start_date``. Returns False when the backend
+    has no cohort endpoint."""
+    today = datetime.now().date()
+    months = min(max((today.year - start_date.year) * 12 + today.month - start_date.month, 1), 60)
+    try:
+        response = requests.get(f"{api_url}/api/analytics/cohorts", params={"months": months},
+                                headers=auth.get_auth_header(), timeout=30)
+    except requests.RequestException:
+        return False
+    if response.status_code != 200:
+        return False
+    
+    cohorts = response.json()["cohorts"]
+    if not cohorts:
+        st.warning("No customer purchases in the selected period")
+        return True
+    
+    if "Acquisition" in report_type:
+        st.success("✅ Customer Acquisition Report Generated")
+        monthly_acq = pd.DataFrame({
+            'Month': pd.to_datetime([c['cohort'] for c in cohorts]),
+            'New Customers': [c['customers'] for c in cohorts],
+            'First Month Revenue': [c['revenue'][0] for c in cohorts]
+        })
+        fig = px.line(
+            monthly_acq,
+            x='Month',
+            y='New Customers',
+            title='Monthly Customer Acquisition (first purchase)',
+            markers=True
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        export = monthly_acq
+        file_name = "customer_acquisition.csv"
+    else:
+        st.success("✅ Customer Retention Report Generated")
+        depth = max(len(c['retention']) for c in cohorts)
+        labels = [f"Month {i}" for i in range(depth)]
+        retention = pd.DataFrame(
+            [c['retention'] + [None] * (depth - len(c['retention'])) for c in cohorts],
+            index=[f"{c['cohort']} ({c['customers']})" for c in cohorts],
+            columns=labels
+        )
+        fig = px.imshow(
+            retention * 100,
+            text_auto='.0f',
+            aspect='auto',
+            color_continuous_scale='Teal',
+            labels={'x': 'Months Since First Purchase', 'y': 'Cohort (customers)', 'color': 'Retention %'},
+            title='Customer Retention by Cohort (%)'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.subheader("Revenue per Customer by Cohort")
+        revenue = pd.DataFrame(
+            [c['revenue_per_customer'] + [None] * (depth - len(c['revenue_per_customer'])) for c in cohorts],
+            index=[c['cohort'] for c in cohorts],
+            columns=labels
+        )
+        st.dataframe(revenue.style.format("€{:,.0f}", na_rep=""), use_container_width=True)
+        export = retention.rename_axis('Cohort').reset_index()
+        file_name = "customer_retention.csv"
+    
+    st.download_button(
+        label="📥 Download Report Data",
+        data=export.to_csv(index=False),
+        file_name=file_name,
+        mime="text/csv"
+    )
+    return True
+
 def show_customer_reports(api_url):
     st.subheader("Customer Analysis Reports")
     
@@ -486,6 +560,7 @@ def show_customer_reports(api_url):
             "Customer Spending Analysis",
             "Customer Segmentation Report",
             "Customer Acquisition Report",
+            "Customer Retention (Cohorts)",
             "Top Customers Report",
             "Customer Lifetime Value Analysis"
         ]
@@ -499,6 +574,10 @@ def show_customer_reports(api_url):
         cust_end_date = st.date_input("End Date", value=datetime.now())
     
     if st.button("👥 Generate Customer Report", type="primary", use_container_width=True):
+        # Acquisition and retention come from the backend's cohort matrices when it has them
+        if ("Acquisition" in report_type or "Cohorts" in report_type) and \
+                show_cohort_report(api_url, report_type, cust_start_date):
+            return
         try:
             customers_response = requests.get(f"{api_url}/api/customers")
             transactions_response = requests.get(f"{api_url}/api/transactions", params={"limit": 5000})
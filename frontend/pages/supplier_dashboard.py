@@ -20,36 +20,25 @@ def show_supplier_dashboard():
     st.markdown('<h1 class="main-header">🏭 My Supplier Portal</h1>', unsafe_allow_html=True)
     
     try:
-        # ========== FETCH SUPPLIER DATA FROM BACKEND ==========
+        # ========== FETCH SUPPLIER DASHBOARD FROM BACKEND ==========
         response = requests.get(
-            f"{st.session_state.api_url}/api/suppliers/{supplier_id}",
+            f"{st.session_state.api_url}/api/suppliers/{supplier_id}/dashboard",
             headers=auth_header,
             timeout=5
         )
         
         if response.status_code == 200:
-            supplier_data = response.json()
+            dashboard = response.json()
         else:
-            st.warning("⚠️ Using demo supplier data")
-            supplier_data = {
-                "id": supplier_id,
-                "name": "Silver World Inc.",
-                "contact_person": "John Smith",
-                "email": "john@silverworld.com",
-                "phone": "+1234567890",
-                "website": "silverworld.com"
-            }
-    
-        # ========== FETCH SUPPLIER TRANSACTIONS ==========
-        # Note: We need to implement this endpoint in backend
-        # For now, use general transactions filtered by supplier_id
+            st.warning("⚠️ Could not fetch your dashboard from backend")
+            dashboard = {}
     
     except Exception as e:
         st.error(f"❌ Error fetching data: {str(e)}")
-        supplier_data = {
-            "id": supplier_id,
-            "name": "Demo Supplier"
-        }
+        dashboard = {}
+    
+    supplier_data = dashboard.get("supplier", {"id": supplier_id, "name": "Supplier"})
+    stats = dashboard.get("stats", {})
     
     # ========== SUPPLIER PROFILE SECTION ==========
     col1, col2 = st.columns([1, 2])
@@ -59,49 +48,47 @@ def show_supplier_dashboard():
         st.markdown(f"""
         <div style="background: #1E293B; padding: 1.5rem; border-radius: 12px; border: 1px solid #334155;">
             <p style="font-size: 1.2rem; font-weight: 600; margin-bottom: 1rem;">🏭 {supplier_data.get('name', 'Supplier')}</p>
-            <p style="color: #94A3B8; margin: 0.5rem 0;">👤 Contact: {supplier_data.get('contact_person', 'N/A')}</p>
-            <p style="color: #94A3B8; margin: 0.5rem 0;">📧 {supplier_data.get('email', 'No email')}</p>
-            <p style="color: #94A3B8; margin: 0.5rem 0;">📱 {supplier_data.get('phone', 'No phone')}</p>
-            <p style="color: #94A3B8; margin: 0.5rem 0;">🌐 {supplier_data.get('website', 'No website')}</p>
+            <p style="color: #94A3B8; margin: 0.5rem 0;">👤 Contact: {supplier_data.get('contact_person') or 'N/A'}</p>
+            <p style="color: #94A3B8; margin: 0.5rem 0;">📧 {supplier_data.get('email') or 'No email'}</p>
+            <p style="color: #94A3B8; margin: 0.5rem 0;">📱 {supplier_data.get('phone') or 'No phone'}</p>
+            <p style="color: #94A3B8; margin: 0.5rem 0;">🌐 {supplier_data.get('website') or 'No website'}</p>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
         st.subheader("📊 Business Overview")
         
-        # These would come from backend analytics
         col_stats1, col_stats2, col_stats3, col_stats4 = st.columns(4)
         
         with col_stats1:
+            trend = stats.get("spend_trend_pct")
             st.metric(
-                "Revenue YTD", 
-                "€12,450",
-                "+8%",
-                help="Year-to-date revenue"
+                "Total Revenue", 
+                f"€{stats.get('total_revenue', 0):,.2f}",
+                f"{trend:+.1f}%" if trend is not None else None,
+                help="All orders from this business; the change compares the last three months with the three before"
             )
         
         with col_stats2:
             st.metric(
-                "Active Orders", 
-                "18",
-                "+3",
-                help="Currently active purchase orders"
+                "Orders", 
+                stats.get("order_count", 0),
+                help=f"Over {stats.get('active_months', 0)} months with orders"
             )
         
         with col_stats3:
             st.metric(
-                "Rating", 
-                "4.7/5",
-                "+0.2",
-                help="Supplier rating"
+                "Avg Order", 
+                f"€{stats.get('avg_order_value', 0):,.2f}",
+                help="Average purchase order value"
             )
         
         with col_stats4:
+            lead_days = stats.get("avg_lead_days")
             st.metric(
-                "On-time", 
-                "96%",
-                "+2%",
-                help="On-time delivery rate"
+                "Avg Lead Time", 
+                f"{lead_days:.1f} days" if lead_days is not None else "N/A",
+                help="Days from purchase order to stock received"
             )
     
     st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
@@ -109,57 +96,57 @@ def show_supplier_dashboard():
     # ========== RECENT PURCHASE ORDERS SECTION ==========
     st.subheader("📦 Recent Purchase Orders")
     
-    # This would come from backend
-    purchase_orders = pd.DataFrame({
-        'PO #': ['PO-2024-123', 'PO-2024-122', 'PO-2024-121', 'PO-2024-120', 'PO-2024-119'],
-        'Date': ['2024-12-10', '2024-12-08', '2024-12-05', '2024-12-03', '2024-11-30'],
-        'Items': ['Silver Chains (50m)', 'Gold Hooks (200pcs)', 'Crystals (100pcs)', 'Pearls (50pcs)', 'Leather Cord (100m)'],
-        'Amount': ['€255.00', '€150.00', '€450.00', '€325.00', '€180.00'],
-        'Status': ['Delivered', 'Shipped', 'Processing', 'Pending', 'Delivered'],
-        'Due Date': ['2024-12-15', '2024-12-12', '2024-12-20', '2024-12-25', '2024-12-05']
-    })
-    
-    st.dataframe(purchase_orders, use_container_width=True, hide_index=True)
+    recent_orders = dashboard.get("recent_orders", [])
+    if recent_orders:
+        st.dataframe(
+            pd.DataFrame(recent_orders)[['po_number', 'date', 'description', 'category', 'amount', 'status']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "amount": st.column_config.NumberColumn("Amount", format="€%.2f"),
+            }
+        )
+    else:
+        st.info("📭 No purchase orders yet")
     
     st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     
     # ========== REVENUE TRENDS SECTION ==========
     st.subheader("📈 Revenue Trends")
     
-    # Demo trend data (would come from backend)
-    trend_data = pd.DataFrame({
-        'Month': ['Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
-        'Revenue': [1850, 2100, 1950, 2400, 2200, 1950],
-        'Orders': [12, 15, 14, 18, 16, 15]
-    })
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=trend_data['Month'],
-        y=trend_data['Revenue'],
-        mode='lines+markers',
-        name='Revenue',
-        line=dict(color='#8B5CF6', width=3)
-    ))
-    fig.add_trace(go.Bar(
-        x=trend_data['Month'],
-        y=trend_data['Orders'],
-        name='Orders',
-        yaxis='y2',
-        marker_color='#10B981'
-    ))
-    
-    fig.update_layout(
-        title='Monthly Revenue & Order Volume',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='#F1F5F9',
-        yaxis=dict(title='Revenue (€)', gridcolor='#334155'),
-        yaxis2=dict(title='Orders', overlaying='y', side='right', gridcolor='#334155'),
-        legend=dict(x=0.01, y=0.99)
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    monthly = dashboard.get("monthly_revenue", [])
+    if monthly:
+        trend_data = pd.DataFrame(monthly).sort_values("month")
+        
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=trend_data['month'],
+            y=trend_data['revenue'],
+            mode='lines+markers',
+            name='Revenue',
+            line=dict(color='#8B5CF6', width=3)
+        ))
+        fig.add_trace(go.Bar(
+            x=trend_data['month'],
+            y=trend_data['orders'],
+            name='Orders',
+            yaxis='y2',
+            marker_color='#10B981'
+        ))
+        
+        fig.update_layout(
+            title='Monthly Revenue & Order Volume',
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='#F1F5F9',
+            yaxis=dict(title='Revenue (€)', gridcolor='#334155'),
+            yaxis2=dict(title='Orders', overlaying='y', side='right', gridcolor='#334155'),
+            legend=dict(x=0.01, y=0.99)
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("📭 No monthly revenue yet")
     
     # ========== INVENTORY/SUPPLIES SECTION ==========
     st.subheader("📦 My Supplies Catalog")
@@ -198,37 +185,65 @@ def show_supplier_dashboard():
             st.info("Stock update feature coming soon!")
 
 # ========== OTHER SUPPLIER PAGES ==========
+def fetch_supplier_orders_page(supplier_id, headers, state, limit=50):
+    """Append the next page of /api/suppliers/{id}/orders to ``state``; the backend
+    returns the cursor for the page after it in the X-Next-Cursor header"""
+    params = {"limit": limit}
+    if state["cursor"]:
+        params["cursor"] = state["cursor"]
+    response = requests.get(
+        f"{st.session_state.api_url}/api/suppliers/{supplier_id}/orders",
+        params=params,
+        headers=headers,
+        timeout=10
+    )
+    if response.status_code != 200:
+        return False
+    state["orders"] += response.json()
+    state["cursor"] = response.headers.get("X-Next-Cursor")
+    state["done"] = state["cursor"] is None
+    return True
+
 def show_supplier_orders():
     """Supplier orders management page"""
     st.markdown('<h1 class="main-header">📦 Order Management</h1>', unsafe_allow_html=True)
     
-    # Order status tracking
-    st.subheader("🔄 Order Status")
-    
-    status_cols = st.columns(5)
-    with status_cols[0]:
-        st.metric("Pending", "4")
-    with status_cols[1]:
-        st.metric("Processing", "6")
-    with status_cols[2]:
-        st.metric("Shipped", "5")
-    with status_cols[3]:
-        st.metric("Delivered", "12")
-    with status_cols[4]:
-        st.metric("Cancelled", "1")
-    
-    # Order management table
-    orders = pd.DataFrame({
-        'PO #': ['PO-2024-123', 'PO-2024-122', 'PO-2024-121', 'PO-2024-120'],
-        'Date': ['2024-12-10', '2024-12-08', '2024-12-05', '2024-12-03'],
-        'Customer': ['Shiny Jar', 'Shiny Jar', 'Shiny Jar', 'Shiny Jar'],
-        'Items': ['Silver Chains', 'Gold Hooks', 'Crystals', 'Pearls'],
-        'Amount': ['€255.00', '€150.00', '€450.00', '€325.00'],
-        'Status': ['Delivered', 'Shipped', 'Processing', 'Pending'],
-        'Actions': ['✅ Mark Complete', '🚚 Update Tracking', '⏳ Process', '📋 View Details']
-    })
+    # Fetch real orders from backend, one page at a time
+    auth_header = st.session_state.get('auth_header', {})
+    supplier_id = st.session_state.get('supplier_id')
     
-    st.dataframe(orders, use_container_width=True, hide_index=True)
+    if supplier_id:
+        state_key = f"supplier_orders_{supplier_id}"
+        if state_key not in st.session_state or st.button("🔄 Refresh Orders"):
+            st.session_state[state_key] = {"orders": [], "cursor": None, "done": False}
+        state = st.session_state[state_key]
+        
+        try:
+            if not state["orders"] and not state["done"] and \
+                    not fetch_supplier_orders_page(supplier_id, auth_header, state):
+                st.warning("⚠️ Could not fetch orders from backend")
+            elif state["orders"]:
+                st.dataframe(
+                    pd.DataFrame(state["orders"])[['po_number', 'date', 'description', 'category', 'amount', 'status']],
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "amount": st.column_config.NumberColumn("Amount", format="€%.2f"),
+                    }
+                )
+                
+                if not state["done"]:
+                    st.caption(f"Showing your {len(state['orders'])} most recent orders")
+                    if st.button("⬇️ Load More Orders", use_container_width=True):
+                        fetch_supplier_orders_page(supplier_id, auth_header, state)
+                        st.rerun()
+            else:
+                st.info("📭 No purchase orders yet")
+                
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+    else:
+        st.error("❌ Supplier ID not found. Please login again.")
     
     # Bulk actions
     with st.expander("🚀 Bulk Actions"):
@@ -282,63 +282,94 @@ def show_purchase_history(api_url):
     except Exception as e:
         st.error(f"Error loading purchase history: {str(e)}")
 
-def show_supplier_performance(api_url):
+def show_supplier_performance(api_url, headers=None):
     st.subheader("Supplier Performance Metrics")
     
-    st.info("""
-    **Key Performance Indicators for Suppliers:**
+    # Scorecard computed and cached by the backend from purchases, inventory and deliveries
+    try:
+        response = requests.get(f"{api_url}/api/analytics/suppliers", headers=headers, timeout=10)
+    except requests.RequestException as e:
+        st.error(f"Error loading supplier scorecard: {str(e)}")
+        return
+    if response.status_code != 200:
+        st.error("Could not load the supplier scorecard")
+        return
     
-    1. **Reliability Score** - On-time delivery and order accuracy
-    2. **Cost Efficiency** - Price competitiveness and discounts
-    3. **Quality Rating** - Product quality and consistency
-    4. **Payment Terms** - Credit period and flexibility
-    5. **Communication** - Responsiveness and support
-    """)
+    scorecard = response.json()
+    suppliers = scorecard["suppliers"]
+    if not suppliers:
+        st.info("No suppliers yet. Add suppliers and record purchases to see their performance.")
+        return
     
-    # Performance scoring template
-    st.subheader("Supplier Evaluation Form")
+    df = pd.DataFrame(suppliers)
+    trend_days = scorecard["trend_days"]
     
-    with st.form("supplier_evaluation_form"):
-        supplier_name = st.selectbox("Select Supplier", ["Supplier A", "Supplier B", "Supplier C"])
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            reliability = st.slider("Reliability (1-10)", 1, 10, 7)
-            cost_efficiency = st.slider("Cost Efficiency (1-10)", 1, 10, 6)
-            quality = st.slider("Quality (1-10)", 1, 10, 8)
-        
-        with col2:
-            payment_terms = st.slider("Payment Terms (1-10)", 1, 10, 5)
-            communication = st.slider("Communication (1-10)", 1, 10, 7)
-            overall = st.slider("Overall Satisfaction (1-10)", 1, 10, 7)
-        
-        comments = st.text_area("Comments & Notes")
-        
-        if st.form_submit_button("Submit Evaluation"):
-            st.success("Evaluation submitted! (This would save to database in production)")
-    
-    # Supplier comparison chart (sample data)
-    st.subheader("Supplier Comparison")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Spend", f"€{df['total_spend'].sum():,.2f}")
+    with col2:
+        st.metric("Purchase Orders", int(df['order_count'].sum()))
+    with col3:
+        recent, previous = df['recent_spend'].sum(), df['previous_spend'].sum()
+        st.metric(f"Spend (last {trend_days} days)", f"€{recent:,.2f}",
+                  f"{(recent / previous - 1) * 100:+.1f}%" if previous else None, delta_color="inverse")
+    with col4:
+        lead_days = df['avg_lead_days'].dropna()
+        st.metric("Avg Lead Time", f"{lead_days.mean():.1f} days" if not lead_days.empty else "N/A",
+                  help="Days from purchase to stock received")
     
-    comparison_data = {
-        'Supplier': ['Silver World', 'Golden Beads', 'Crystal Palace', 'Leather Crafts'],
-        'Reliability': [9, 7, 8, 6],
-        'Cost': [7, 9, 6, 8],
-        'Quality': [8, 7, 9, 7],
-        'Overall': [8, 7.7, 7.7, 7]
-    }
+    # Scorecard table
+    st.subheader("Supplier Scorecard")
+    st.dataframe(
+        df[['name', 'total_spend', 'order_count', 'avg_order_value', 'days_between_orders',
+            'spend_trend_pct', 'items_supplied', 'avg_lead_days', 'last_order']],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "name": "Supplier",
+            "total_spend": st.column_config.NumberColumn("Total Spend", format="€%.2f"),
+            "order_count": "Orders",
+            "avg_order_value": st.column_config.NumberColumn("Avg Order", format="€%.2f"),
+            "days_between_orders": st.column_config.NumberColumn("Days Between Orders", format="%.1f"),
+            "spend_trend_pct": st.column_config.NumberColumn(f"Spend Trend ({trend_days}d)", format="%+.1f%%"),
+            "items_supplied": "Items Supplied",
+            "avg_lead_days": st.column_config.NumberColumn("Avg Lead Time (days)", format="%.1f"),
+            "last_order": "Last Order"
+        }
+    )
     
-    df_comparison = pd.DataFrame(comparison_data)
+    # Supplier comparison
+    st.subheader("Supplier Comparison")
+    active = df[df['order_count'] > 0].head(10)
+    if active.empty:
+        st.info("No purchases recorded from any supplier yet")
+        return
     
+    comparison = active[['name', 'previous_spend', 'recent_spend']].rename(columns={
+        'name': 'Supplier',
+        'previous_spend': f'Previous {trend_days} days',
+        'recent_spend': f'Last {trend_days} days'
+    })
     fig = px.bar(
-        df_comparison,
+        comparison,
         x='Supplier',
-        y=['Reliability', 'Cost', 'Quality'],
+        y=[f'Previous {trend_days} days', f'Last {trend_days} days'],
         barmode='group',
-        title='Supplier Performance Comparison',
-        labels={'value': 'Score (1-10)', 'variable': 'Metric'},
+        title='Spend Trend by Supplier',
+        labels={'value': 'Spend (€)', 'variable': 'Period'},
         color_discrete_sequence=px.colors.qualitative.Set3
     )
+    st.plotly_chart(fig, use_container_width=True)
     
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    with_lead_time = active.dropna(subset=['avg_lead_days'])
+    if not with_lead_time.empty:
+        fig = px.bar(
+            with_lead_time,
+            x='name',
+            y='avg_lead_days',
+            title='Average Lead Time (purchase to stock received)',
+            labels={'name': 'Supplier', 'avg_lead_days': 'Days'},
+            color='avg_lead_days',
+            color_continuous_scale='RdYlGn_r'
+        )
+        st.plotly_chart(fig, use_container_width=True)
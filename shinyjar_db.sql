@@ -367,7 +367,9 @@ CREATE TABLE public.users (
     is_active boolean DEFAULT true,
     role character varying(20) DEFAULT 'user'::character varying,
     business_id integer,
-    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    customer_id integer,
+    supplier_id integer
 );
 
 
@@ -673,12 +675,12 @@ COPY public.transactions (id, transaction_date, amount, type, category_id, descr
 -- Data for Name: users; Type: TABLE DATA; Schema: public; Owner: shinyjar
 --
 
-COPY public.users (id, username, email, full_name, hashed_password, is_active, role, business_id, created_at) FROM stdin;
-1	admin	admin@shinyjar.com	Admin User	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	admin	1	2025-12-29 13:21:49.237566
-2	bora_malaj	bora@shinyjar.com	Bora Malaj	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	admin	1	2025-12-30 05:12:35.494943
-3	gerta_tirana	gerta@silverworld.com	Gerta Tirana	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	supplier	1	2025-12-30 05:13:03.204572
-4	arsjana_shehaj	arsjana@email.com	Arsjana Shehaj	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	customer	1	2025-12-30 05:13:29.117625
-5	test_admin	test@shinyjar.com	Test Admin	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	admin	1	2025-12-30 12:24:59.856091
+COPY public.users (id, username, email, full_name, hashed_password, is_active, role, business_id, created_at, customer_id, supplier_id) FROM stdin;
+1	admin	admin@shinyjar.com	Admin User	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	admin	1	2025-12-29 13:21:49.237566	\N	\N
+2	bora_malaj	bora@shinyjar.com	Bora Malaj	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	admin	1	2025-12-30 05:12:35.494943	\N	\N
+3	gerta_tirana	gerta@silverworld.com	Gerta Tirana	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	supplier	1	2025-12-30 05:13:03.204572	\N	1
+4	arsjana_shehaj	arsjana@email.com	Arsjana Shehaj	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	customer	1	2025-12-30 05:13:29.117625	21	\N
+5	test_admin	test@shinyjar.com	Test Admin	$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW	t	admin	1	2025-12-30 12:24:59.856091	\N	\N
 \.
 
 
@@ -863,6 +865,34 @@ CREATE INDEX idx_customers_email ON public.customers USING btree (email);
 CREATE INDEX idx_customers_instagram ON public.customers USING btree (instagram_handle);
 
 
+--
+-- Name: idx_inventory_category_name; Type: INDEX; Schema: public; Owner: shinyjar
+--
+
+CREATE INDEX idx_inventory_category_name ON public.inventory USING btree (category, name);
+
+
+--
+-- Name: idx_inventory_supplier; Type: INDEX; Schema: public; Owner: shinyjar
+--
+
+CREATE INDEX idx_inventory_supplier ON public.inventory USING btree (supplier_id);
+
+
+--
+-- Name: idx_users_customer; Type: INDEX; Schema: public; Owner: shinyjar
+--
+
+CREATE INDEX idx_users_customer ON public.users USING btree (customer_id);
+
+
+--
+-- Name: idx_users_supplier; Type: INDEX; Schema: public; Owner: shinyjar
+--
+
+CREATE INDEX idx_users_supplier ON public.users USING btree (supplier_id);
+
+
 --
 -- Name: idx_transactions_customer; Type: INDEX; Schema: public; Owner: shinyjar
 --
@@ -1011,6 +1041,22 @@ ALTER TABLE ONLY public.users
     ADD CONSTRAINT users_business_id_fkey FOREIGN KEY (business_id) REFERENCES public.businesses(id);
 
 
+--
+-- Name: users users_customer_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: shinyjar
+--
+
+ALTER TABLE ONLY public.users
+    ADD CONSTRAINT users_customer_id_fkey FOREIGN KEY (customer_id) REFERENCES public.customers(id);
+
+
+--
+-- Name: users users_supplier_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: shinyjar
+--
+
+ALTER TABLE ONLY public.users
+    ADD CONSTRAINT users_supplier_id_fkey FOREIGN KEY (supplier_id) REFERENCES public.suppliers(id);
+
+
 --
 -- PostgreSQL database dump complete
 --
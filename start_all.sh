@@ -21,6 +21,7 @@ echo -e "${BLUE}[2/3] Starting Backend API...${NC}"
 cd backend
 export PYTHONPATH=/home/beni/shiny_jar_suite/backend:$PYTHONPATH
 source venv/bin/activate
+alembic upgrade head
 nohup uvicorn backend.app.main:app --host 0.0.0.0 --port 8000 --reload > backend.log 2>&1 &
 echo $! > backend.pid
 sleep 2